@@ -1,9 +1,35 @@
 from django.contrib import admin
-from .models import Student, Faculty, Course, AdvisingRequest, PreferredCourse, Enrollment
+from .models import (
+    Student, Faculty, Course, AdvisingRequest, PreferredCourse, Enrollment, Job, DepartmentStats, CreditLoadStats,
+    ConsistencyScan, BulkPlan, Term, ArchivedCourse, ArchivedEnrollment, ArchivedAdvisingRequest, Prerequisite,
+    EnrollmentEvent, EventCursor,
+)
+from .forms import CourseAdminForm
 
 admin.site.register(Student)
 admin.site.register(Faculty)
-admin.site.register(Course)
+
+
+@admin.register(Course)
+class CourseAdmin(admin.ModelAdmin):
+    form = CourseAdminForm
+    list_display = ('code', 'section', 'day', 'start_time', 'end_time', 'room', 'assigned_faculty', 'term')
+    list_filter = ('term', 'day')
+    search_fields = ('code', 'room')
+
+
 admin.site.register(AdvisingRequest)
 admin.site.register(PreferredCourse)
 admin.site.register(Enrollment)
+admin.site.register(Job)
+admin.site.register(DepartmentStats)
+admin.site.register(CreditLoadStats)
+admin.site.register(ConsistencyScan)
+admin.site.register(BulkPlan)
+admin.site.register(Term)
+admin.site.register(ArchivedCourse)
+admin.site.register(ArchivedEnrollment)
+admin.site.register(ArchivedAdvisingRequest)
+admin.site.register(Prerequisite)
+admin.site.register(EnrollmentEvent)
+admin.site.register(EventCursor)
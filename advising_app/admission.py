@@ -0,0 +1,189 @@
+"""
+Admission control for registration write paths.
+
+Three independent gates run before a POST reaches an enrollment view:
+
+* a time-slot scheduler that staggers when each student may register,
+* a per-student rate limit on how fast one student can submit,
+* a concurrency limit on simultaneous write requests.
+
+Rejected requests get an immediate answer instead of queueing on the
+database writer lock. Counters are kept in the cache so they can be read
+from the monitoring endpoint.
+
+The write limit is a semaphore, so it always applies per worker process.
+Rate limits and counters live in the cache: with the default local-memory
+cache they are per process too, so N workers admit up to N times the
+configured rate. Set ADVISING_CACHE_DIR to share them between processes.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.shortcuts import redirect
+from django.utils import timezone
+
+from .models import Student
+
+DEFAULTS = {
+    'ENABLED': True,
+    # Sustained requests per second and burst size per student
+    'RATE': 1.0,
+    'BURST': 5,
+    # Simultaneous write requests allowed per worker process
+    'MAX_CONCURRENT_WRITES': 4,
+    'ACQUIRE_TIMEOUT': 2.0,
+    # Staggered registration; disabled while OPENS_AT is None
+    'OPENS_AT': None,
+    'SLOT_MINUTES': 15,
+    'STUDENTS_PER_SLOT': 500,
+    'SLOT_ORDER': 'cgpa',
+}
+
+COUNTERS = ['admitted', 'rate_limited', 'overloaded', 'too_early']
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'ADMISSION_CONTROL', {}))
+    return config
+
+
+_config = get_config()
+_write_slots = threading.BoundedSemaphore(_config['MAX_CONCURRENT_WRITES'])
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+
+# --- Counters ---
+
+def _count(name):
+    key = f'admission:count:{name}'
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_counters():
+    values = cache.get_many([f'admission:count:{name}' for name in COUNTERS])
+    counters = {name: values.get(f'admission:count:{name}', 0) for name in COUNTERS}
+    counters['in_flight'] = _in_flight
+    return counters
+
+
+def reset_counters():
+    cache.delete_many([f'admission:count:{name}' for name in COUNTERS])
+
+
+# --- Gates ---
+
+def take_token(user_id, config=_config, now=None):
+    """
+    Returns True if the user has a request left in the current window.
+
+    Each window of BURST / RATE seconds allows BURST requests, which is RATE
+    per second sustained. The requests are counted with add and incr, which
+    are atomic in the local-memory cache (and in memcached or Redis), so two
+    concurrent requests cannot both take the last one. The file cache's incr
+    is a plain read and write, so across processes it may admit a few extra.
+    """
+    now = now or time.time()
+    window = config['BURST'] / config['RATE']
+    key = f'admission:bucket:{user_id}:{int(now // window)}'
+    timeout = int(window) + 1
+    cache.add(key, 0, timeout=timeout)
+    try:
+        used = cache.incr(key)
+    except ValueError:
+        # Expired between add and incr
+        cache.add(key, 1, timeout=timeout)
+        used = 1
+    return used <= config['BURST']
+
+
+def _opens_at(config):
+    opens_at = config['OPENS_AT']
+    if isinstance(opens_at, str):
+        opens_at = datetime.fromisoformat(opens_at)
+    if opens_at is not None and timezone.is_naive(opens_at):
+        opens_at = timezone.make_aware(opens_at)
+    return opens_at
+
+
+def registration_slot(student, config=_config):
+    """
+    Returns the time the student may start registering, or None when
+    staggering is disabled. Students are ranked by CGPA (highest first) or by
+    student ID (earliest intake first).
+    """
+    opens_at = _opens_at(config)
+    if opens_at is None:
+        return None
+
+    key = f'admission:rank:{student.id}:{config["SLOT_ORDER"]}'
+    rank = cache.get(key)
+    if rank is None:
+        if config['SLOT_ORDER'] == 'student_id':
+            rank = Student.objects.filter(student_id__lt=student.student_id).count()
+        else:
+            rank = Student.objects.filter(cgpa__gt=student.cgpa).count()
+        cache.set(key, rank, timeout=600)
+
+    slot = rank // config['STUDENTS_PER_SLOT']
+    return opens_at + timedelta(minutes=slot * config['SLOT_MINUTES'])
+
+
+def _reject(request, message, status):
+    if request.content_type == 'application/json':
+        response = JsonResponse({'ok': False, 'errors': [message]}, status=status)
+    else:
+        messages.warning(request, message)
+        response = redirect(request.path)
+    if status == 429:
+        response['Retry-After'] = '1'
+    return response
+
+
+def admission_controlled(view_func):
+    """Applies the registration gates to POST requests of a view."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        global _in_flight
+        config = _config
+        if request.method != 'POST' or not config['ENABLED']:
+            return view_func(request, *args, **kwargs)
+
+        # Loaded once per request, so the view does not query it again
+        student = request.student
+        if student is not None:
+            slot = registration_slot(student, config)
+            if slot is not None and timezone.now() < slot:
+                _count('too_early')
+                local_slot = timezone.localtime(slot)
+                return _reject(request, f"Your registration slot opens at {local_slot:%b %d, %H:%M}.", 403)
+
+        if not take_token(request.user.id, config):
+            _count('rate_limited')
+            return _reject(request, "Too many requests. Please wait a moment and try again.", 429)
+
+        if not _write_slots.acquire(timeout=config['ACQUIRE_TIMEOUT']):
+            _count('overloaded')
+            return _reject(request, "The system is busy right now. Please try again in a few seconds.", 503)
+
+        _count('admitted')
+        with _in_flight_lock:
+            _in_flight += 1
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            with _in_flight_lock:
+                _in_flight -= 1
+            _write_slots.release()
+    return wrapper
@@ -0,0 +1,259 @@
+"""
+Set-based checks for enrollment data that breaks the advising rules.
+
+Each check is a single grouped, windowed or self-joined query, so the cost
+does not depend on looping over students in Python.
+
+`scan()` works at enrollment level and can run incrementally: given the
+high-water mark of the previous run it only looks at students and sections
+that received enrollments since then. Drops can only remove violations, so
+new inserts are the only thing an incremental scan has to follow; capacity
+and timetable edits are caught by a periodic full scan. Credit loads,
+retakes and clashes are checked within a term.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.utils import timezone
+
+from . import events
+from .enrollment import MAX_CREDITS
+from .models import ConsistencyScan, Course, Enrollment, Student, current_term_id
+
+ENROLLMENT = Enrollment._meta.db_table
+COURSE = Course._meta.db_table
+STUDENT = Student._meta.db_table
+
+# Enrollments are stamped before their transaction commits, so incremental
+# scans reach back a little past the previous high-water mark
+SCAN_OVERLAP = timedelta(seconds=60)
+
+
+def over_credit():
+    """Students whose enrolled credits in the current term exceed the limit."""
+    return list(
+        Student.objects.annotate(total=Sum('enrollments__course__credit', filter=Q(enrollments__term_id=current_term_id())))
+        .filter(total__gt=MAX_CREDITS)
+        .order_by('student_id')
+        .values('id', 'student_id', 'total')
+    )
+
+
+def duplicate_codes():
+    """Students enrolled in more than one section of the same course code this term."""
+    return list(
+        Enrollment.objects.current().values('student_id', 'student__student_id', 'course__code')
+        .annotate(sections=Count('id'))
+        .filter(sections__gt=1)
+        .order_by('student__student_id', 'course__code')
+    )
+
+
+def oversold_sections():
+    """Sections with more enrollments than seats."""
+    return list(
+        Course.objects.annotate(enrolled=Count('enrollment'))
+        .filter(enrolled__gt=F('capacity'))
+        .order_by('code', 'section')
+        .values('id', 'code', 'section', 'capacity', 'enrolled')
+    )
+
+
+def _fetch(sql, params, columns):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _touched(column, since):
+    """Restricts a query to partitions that received enrollments after `since`."""
+    if since is None:
+        return '', []
+    sql = f" AND e.{column} IN (SELECT {column} FROM {ENROLLMENT} WHERE enrolled_at > %s)"
+    return sql, [connection.ops.adapt_datetimefield_value(since)]
+
+
+def clashes(since=None):
+    """
+    Pairs of a student's sections that overlap in time. `enrollment_id` is
+    the later of the two enrollments.
+    """
+    scope, params = _touched('student_id', since)
+    sql = f"""
+        SELECT s.student_id, c1.id, c1.code, c2.id, c2.code, c1.day, e2.id, e.student_id
+        FROM {ENROLLMENT} e
+        JOIN {ENROLLMENT} e2 ON e2.student_id = e.student_id AND e2.term_id = e.term_id
+            AND (e2.enrolled_at > e.enrolled_at OR (e2.enrolled_at = e.enrolled_at AND e2.id > e.id))
+        JOIN {COURSE} c1 ON c1.id = e.course_id
+        JOIN {COURSE} c2 ON c2.id = e2.course_id
+        JOIN {STUDENT} s ON s.id = e.student_id
+        WHERE c1.day = c2.day AND c1.start_time < c2.end_time AND c1.end_time > c2.start_time{scope}
+        ORDER BY s.student_id
+    """
+    columns = ['student_id', 'course_id', 'code', 'other_course_id', 'other_code', 'day', 'enrollment_id', 'student_pk']
+    return _fetch(sql, params, columns)
+
+
+# --- Enrollment-level scan ---
+
+def oversold_enrollments(since=None):
+    """Enrollments beyond a section's capacity, in registration order."""
+    scope, params = _touched('course_id', since)
+    sql = f"""
+        SELECT enrollment_id, student_id, course_id, code, section, seat, capacity FROM (
+            SELECT e.id AS enrollment_id, s.student_id, e.course_id, c.code, c.section, c.capacity,
+                   ROW_NUMBER() OVER (PARTITION BY e.course_id ORDER BY e.enrolled_at, e.id) AS seat
+            FROM {ENROLLMENT} e
+            JOIN {COURSE} c ON c.id = e.course_id
+            JOIN {STUDENT} s ON s.id = e.student_id
+            WHERE 1 = 1{scope}
+        ) ranked
+        WHERE seat > capacity
+    """
+    return _fetch(sql, params, ['enrollment_id', 'student_id', 'course_id', 'code', 'section', 'seat', 'capacity'])
+
+
+def over_credit_enrollments(since=None):
+    """Enrollments that took a student past the credit limit."""
+    scope, params = _touched('student_id', since)
+    sql = f"""
+        SELECT enrollment_id, student_id, student_pk, code, section, running_credits FROM (
+            SELECT e.id AS enrollment_id, s.student_id, e.student_id AS student_pk, c.code, c.section,
+                   SUM(c.credit) OVER (
+                       PARTITION BY e.student_id, e.term_id ORDER BY e.enrolled_at, e.id
+                       ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                   ) AS running_credits
+            FROM {ENROLLMENT} e
+            JOIN {COURSE} c ON c.id = e.course_id
+            JOIN {STUDENT} s ON s.id = e.student_id
+            WHERE 1 = 1{scope}
+        ) ranked
+        WHERE running_credits > %s
+    """
+    columns = ['enrollment_id', 'student_id', 'student_pk', 'code', 'section', 'running_credits']
+    return _fetch(sql, params + [MAX_CREDITS], columns)
+
+
+def duplicate_enrollments(since=None):
+    """Second and later sections of a course code taken by the same student."""
+    scope, params = _touched('student_id', since)
+    sql = f"""
+        SELECT enrollment_id, student_id, student_pk, code, section FROM (
+            SELECT e.id AS enrollment_id, s.student_id, e.student_id AS student_pk, c.code, c.section,
+                   ROW_NUMBER() OVER (PARTITION BY e.student_id, e.term_id, c.code ORDER BY e.enrolled_at, e.id) AS n
+            FROM {ENROLLMENT} e
+            JOIN {COURSE} c ON c.id = e.course_id
+            JOIN {STUDENT} s ON s.id = e.student_id
+            WHERE 1 = 1{scope}
+        ) ranked
+        WHERE n > 1
+    """
+    return _fetch(sql, params, ['enrollment_id', 'student_id', 'student_pk', 'code', 'section'])
+
+
+def scan(since=None):
+    return {
+        'oversold': oversold_enrollments(since),
+        'over_credit': over_credit_enrollments(since),
+        'duplicate': duplicate_enrollments(since),
+        'clash': clashes(since),
+    }
+
+
+def _breaks(kept, course):
+    """The rules `course` breaks next to the sections already `kept`."""
+    reasons = []
+    if sum(c.credit for c in kept) + course.credit > MAX_CREDITS:
+        reasons.append('over_credit')
+    if any(c.code == course.code for c in kept):
+        reasons.append('duplicate')
+    if any(c.day == course.day and c.start_time < course.end_time and c.end_time > course.start_time for c in kept):
+        reasons.append('clash')
+    return reasons
+
+
+def repair_plan(violations):
+    """
+    Turns scan results into the smallest first-come, first-served set of
+    enrollments to drop. Each affected student's enrollments in a term are
+    walked in registration order and kept while they still fit (credit
+    limit, one section per code, no clashes); then every oversold section
+    keeps its earliest remaining enrollments up to capacity. Violations are
+    only used to find the students and sections to look at, so one drop
+    that fixes several of them is planned once.
+    """
+    students = {row['student_pk'] for kind in ('over_credit', 'duplicate', 'clash') for row in violations.get(kind, [])}
+    sections = {row['course_id'] for row in violations.get('oversold', [])}
+    if not students and not sections:
+        return []
+    enrollments = list(
+        Enrollment.objects.filter(Q(student_id__in=students) | Q(course_id__in=sections))
+        .select_related('course', 'student').order_by('enrolled_at', 'id')
+    )
+
+    plan = {}
+
+    def drop(enrollment, reasons):
+        plan[enrollment.id] = {
+            'enrollment_id': enrollment.id,
+            'student_id': enrollment.student.student_id,
+            'code': enrollment.course.code,
+            'reasons': reasons,
+        }
+
+    schedules = defaultdict(list)
+    for enrollment in enrollments:
+        if enrollment.student_id in students:
+            schedules[(enrollment.student_id, enrollment.term_id)].append(enrollment)
+    for schedule in schedules.values():
+        kept = []
+        for enrollment in schedule:
+            reasons = _breaks(kept, enrollment.course)
+            if reasons:
+                drop(enrollment, reasons)
+            else:
+                kept.append(enrollment.course)
+
+    # Dropping never creates a student violation, so seats go last
+    seats = defaultdict(int)
+    for enrollment in enrollments:
+        if enrollment.course_id in sections and enrollment.id not in plan:
+            seats[enrollment.course_id] += 1
+            if seats[enrollment.course_id] > enrollment.course.capacity:
+                drop(enrollment, ['oversold'])
+    return sorted(plan.values(), key=lambda item: item['enrollment_id'])
+
+
+def run_scan(full=False):
+    """
+    Scans from the previous run's high-water mark (or everything when
+    `full`) and records the run.
+    """
+    previous = ConsistencyScan.objects.exclude(high_water_mark=None).first()
+    since = None if full or previous is None else previous.high_water_mark - SCAN_OVERLAP
+    # Read the mark first so enrollments arriving during the scan are rescanned next time
+    high_water_mark = Enrollment.objects.aggregate(mark=Max('enrolled_at'))['mark'] or since
+
+    violations = scan(since)
+    plan = repair_plan(violations)
+    return ConsistencyScan.objects.create(
+        full=since is None,
+        since=since,
+        high_water_mark=high_water_mark,
+        violations=sum(len(rows) for rows in violations.values()),
+        repair_plan=plan,
+        finished_at=timezone.now(),
+    ), violations
+
+
+def apply_repair_plan(scan_run):
+    enrollment_ids = [item['enrollment_id'] for item in scan_run.repair_plan]
+    with transaction.atomic():
+        enrollments = Enrollment.objects.filter(id__in=enrollment_ids)
+        events.record_drops(enrollments)
+        deleted, _ = enrollments.delete()
+        scan_run.repaired = True
+        scan_run.save(update_fields=['repaired'])
+    return deleted
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AdvisingAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'advising_app'
+
+    def ready(self):
+        # Connects the signal handlers that keep cached profiles, catalog
+        # fragments, prerequisites and the current term fresh
+        from . import catalog, prerequisites, roles, terms  # noqa: F401
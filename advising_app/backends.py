@@ -0,0 +1,55 @@
+"""
+Authentication backend that verifies passwords on a bounded thread pool.
+
+Password hashing dominates login cost. The hash functions release the GIL,
+so running them on a pool sized to the CPU count lets logins use every core
+while capping how much CPU a login burst can take from other requests.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+
+UserModel = get_user_model()
+
+_pool = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'PASSWORD_VERIFY_WORKERS', None) or os.cpu_count() or 1,
+    thread_name_prefix='password-verify',
+)
+
+
+def verify(password, encoded):
+    """
+    Checks a password on the pool. Returns (is_correct, needs_rehash) where
+    needs_rehash means the hash uses an outdated algorithm or cost.
+    """
+    outdated = []
+    is_correct = _pool.submit(check_password, password, encoded, outdated.append).result()
+    return is_correct, bool(outdated)
+
+
+class PooledModelBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user.
+            _pool.submit(make_password, password).result()
+            return
+
+        is_correct, needs_rehash = verify(password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return
+        if needs_rehash:
+            # Transparent migration to the configured hasher profile
+            user.password = _pool.submit(make_password, password).result()
+            user.save(update_fields=['password'])
+        return user
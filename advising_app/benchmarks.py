@@ -0,0 +1,58 @@
+"""
+Helpers shared by the bench_* management commands.
+
+Benchmarks that need data create it inside `throwaway_data()`, which always
+rolls back, so they can be pointed at a real database safely.
+"""
+import datetime
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import Client
+from django.test.utils import setup_test_environment
+
+from .models import Course, Student
+
+
+@contextmanager
+def throwaway_data():
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def client():
+    # Allows the 'testserver' host used by the test client
+    try:
+        setup_test_environment()
+    except RuntimeError:
+        pass
+    return Client()
+
+
+def make_student(username='bench-student', password='bench-password', department='BENCH'):
+    user = User.objects.create_user(username, password=password)
+    student = Student.objects.create(user=user, student_id=f'B{user.id:09d}', department=department)
+    return student, password
+
+
+def make_sections(count, department='BENCH', start_id=0):
+    """Builds (unsaved) sections with distinct codes and spread-out times."""
+    days = [code for code, _ in Course.DAYS_CHOICES]
+    courses = []
+    for i in range(count):
+        start = datetime.time(8 + (i % 10), 0)
+        courses.append(Course(
+            code=f'{department[:3]}{start_id + i:04d}',
+            title=f'Benchmark Course {start_id + i}',
+            credit=3.0,
+            department=department,
+            section=str(1 + i % 5),
+            room=f'{100 + i % 50}',
+            capacity=40,
+            day=days[i % len(days)],
+            start_time=start,
+            end_time=datetime.time(start.hour + 1, 15),
+        ))
+    return courses
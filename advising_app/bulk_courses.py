@@ -0,0 +1,283 @@
+"""
+Bulk section administration: CSV upload, multi-row edits and bulk delete.
+
+Each operation first builds a plan in memory (rows to create, field changes
+per section, sections to delete), validated against the current term's
+sections with a handful of queries and checked for room and instructor
+double-bookings. The plan is shown as a diff and stored in the database
+under a token, so the confirming request may reach any worker; confirming
+it applies everything in one transaction with
+bulk_create, a single bulk_update and set-based deletes. A plan is refused
+if the catalog changed after it was previewed.
+"""
+import csv
+import datetime
+import io
+import secrets
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from . import catalog, events, scheduling, stats, versions
+from .models import BulkPlan, Course, Enrollment, Faculty, PreferredCourse, current_term_id
+
+PLAN_SECONDS = 30 * 60
+BATCH_SIZE = 2000
+
+UPLOAD_COLUMNS = [
+    'code', 'section', 'title', 'credit', 'department', 'capacity', 'room', 'day', 'start_time', 'end_time', 'faculty',
+]
+EDIT_FIELDS = ['capacity', 'room', 'day', 'start_time', 'end_time']
+TIME_FIELDS = ['start_time', 'end_time']
+REQUIRED_FOR_NEW = ['title', 'credit', 'department']
+
+DAYS = {value for value, _ in Course.DAYS_CHOICES}
+
+
+def _new_plan(kind):
+    return {
+        'kind': kind,
+        'term_id': current_term_id(),
+        'version': catalog.version(),
+        'create': [],
+        'update': [],
+        'delete': [],
+        'errors': [],
+        'warnings': [],
+        'unchanged': 0,
+    }
+
+
+def _clean(values, faculty_ids):
+    """Converts raw strings to field values. Returns (fields, errors); blanks are left out."""
+    fields = {}
+    errors = []
+    for name, raw in values.items():
+        raw = (raw or '').strip()
+        if not raw:
+            continue
+        try:
+            if name in ('code', 'section', 'title', 'department', 'room'):
+                fields[name] = raw
+            elif name == 'credit':
+                fields[name] = float(raw)
+            elif name == 'capacity':
+                fields[name] = int(raw)
+                if fields[name] < 0:
+                    raise ValueError
+            elif name == 'day':
+                day = raw[:3].capitalize()
+                if day not in DAYS:
+                    raise ValueError
+                fields[name] = day
+            elif name in ('start_time', 'end_time'):
+                fields[name] = datetime.time.fromisoformat(raw)
+            elif name == 'faculty':
+                if raw not in faculty_ids:
+                    raise ValueError
+                fields['assigned_faculty_id'] = faculty_ids[raw]
+        except ValueError:
+            errors.append(f"invalid {name} '{raw}'")
+    return fields, errors
+
+
+def _check_schedule(plan, timetable, label, section):
+    if section.end_time <= section.start_time:
+        plan['errors'].append(f"{label}: end time must be after start time.")
+        return
+    for conflict in timetable.conflicts(section):
+        plan['errors'].append(f"{label}: {scheduling.describe(conflict)}.")
+    timetable.update(section)
+
+
+def _diff(plan, timetable, course, fields, label):
+    """Adds the changes `fields` make to `course` to the plan."""
+    changes = {
+        name: [getattr(course, name), value] for name, value in fields.items() if getattr(course, name) != value
+    }
+    if not changes:
+        plan['unchanged'] += 1
+        return
+    plan['update'].append({'id': course.id, 'code': course.code, 'section': course.section, 'changes': changes})
+    merged = scheduling.section_of(course)._replace(**{k: v for k, v in fields.items() if k in scheduling.FIELDS})
+    _check_schedule(plan, timetable, label, merged)
+
+
+def _capacity_warnings(plan):
+    lowered = {item['id']: item for item in plan['update'] if 'capacity' in item['changes']}
+    if not lowered:
+        return
+    enrolled = Enrollment.objects.filter(course_id__in=lowered).values('course_id').annotate(n=Count('id'))
+    for row in enrolled:
+        item = lowered[row['course_id']]
+        if item['changes']['capacity'][1] < row['n']:
+            plan['warnings'].append(
+                f"{item['code']} Sec {item['section']}: capacity {item['changes']['capacity'][1]} "
+                f"is below the {row['n']} students already enrolled."
+            )
+
+
+def plan_upload(file):
+    """Plans creating and updating sections from an uploaded CSV file."""
+    plan = _new_plan('upload')
+    try:
+        reader = csv.DictReader(io.TextIOWrapper(file, encoding='utf-8-sig', newline=''))
+        rows = list(reader)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        plan['errors'].append(f"Could not read the file: {exc}")
+        return plan
+    missing = {'code', 'section'} - set(reader.fieldnames or [])
+    if missing:
+        plan['errors'].append(f"Missing columns: {', '.join(sorted(missing))}.")
+        return plan
+
+    existing = {(c.code, c.section): c for c in Course.objects.current()}
+    faculty_ids = dict(Faculty.objects.values_list('faculty_id', 'id'))
+    timetable = scheduling.Timetable(scheduling.section_of(c) for c in existing.values())
+    seen = set()
+    for line, row in enumerate(rows, start=2):
+        fields, errors = _clean({name: row.get(name) for name in UPLOAD_COLUMNS}, faculty_ids)
+        key = (fields.get('code'), fields.get('section'))
+        label = f"Line {line} ({key[0]} Sec {key[1]})"
+        if not key[0] or not key[1]:
+            errors.append("code and section are required")
+        elif key in seen:
+            errors.append("section appears twice in the file")
+        seen.add(key)
+        course = existing.get(key)
+        if course is None:
+            errors.extend(
+                f"{name} is required for a new section" for name in REQUIRED_FOR_NEW if not (row.get(name) or '').strip()
+            )
+        if errors:
+            plan['errors'].append(f"{label}: {'; '.join(errors)}.")
+            continue
+
+        if course is not None:
+            _diff(plan, timetable, course, fields, label)
+        else:
+            fields.setdefault('start_time', datetime.time(9, 0))
+            fields.setdefault('end_time', datetime.time(10, 30))
+            new = Course(term_id=plan['term_id'], **fields)
+            plan['create'].append(fields)
+            # New sections get negative ids so the timetable can tell them apart
+            new.id = -line
+            _check_schedule(plan, timetable, label, scheduling.section_of(new))
+    _capacity_warnings(plan)
+    return plan
+
+
+def plan_edits(edits):
+    """Plans changes to existing sections, given as {course_id: {field: raw value}}."""
+    plan = _new_plan('edit')
+    courses = Course.objects.current().in_bulk(list(edits))
+    timetable = scheduling.Timetable.for_term(plan['term_id'])
+    for course_id, values in edits.items():
+        course = courses.get(course_id)
+        if course is None:
+            plan['errors'].append(f"Section {course_id} not found.")
+            continue
+        label = f"{course.code} Sec {course.section}"
+        fields, errors = _clean({name: values.get(name) for name in EDIT_FIELDS}, {})
+        if errors:
+            plan['errors'].append(f"{label}: {'; '.join(errors)}.")
+            continue
+        if 'room' in values and not (values['room'] or '').strip():
+            fields['room'] = None
+        _diff(plan, timetable, course, fields, label)
+    _capacity_warnings(plan)
+    return plan
+
+
+def plan_delete(course_ids):
+    plan = _new_plan('delete')
+    courses = Course.objects.current().filter(id__in=course_ids).annotate(enrolled=Count('enrollment'))
+    for course in courses.order_by('code', 'section'):
+        plan['delete'].append({
+            'id': course.id, 'code': course.code, 'section': course.section,
+            'department': course.department, 'enrolled': course.enrolled,
+        })
+    if not plan['delete']:
+        plan['errors'].append("No sections selected.")
+    return plan
+
+
+def save_plan(plan, user):
+    token = secrets.token_urlsafe(16)
+    BulkPlan.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=PLAN_SECONDS)).delete()
+    BulkPlan.objects.create(token=token, user=user, plan=plan)
+    return token
+
+
+def _restore_times(plan):
+    """Stored plans hold times as ISO strings; turn them back into times."""
+    for fields in plan['create']:
+        for name in TIME_FIELDS:
+            if name in fields:
+                fields[name] = datetime.time.fromisoformat(fields[name])
+    for item in plan['update']:
+        for name in TIME_FIELDS:
+            if name in item['changes']:
+                item['changes'][name] = [datetime.time.fromisoformat(value) for value in item['changes'][name]]
+    return plan
+
+
+def load_plan(token, user):
+    plan = BulkPlan.objects.filter(
+        token=token, user=user, created_at__gte=timezone.now() - timedelta(seconds=PLAN_SECONDS),
+    ).values_list('plan', flat=True).first()
+    return None if plan is None else _restore_times(plan)
+
+
+def discard_plan(token):
+    BulkPlan.objects.filter(token=token).delete()
+
+
+def apply(plan, actor=None):
+    """
+    Carries out a previewed plan in one transaction. Raises ValueError if
+    the plan has errors or the catalog changed since it was built.
+    """
+    if plan['errors']:
+        raise ValueError("The plan has errors and cannot be applied.")
+    if plan['version'] != catalog.version(fresh=True) or plan['term_id'] != current_term_id():
+        raise ValueError("Sections changed since this preview was made. Please start again.")
+
+    departments = {fields['department'] for fields in plan['create']}
+    # One catalog bump for the whole plan, not one per deleted section
+    with versions.deferred(), transaction.atomic():
+        if plan['create']:
+            Course.objects.bulk_create(
+                [Course(term_id=plan['term_id'], **fields) for fields in plan['create']], batch_size=BATCH_SIZE,
+            )
+
+        if plan['update']:
+            courses = Course.objects.in_bulk([item['id'] for item in plan['update']])
+            changed_fields = set()
+            for item in plan['update']:
+                course = courses.get(item['id'])
+                if course is None:
+                    raise ValueError(f"{item['code']} Sec {item['section']} no longer exists. Please start again.")
+                departments.add(course.department)
+                for name, (old, new) in item['changes'].items():
+                    setattr(course, name, new)
+                    changed_fields.add(name)
+            Course.objects.bulk_update(courses.values(), sorted(changed_fields), batch_size=BATCH_SIZE)
+
+        if plan['delete']:
+            course_ids = [item['id'] for item in plan['delete']]
+            departments.update(item['department'] for item in plan['delete'])
+            enrollments = Enrollment.objects.filter(course_id__in=course_ids)
+            events.record_drops(enrollments, actor=actor)
+            # Children go first with one statement each, so deleting the
+            # sections has nothing left to cascade
+            PreferredCourse.objects.filter(course_id__in=course_ids).delete()
+            enrollments.delete()
+            Course.objects.filter(id__in=course_ids).delete()
+
+        # bulk_create and bulk_update send no signals
+        catalog.bump()
+    stats.refresh_departments(departments)
+    return {'created': len(plan['create']), 'updated': len(plan['update']), 'deleted': len(plan['delete'])}
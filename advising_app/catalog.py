@@ -0,0 +1,61 @@
+"""
+Catalog version and cached catalog fragments.
+
+Every change to a section (or to a faculty profile shown next to it) bumps
+the catalog version, and rendered catalog fragments are cached under the
+version they were built from, so they never need explicit invalidation.
+Seat counts and per-student status change far more often than the catalog
+and are always rendered fresh.
+
+The version is a shared counter (see versions.py), so a bump on one worker
+reaches all of them within seconds.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.template.loader import get_template
+
+from . import versions
+from .models import Course, Faculty
+
+FRAGMENT_SECONDS = 60 * 60
+
+CELLS_TEMPLATE = 'advising_app/student/catalog_cells.html'
+
+
+def version(fresh=False):
+    return versions.get('catalog', fresh)
+
+
+def bump():
+    return versions.bump('catalog')
+
+
+def cached_cells():
+    """The cells already rendered for this catalog version, as {course_id: html}."""
+    return cache.get(f'catalog:cells:{version()}') or {}
+
+
+def course_cells(courses):
+    """
+    Rendered static cells (code, section, schedule, credit) for each course,
+    as {course_id: html}, from a single cache entry per catalog version.
+    """
+    key = f'catalog:cells:{version()}'
+    cells = cache.get(key) or {}
+    missing = [course for course in courses if course.id not in cells]
+    if missing:
+        template = get_template(CELLS_TEMPLATE)
+        for course in missing:
+            cells[course.id] = template.render({'course': course})
+        cache.set(key, cells, FRAGMENT_SECONDS)
+    # Rendered output is a SafeString and stays one through the cache
+    return cells
+
+
+def _catalog_changed(sender, **kwargs):
+    bump()
+
+
+for model in (Course, Faculty):
+    post_save.connect(_catalog_changed, sender=model, dispatch_uid=f'catalog_{model.__name__}_save')
+    post_delete.connect(_catalog_changed, sender=model, dispatch_uid=f'catalog_{model.__name__}_delete')
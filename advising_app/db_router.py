@@ -0,0 +1,101 @@
+"""
+Primary/replica database routing.
+
+Writes always go to `default`. Reads stay on `default` too unless the code
+explicitly opts in with `read_from_replica()` / `@replica_reads`, so only
+catalog and reporting queries that tolerate replication lag are moved.
+After a write, the session is pinned to the primary for a few seconds so
+users always see their own changes.
+"""
+import random
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db import connections
+
+SESSION_KEY = '_primary_until'
+
+_state = Local()
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+@contextmanager
+def read_from_replica():
+    previous = getattr(_state, 'replica_ok', False)
+    _state.replica_ok = True
+    try:
+        yield
+    finally:
+        _state.replica_ok = previous
+
+
+@contextmanager
+def pin_primary():
+    previous = getattr(_state, 'pinned', False)
+    _state.pinned = True
+    try:
+        yield
+    finally:
+        _state.pinned = previous
+
+
+def replica_reads(view_func):
+    """Lets every read in a view go to a replica."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with read_from_replica():
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not getattr(_state, 'replica_ok', False) or getattr(_state, 'pinned', False):
+            return 'default'
+        # Reads inside a transaction must see its uncommitted writes
+        if connections['default'].in_atomic_block:
+            return 'default'
+        aliases = replica_aliases()
+        return random.choice(aliases) if aliases else 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Keeps a session on the primary for REPLICA_STICKY_SECONDS after any
+    write request, so a redirect after POST reads its own writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_aliases():
+            return self.get_response(request)
+
+        sticky = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+        is_write = request.method not in ('GET', 'HEAD', 'OPTIONS')
+        pinned = is_write or request.session.get(SESSION_KEY, 0) > time.time()
+
+        if not pinned:
+            return self.get_response(request)
+
+        with pin_primary():
+            response = self.get_response(request)
+        if is_write and request.user.is_authenticated:
+            request.session[SESSION_KEY] = time.time() + sticky
+        return response
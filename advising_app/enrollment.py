@@ -0,0 +1,230 @@
+"""
+Shared enrollment rules.
+
+All add/drop paths go through `apply_changes`, which validates the
+student's final schedule (and prerequisites) in memory and then writes
+every change in one transaction (one delete, one bulk insert) together
+with its enrollment events. Advisors may pass `override` to add past the
+prerequisite, clash, capacity and credit rules; the rules bypassed are
+reported and recorded on the add events.
+"""
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import Count
+
+from . import events, prerequisites
+from .models import AdvisingRequest, Course, Enrollment, PreferredCourse
+
+MAX_CREDITS = 15
+
+
+class CartResult:
+    def __init__(self):
+        self.added = []
+        self.dropped = []
+        self.errors = []
+        self.warnings = []
+        # Rule violations let through by an advisor override
+        self.overridden = []
+        self.old_credits = 0
+        self.new_credits = 0
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def as_dict(self):
+        return {
+            'ok': self.ok,
+            'added': [c.code for c in self.added],
+            'dropped': [c.code for c in self.dropped],
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'overridden': self.overridden,
+        }
+
+
+def _overlaps(a, b):
+    return a.day == b.day and a.start_time < b.end_time and a.end_time > b.start_time
+
+
+def _clean_ids(ids):
+    cleaned = []
+    for value in ids:
+        try:
+            cleaned.append(int(value))
+        except (TypeError, ValueError):
+            continue
+    return list(dict.fromkeys(cleaned))
+
+
+def _refuse(result, message, override):
+    if override:
+        result.overridden.append(message)
+    else:
+        result.errors.append(message)
+
+
+def plan_changes(student, add_ids, drop_ids, result=None, lock=False, override=False):
+    """
+    Works out which enrollments to create and delete, validating credits,
+    clashes, retakes, prerequisites and capacity against the final schedule.
+    """
+    result = result or CartResult()
+    add_ids = _clean_ids(add_ids)
+    drop_ids = _clean_ids(drop_ids)
+
+    enrolled = {c.id: c for c in Course.objects.current().filter(enrollment__student=student)}
+
+    to_drop = []
+    for course_id in drop_ids:
+        if course_id in enrolled:
+            to_drop.append(enrolled[course_id])
+        else:
+            course = Course.objects.filter(id=course_id).first()
+            result.errors.append(f"Not enrolled in {course.code if course else course_id}")
+
+    # Sections of other terms are not offered and read as not found
+    courses = Course.objects.current().filter(id__in=add_ids)
+    if lock:
+        courses = courses.select_for_update()
+    courses = {c.id: c for c in courses}
+    seat_counts = dict(
+        Enrollment.objects.filter(course_id__in=courses).values('course_id')
+        .annotate(n=Count('id')).values_list('course_id', 'n')
+    )
+
+    drop_set = {c.id for c in to_drop}
+    kept = [c for c in enrolled.values() if c.id not in drop_set]
+    to_add = []
+    for course_id in add_ids:
+        course = courses.get(course_id)
+        if course is None:
+            result.errors.append(f"Course {course_id} not found.")
+        elif course_id in enrolled and course_id not in drop_set:
+            result.warnings.append(f"Already enrolled in {course.code}")
+        else:
+            to_add.append(course)
+
+    final = kept + to_add
+    missing_prerequisites = prerequisites.eligibility(student, [c.code for c in to_add])
+    completed = prerequisites.completed_codes(student)
+    for course in to_add:
+        if course.code in completed or any(other.code == course.code and other.id != course.id for other in final):
+            result.errors.append(f"You have already taken {course.code}. You cannot retake the same course.")
+            continue
+
+        missing = missing_prerequisites[course.code]
+        if missing:
+            _refuse(result, f"Cannot enroll in {course.code}. Missing prerequisites: {', '.join(missing)}", override)
+            continue
+
+        clash = next((other for other in final if other.id != course.id and _overlaps(course, other)), None)
+        if clash:
+            _refuse(result, f"Time clash with {clash.code} ({clash.day} {clash.start_time})", override)
+            continue
+
+        if seat_counts.get(course.id, 0) >= course.capacity:
+            _refuse(result, f"Course {course.code} is full.", override)
+
+    current_credits = sum(c.credit for c in enrolled.values())
+    final_credits = sum(c.credit for c in final)
+    result.old_credits = current_credits
+    result.new_credits = final_credits
+    if final_credits > MAX_CREDITS:
+        added_credits = sum(c.credit for c in to_add)
+        _refuse(
+            result,
+            f"Cannot enroll. Total credits would exceed {MAX_CREDITS}. Current: {current_credits}, Course: {added_credits}",
+            override,
+        )
+
+    return to_add, to_drop, result
+
+
+def apply_changes(student, add_ids=(), drop_ids=(), actor=None, override=False):
+    """
+    Applies a batch of adds and drops atomically. Nothing is written unless
+    the whole batch is valid. `actor` is the user recorded on the events.
+    """
+    result = CartResult()
+    try:
+        with transaction.atomic():
+            to_add, to_drop, result = plan_changes(student, add_ids, drop_ids, result, lock=True, override=override)
+            if not result.ok:
+                return result
+
+            if to_drop:
+                Enrollment.objects.filter(student=student, course__in=to_drop).delete()
+            if to_add:
+                Enrollment.objects.bulk_create([Enrollment(student=student, course=c, term_id=c.term_id) for c in to_add])
+            events.record_changes(
+                student, to_add, to_drop, result.old_credits, actor, overridden=result.overridden,
+            )
+    except IntegrityError:
+        # A concurrent request enrolled the same section first
+        result.errors.append("Your schedule changed while saving. Please try again.")
+        return result
+    except OperationalError as exc:
+        # SQLite gave up waiting for another writer's lock (see the timeout
+        # in settings); nothing was saved and nothing conflicted
+        if 'locked' not in str(exc):
+            raise
+        result.errors.append("Registration is busy right now and nothing was saved. Please try again.")
+        return result
+
+    result.added = to_add
+    result.dropped = to_drop
+    return result
+
+
+def submit_request(student, course_ids):
+    """
+    Validates preferred sections (existence, duplicates, clashes, credits)
+    with one query, then creates the advising request and its preferred
+    courses in one transaction. Returns (request or None, result); a pending
+    request that already exists is reported as a warning.
+    """
+    result = CartResult()
+    course_ids = _clean_ids(course_ids)
+    if not course_ids:
+        result.errors.append("Please select at least one course.")
+        return None, result
+
+    courses = Course.objects.current().in_bulk(course_ids)
+    selected = []
+    for course_id in course_ids:
+        course = courses.get(course_id)
+        if course is None:
+            result.errors.append(f"Course {course_id} not found.")
+            continue
+        if any(other.code == course.code for other in selected):
+            result.errors.append(f"{course.code} is selected more than once.")
+            continue
+        clash = next((other for other in selected if _overlaps(course, other)), None)
+        if clash:
+            result.errors.append(f"{course.code} clashes with {clash.code} ({clash.day} {clash.start_time})")
+            continue
+        selected.append(course)
+
+    total_credits = sum(c.credit for c in courses.values())
+    if total_credits > MAX_CREDITS:
+        result.errors.append(f"Cannot submit request. Total credits exceed {MAX_CREDITS}. Selected: {total_credits}")
+    if not result.ok:
+        return None, result
+
+    try:
+        with transaction.atomic():
+            advising_request = AdvisingRequest.objects.create(student=student)
+            PreferredCourse.objects.bulk_create([
+                PreferredCourse(request=advising_request, course=course, priority=priority)
+                for priority, course in enumerate(selected, start=1)
+            ])
+    except IntegrityError:
+        # one_pending_request: a concurrent submit got there first. Not every
+        # backend names the constraint, so look for that request instead
+        if AdvisingRequest.objects.current().filter(student=student, status='Pending').exists():
+            result.warnings.append("You already have a pending request.")
+        else:
+            result.errors.append("Your request could not be saved. Please try again.")
+        return None, result
+    return advising_request, result
@@ -0,0 +1,173 @@
+"""
+Enrollment change feed.
+
+Every add, drop and request approval appends `EnrollmentEvent` rows in the
+same transaction as the change. Consumers registered with `@consumer` read
+the log from their own `EventCursor` and update derived data
+incrementally: `stats` keeps enrolled counts and credit loads, `balances`
+keeps student balances.
+
+By default consumers run from idle background workers, the
+`consume_events` command or job, so registration writes stay short. With
+ENROLLMENT_EVENTS['INLINE'] they also run right after each writing
+transaction commits, which keeps derived data current but makes every
+write (and SQLite's write lock) last longer. A consumer that fails leaves its cursor where it was, so the
+batch is retried on the next run.
+"""
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Sum
+
+from . import roles, stats
+from .models import Enrollment, EnrollmentEvent, EventCursor, Student, current_term_id
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+CONSUMERS = {}
+
+
+def consumer(name):
+    def register(func):
+        CONSUMERS[name] = func
+        return func
+    return register
+
+
+def inline():
+    return getattr(settings, 'ENROLLMENT_EVENTS', {}).get('INLINE', False)
+
+
+def _event(kind, student_id, course, total_after, actor, overridden=()):
+    return EnrollmentEvent(
+        kind=kind, student_id=student_id, course_id=course.id, term_id=course.term_id,
+        code=course.code, department=course.department, credit=course.credit,
+        total_after=total_after, actor=actor if actor and actor.is_authenticated else None,
+        override=bool(overridden), overridden=list(overridden),
+    )
+
+
+def _append(events):
+    EnrollmentEvent.objects.bulk_create(events)
+    if inline():
+        transaction.on_commit(consume_all)
+
+
+def record_changes(student, added, dropped, old_credits, actor=None, overridden=()):
+    """
+    Logs one student's batch: drops first, then adds, as apply_changes writes
+    them. `overridden` lists the rule messages an advisor override let the
+    adds past; they are stored on each add event.
+    """
+    total = old_credits
+    events = []
+    for course in dropped:
+        total -= course.credit
+        events.append(_event(EnrollmentEvent.DROP, student.id, course, total, actor))
+    for course in added:
+        total += course.credit
+        events.append(_event(EnrollmentEvent.ADD, student.id, course, total, actor, overridden))
+    _append(events)
+
+
+def record_drops(enrollments, actor=None):
+    """Logs the drop of every enrollment in a queryset, for any number of students."""
+    rows = list(enrollments.select_related('course').order_by('student_id', 'id'))
+    if not rows:
+        return
+    totals = dict(
+        ((student_id, term_id), total) for student_id, term_id, total in
+        Enrollment.objects.filter(student_id__in={e.student_id for e in rows})
+        .values('student_id', 'term_id').annotate(total=Sum('course__credit'))
+        .values_list('student_id', 'term_id', 'total')
+    )
+    events = []
+    for e in rows:
+        key = (e.student_id, e.term_id)
+        totals[key] -= e.course.credit
+        events.append(_event(EnrollmentEvent.DROP, e.student_id, e.course, totals[key], actor))
+    _append(events)
+
+
+def record_approvals(advising_requests, actor=None):
+    """Logs approved advising requests (with their students loaded)."""
+    _append([
+        EnrollmentEvent(
+            kind=EnrollmentEvent.APPROVE, student_id=r.student_id, term_id=r.term_id,
+            department=r.student.department, actor=actor if actor and actor.is_authenticated else None,
+        )
+        for r in advising_requests
+    ])
+
+
+# --- Consuming ---
+
+def consume(name, batch_size=BATCH_SIZE):
+    """Feeds the next batch of events to one consumer. Returns the batch size."""
+    handler = CONSUMERS[name]
+    with transaction.atomic():
+        cursor, _ = EventCursor.objects.select_for_update().get_or_create(name=name)
+        batch = list(EnrollmentEvent.objects.filter(id__gt=cursor.position).order_by('id')[:batch_size])
+        if not batch:
+            return 0
+        handler(batch)
+        cursor.position = batch[-1].id
+        cursor.save(update_fields=['position', 'updated_at'])
+    return len(batch)
+
+
+def consume_all(batch_size=BATCH_SIZE):
+    """Runs every consumer until it has caught up. Returns events handled per consumer."""
+    handled = {}
+    for name in CONSUMERS:
+        handled[name] = 0
+        try:
+            while True:
+                n = consume(name, batch_size)
+                handled[name] += n
+                if n < batch_size:
+                    break
+        except Exception:
+            logger.exception("Enrollment event consumer %r failed; it will retry on the next run.", name)
+    return handled
+
+
+def skip_to_latest(name):
+    """Marks every logged event as seen by `name`, after rebuilding its data from scratch."""
+    position = EnrollmentEvent.objects.aggregate(last=Max('id'))['last'] or 0
+    EventCursor.objects.update_or_create(name=name, defaults={'position': position})
+
+
+def lag():
+    """Unconsumed events per consumer."""
+    positions = dict(EventCursor.objects.values_list('name', 'position'))
+    last = EnrollmentEvent.objects.aggregate(last=Max('id'))['last'] or 0
+    return {name: last - positions.get(name, 0) for name in CONSUMERS}
+
+
+# --- Built-in consumers ---
+
+@consumer('stats')
+def update_stats(batch):
+    stats.apply_enrollment_events(batch)
+
+
+@consumer('balances')
+def update_balances(batch):
+    # Latest credit total per student in the current term, 6000 per credit
+    totals = {}
+    current = current_term_id()
+    for event in batch:
+        if event.kind in (EnrollmentEvent.ADD, EnrollmentEvent.DROP) and event.term_id == current:
+            totals[event.student_id] = event.total_after
+    by_balance = defaultdict(list)
+    for student_id, total in totals.items():
+        by_balance[total * 6000].append(student_id)
+    for balance, student_ids in by_balance.items():
+        Student.objects.filter(id__in=student_ids).update(current_balance=balance)
+    if totals:
+        roles.forget(Student.objects.filter(id__in=totals).values_list('user_id', flat=True))
@@ -2,7 +2,8 @@ from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
 from django.core.exceptions import ValidationError
-from .models import Student, Faculty
+from .models import Course, Student, Faculty
+from . import scheduling
 
 class StudentRegistrationForm(UserCreationForm):
     department = forms.CharField(max_length=100, required=True)
@@ -80,3 +81,27 @@ class FacultyRegistrationForm(forms.ModelForm):
         if commit:
             faculty.save()
         return faculty
+
+class CourseAdminForm(forms.ModelForm):
+    """Rejects room and instructor double-bookings when sections are edited in the Django admin."""
+
+    class Meta:
+        model = Course
+        fields = '__all__'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get('start_time'), cleaned_data.get('end_time')
+        if start and end and end <= start:
+            raise ValidationError("End time must be after start time.")
+        if self.errors:
+            return cleaned_data
+        faculty, term = cleaned_data.get('assigned_faculty'), cleaned_data.get('term')
+        section = scheduling.Section(
+            self.instance.pk, cleaned_data['code'], cleaned_data['section'], cleaned_data['day'],
+            start, end, cleaned_data.get('room'), faculty.id if faculty else None,
+        )
+        conflicts = scheduling.Timetable.for_term(term.id if term else None).conflicts(section)
+        if conflicts:
+            raise ValidationError([scheduling.describe(c) for c in conflicts])
+        return cleaned_data
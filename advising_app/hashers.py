@@ -0,0 +1,30 @@
+"""
+Password hashers with costs taken from settings.
+
+The costs default to Django's own; the settings only make them adjustable
+without subclassing. The algorithm names are unchanged, so hashes created by
+Django's stock hashers keep verifying. When the configured cost differs from
+the one stored in a hash, Django re-hashes the password on the user's next
+login.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+
+class ConfigurableScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = getattr(settings, 'PASSWORD_SCRYPT_WORK_FACTOR', ScryptPasswordHasher.work_factor)
+
+
+class ConfigurableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Requires the argon2-cffi package."""
+    time_cost = getattr(settings, 'PASSWORD_ARGON2_TIME_COST', Argon2PasswordHasher.time_cost)
+    memory_cost = getattr(settings, 'PASSWORD_ARGON2_MEMORY_COST', Argon2PasswordHasher.memory_cost)
+    parallelism = getattr(settings, 'PASSWORD_ARGON2_PARALLELISM', Argon2PasswordHasher.parallelism)
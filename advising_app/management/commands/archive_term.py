@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from advising_app import terms
+from advising_app.models import Term
+
+
+class Command(BaseCommand):
+    help = "Moves a closed term's sections, enrollments and requests to the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', help="Name of the term to archive.")
+
+    def handle(self, *args, **options):
+        term = Term.objects.filter(name=options['name']).first()
+        if term is None:
+            raise CommandError(f"Term '{options['name']}' not found.")
+        if term.archived_at:
+            raise CommandError(f"{term} was already archived on {term.archived_at:%Y-%m-%d}.")
+        try:
+            counts = terms.archive(term)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {term}: {counts['courses']} sections, {counts['enrollments']} enrollments, "
+            f"{counts['requests']} requests."
+        ))
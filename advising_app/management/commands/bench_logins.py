@@ -0,0 +1,50 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+
+def _run_for(seconds, func):
+    done = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        func()
+        done += 1
+    return done
+
+
+class Command(BaseCommand):
+    help = "Measures password verifications (logins) per second for each hasher profile."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=2.0, help="Duration of each measurement.")
+        parser.add_argument('--threads', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--profiles', nargs='*', default=list(settings.PASSWORD_PROFILES))
+
+    def handle(self, *args, **options):
+        seconds = options['seconds']
+        threads = options['threads']
+        self.stdout.write(f"{'profile':<8} {'1 thread/s':>12} {f'{threads} threads/s':>14} {'per core/s':>12}")
+
+        for name in options['profiles']:
+            hasher = import_string(settings.PASSWORD_PROFILES[name])()
+            try:
+                encoded = hasher.encode('benchmark-password', hasher.salt())
+            except ValueError as exc:
+                # Optional dependency (e.g. argon2-cffi) not installed
+                self.stdout.write(f"{name:<8} skipped: {exc}")
+                continue
+
+            def verify():
+                hasher.verify('benchmark-password', encoded)
+
+            single = _run_for(seconds, verify) / seconds
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                futures = [pool.submit(_run_for, seconds, verify) for _ in range(threads)]
+                parallel = sum(f.result() for f in futures) / seconds
+
+            per_core = parallel / min(threads, os.cpu_count() or 1)
+            self.stdout.write(f"{name:<8} {single:>12.1f} {parallel:>14.1f} {per_core:>12.1f}")
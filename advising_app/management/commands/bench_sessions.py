@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from advising_app import admission, benchmarks
+from advising_app.models import Course
+
+
+class Command(BaseCommand):
+    help = "Counts database and session-table queries per request of the advising flow for each session backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engines', nargs='*', default=list(settings.SESSION_PROFILES))
+        parser.add_argument('--rounds', type=int, default=5, help="Advising page loads per engine.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'engine':<16} {'requests':>9} {'queries':>8} {'session':>8} {'per request':>12}")
+
+        # The flow posts faster than a student could; keep the rate limiter out of the numbers
+        enabled = admission._config['ENABLED']
+        admission._config['ENABLED'] = False
+        try:
+            for name in options['engines']:
+                # ALLOWED_HOSTS is restated since the override hides what the test environment sets
+                with override_settings(SESSION_ENGINE=settings.SESSION_PROFILES[name], ALLOWED_HOSTS=['testserver']):
+                    requests, queries, session_queries = self.run_flow(options['rounds'])
+                self.stdout.write(
+                    f"{name:<16} {requests:>9} {queries:>8} {session_queries:>8} {queries / requests:>12.1f}"
+                )
+        finally:
+            admission._config['ENABLED'] = enabled
+
+    def run_flow(self, rounds):
+        requests = queries = session_queries = 0
+        with benchmarks.throwaway_data():
+            student, password = benchmarks.make_student()
+            course = Course.objects.bulk_create(benchmarks.make_sections(1))[0]
+            client = benchmarks.client()
+            client.login(username=student.user.username, password=password)
+
+            steps = [('get', '/student/dashboard/', {})]
+            steps += [('get', '/student/advising/', {})] * rounds
+            steps += [
+                ('post', '/student/advising/', {'course_id': course.id, 'action': 'add'}),
+                ('get', '/student/advising/', {}),
+                ('post', '/student/advising/', {'course_id': course.id, 'action': 'drop'}),
+                ('get', '/student/advising/', {}),
+            ]
+            for method, url, data in steps:
+                with CaptureQueriesContext(connection) as captured:
+                    getattr(client, method)(url, data)
+                requests += 1
+                queries += len(captured)
+                session_queries += sum('django_session' in q['sql'] for q in captured)
+        return requests, queries, session_queries
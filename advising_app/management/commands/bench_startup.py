@@ -0,0 +1,127 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+TARGETS = {
+    'manage': None,  # manage.py running --command
+    'wsgi': ['-c', 'import advising_system.wsgi'],
+    'asgi': ['-c', 'import advising_system.asgi'],
+}
+# Only needed by a few commands; loading any of them at startup is a regression
+HEAVY = ['pdfplumber', 'pdfminer', 'pypdfium2', 'PIL', 'openai', 'google.genai', 'httpx', 'pydantic']
+
+
+def _parse(stderr):
+    """`-X importtime` output as [(module, self µs, cumulative µs)]."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        if not own.strip().isdigit():
+            continue  # the header line
+        modules.append((name.strip(), int(own), int(cumulative)))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures cold-start time and imports (python -X importtime) of manage.py and the WSGI/ASGI apps. "
+        "Compare against a saved baseline to catch slow startups and heavy imports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--targets', nargs='*', choices=list(TARGETS), default=list(TARGETS))
+        parser.add_argument('--command', default='check', help="Management command the manage target runs.")
+        parser.add_argument('--runs', type=int, default=5, help="Runs per target; the median is reported.")
+        parser.add_argument('--top', type=int, default=10, help="Packages listed by import time.")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON.")
+        parser.add_argument('--output', help="Also write the JSON results to this file.")
+        parser.add_argument('--baseline', help="JSON results of an earlier run to compare with.")
+        parser.add_argument('--tolerance', type=float, default=20.0, help="Allowed slowdown in percent.")
+
+    def handle(self, *args, **options):
+        results = {
+            'python': sys.version.split()[0],
+            'targets': {target: self.measure(target, options) for target in options['targets']},
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.report(results, options['top'])
+        if options['baseline']:
+            self.compare(results, options['baseline'], options['tolerance'])
+
+    def run(self, argv):
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', *argv],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'advising_system.settings')),
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        if process.returncode:
+            raise CommandError(f"{' '.join(argv)} failed:\n{process.stderr[-2000:]}")
+        return elapsed, _parse(process.stderr)
+
+    def measure(self, target, options):
+        argv = TARGETS[target] or ['manage.py', *options['command'].split()]
+        # The first run compiles bytecode and warms the OS cache
+        self.run(argv)
+        runs = sorted((self.run(argv) for _ in range(options['runs'])), key=lambda run: run[0])
+        wall, modules = runs[len(runs) // 2]
+
+        packages = {}
+        for name, own, cumulative in modules:
+            package = name.split('.', 1)[0]
+            packages[package] = packages.get(package, 0) + own
+        names = {name for name, _, _ in modules}
+        return {
+            'wall_ms': round(statistics.median(run[0] for run in runs), 1),
+            'import_ms': round(sum(own for _, own, _ in modules) / 1000, 1),
+            'modules': len(modules),
+            'top': [
+                [package, round(us / 1000, 1)]
+                for package, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:options['top']]
+            ],
+            'heavy': [name for name in HEAVY if name in names],
+        }
+
+    def report(self, results, top):
+        self.stdout.write(f"{'target':<8} {'wall ms':>9} {'import ms':>10} {'modules':>8}")
+        for target, result in results['targets'].items():
+            self.stdout.write(f"{target:<8} {result['wall_ms']:>9.1f} {result['import_ms']:>10.1f} {result['modules']:>8}")
+        for target, result in results['targets'].items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{target}: import time by package"))
+            for package, ms in result['top'][:top]:
+                self.stdout.write(f"  {ms:>8.1f} ms  {package}")
+            if result['heavy']:
+                self.stdout.write(self.style.WARNING(f"  Heavy modules loaded at startup: {', '.join(result['heavy'])}"))
+
+    def compare(self, results, path, tolerance):
+        with open(path) as f:
+            baseline = json.load(f)['targets']
+        problems = []
+        for target, result in results['targets'].items():
+            before = baseline.get(target)
+            if before is None:
+                continue
+            for metric in ('wall_ms', 'import_ms'):
+                limit = before[metric] * (1 + tolerance / 100)
+                if result[metric] > limit:
+                    problems.append(f"{target} {metric}: {result[metric]} (baseline {before[metric]})")
+            added = sorted(set(result['heavy']) - set(before.get('heavy', [])))
+            if added:
+                problems.append(f"{target} now imports {', '.join(added)} at startup")
+        if problems:
+            raise CommandError("Startup regressed:\n  " + "\n  ".join(problems))
+        self.stdout.write(self.style.SUCCESS(f"Within {tolerance:g}% of the baseline."))
@@ -0,0 +1,86 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from advising_app import benchmarks, catalog
+
+APP_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def _uncached_engine():
+    options = dict(settings.TEMPLATES[0]['OPTIONS'], loaders=APP_LOADERS)
+    return DjangoTemplates({'NAME': 'uncached', 'DIRS': [], 'APP_DIRS': False, 'OPTIONS': options})
+
+
+class Command(BaseCommand):
+    help = "Measures render time of the catalog pages with and without template and fragment caching."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sections', type=int, default=2000)
+        parser.add_argument('--renders', type=int, default=20)
+
+    def handle(self, *args, **options):
+        courses = benchmarks.make_sections(options['sections'])
+        for i, course in enumerate(courses, start=1):
+            course.id = i
+            course.enrolled_count = i % course.capacity
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        renders = options['renders']
+
+        engines_by_name = {'uncached': _uncached_engine(), 'cached': engines['django']}
+        runs = [
+            ('uncached', 'rebuilt'),
+            ('cached', 'rebuilt'),
+            ('cached', 'cached'),
+        ]
+        self.stdout.write(f"{len(courses)} sections, {renders} renders each")
+        self.stdout.write(f"{'page':<14} {'loader':<10} {'fragments':<10} {'ms/render':>10}")
+
+        # A private cache keeps the fake sections' fragments out of the shared
+        # one. The catalog version is a database row every process reads, so
+        # the bumps below are rolled back with the throwaway transaction.
+        bench_cache = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench'}}
+        with override_settings(CACHES=bench_cache), benchmarks.throwaway_data():
+            for page in ('advising', 'manage_courses'):
+                for loader, fragments in runs:
+                    engine = engines_by_name[loader]
+                    catalog.bump()
+                    elapsed = 0.0
+                    for _ in range(renders):
+                        if fragments == 'rebuilt':
+                            catalog.bump()
+                        start = time.perf_counter()
+                        self.render(engine, page, courses, request)
+                        elapsed += time.perf_counter() - start
+                    self.stdout.write(f"{page:<14} {loader:<10} {fragments:<10} {elapsed / renders * 1000:>10.1f}")
+
+    def render(self, engine, page, courses, request):
+        if page == 'advising':
+            # Same context the advising view builds, every section available
+            cells = catalog.course_cells(courses)
+            context = {
+                'courses': [
+                    {
+                        'id': c.id, 'capacity': c.capacity, 'status': 'Available',
+                        'enrolled_count': c.enrolled_count, 'cells': cells[c.id],
+                    }
+                    for c in courses
+                ],
+                'total_credits': 0,
+                'total_cost': 0,
+            }
+            name = 'advising_app/student/advising.html'
+        else:
+            context = {'courses': courses, 'catalog_version': catalog.version()}
+            name = 'advising_app/admin/manage_courses.html'
+        return engine.get_template(name).render(context, request)
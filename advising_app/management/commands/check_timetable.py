@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advising_app import benchmarks, scheduling
+from advising_app.models import Term
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports sections that share a room or instructor at overlapping times. "
+        "With --bench N, times validation of N generated sections instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--term', help="Term name (default: the current term).")
+        parser.add_argument('--bench', type=int, default=0, metavar='N', help="Validate N generated sections.")
+
+    def handle(self, *args, **options):
+        if options['bench']:
+            return self.bench(options['bench'])
+
+        term_id = None
+        if options['term']:
+            term = Term.objects.filter(name=options['term']).first()
+            if term is None:
+                raise CommandError(f"Term '{options['term']}' not found.")
+            term_id = term.id
+
+        started = time.perf_counter()
+        timetable = scheduling.Timetable.for_term(term_id)
+        conflicts = timetable.check_all()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"Checked {len(timetable.sections)} sections in {elapsed * 1000:.0f} ms.")
+        if not conflicts:
+            self.stdout.write(self.style.SUCCESS("No double-bookings found."))
+            return
+        for conflict in conflicts:
+            self.stdout.write(f"  {scheduling.describe(conflict)}")
+        self.stdout.write(self.style.WARNING(f"{len(conflicts)} double-bookings found."))
+
+    def bench(self, count):
+        sections = []
+        for i, course in enumerate(benchmarks.make_sections(count), start=1):
+            course.id = i
+            course.assigned_faculty_id = 1 + i % (count // 4 or 1)
+            sections.append(scheduling.section_of(course))
+
+        started = time.perf_counter()
+        timetable = scheduling.Timetable(sections)
+        built = time.perf_counter()
+        conflicts = timetable.check_all()
+        checked = time.perf_counter()
+        # Incremental path: each section checked against the others, then re-added
+        for section in sections:
+            timetable.remove(section.id)
+            timetable.conflicts(section)
+            timetable.add(section)
+        incremental = time.perf_counter()
+
+        self.stdout.write(f"{count} sections, {len(conflicts)} conflicting pairs")
+        self.stdout.write(f"  build index        {(built - started) * 1000:8.1f} ms")
+        self.stdout.write(f"  full check         {(checked - built) * 1000:8.1f} ms")
+        self.stdout.write(f"  one-by-one check   {(incremental - checked) * 1000:8.1f} ms")
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from advising_app import events
+
+
+class Command(BaseCommand):
+    help = "Feeds new enrollment events to every consumer (stats, balances)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new events.")
+        parser.add_argument('--interval', type=float, default=2.0, help="Seconds between polls with --loop.")
+        parser.add_argument('--batch-size', type=int, default=events.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        while True:
+            handled = events.consume_all(options['batch_size'])
+            if any(handled.values()) or not options['loop']:
+                summary = ", ".join(f"{name}: {n}" for name, n in handled.items())
+                self.stdout.write(f"Consumed {summary}. Lag: {events.lag()}")
+            if not options['loop']:
+                return
+            close_old_connections()
+            time.sleep(options['interval'])
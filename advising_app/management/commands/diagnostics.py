@@ -0,0 +1,117 @@
+from itertools import groupby
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from advising_app import anomalies
+from advising_app.models import Course, Enrollment, Student
+
+
+class Command(BaseCommand):
+    help = "Inspects students, enrollments and rule violations with set-based queries."
+
+    def add_arguments(self, parser):
+        sub = parser.add_subparsers(dest='subcommand', required=True)
+
+        student = sub.add_parser('student', help="Show one student and their enrollments.")
+        student.add_argument('who', help="Username or student ID.")
+        student.add_argument('--code', help="Only enrollments for this course code.")
+
+        enrollments = sub.add_parser('enrollments', help="Enrollments for a course code.")
+        enrollments.add_argument('code')
+        enrollments.add_argument('--contains', action='store_true',
+                                 help="Match codes containing the value instead of equal to it.")
+
+        sub.add_parser('students', help="Every student with their enrolled course codes.")
+        sub.add_parser('users', help="Every user with staff flag and student profile.")
+        sub.add_parser('anomalies', help="Over-credit loads, duplicate codes, clashes and oversold sections.")
+
+    def handle(self, *args, **options):
+        getattr(self, f"handle_{options['subcommand']}")(**options)
+
+    def handle_student(self, who, code=None, **options):
+        student = Student.objects.select_related('user').filter(Q(user__username=who) | Q(student_id=who)).first()
+        if student is None:
+            raise CommandError(f"Student '{who}' not found.")
+
+        self.stdout.write(f"Student: {student.user.username} ({student.student_id}) - {student.department}")
+        enrollments = Enrollment.objects.filter(student=student).select_related('course').order_by('course__code')
+        if code:
+            enrollments = enrollments.filter(course__code=code)
+        count = 0
+        for e in enrollments:
+            count += 1
+            self.stdout.write(
+                f"  {e.course.code} Sec {e.course.section} (ID: {e.course.id}) "
+                f"{e.course.day} {e.course.start_time}-{e.course.end_time} - {e.course.title}"
+            )
+        if not count:
+            self.stdout.write("  No enrollments found.")
+
+    def handle_enrollments(self, code, contains=False, **options):
+        lookup = {'code__icontains': code} if contains else {'code': code}
+        courses = Course.objects.filter(**lookup).order_by('code', 'section')
+        for c in courses:
+            self.stdout.write(f"Course ID: {c.id}, Code: {c.code}, Section: {c.section}, Title: {c.title}")
+
+        rows = Enrollment.objects.filter(**{f'course__{k}': v for k, v in lookup.items()}).order_by(
+            'course__code', 'course__section', 'student__student_id'
+        ).values_list('course__code', 'course__section', 'student__student_id', 'student__user__username')
+        for (course_code, section), group in groupby(rows.iterator(), key=lambda r: r[:2]):
+            students = [f"{sid} ({username})" for _, _, sid, username in group]
+            self.stdout.write(f"{course_code} Sec {section}: {len(students)} enrolled")
+            for s in students:
+                self.stdout.write(f"  - {s}")
+
+    def handle_students(self, **options):
+        # One LEFT JOIN over all students, grouped in Python
+        rows = Student.objects.order_by('student_id', 'enrollments__course__code').values_list(
+            'student_id', 'user__username', 'enrollments__course__code'
+        )
+        for (student_id, username), group in groupby(rows.iterator(chunk_size=5000), key=lambda r: r[:2]):
+            codes = [code for _, _, code in group if code]
+            self.stdout.write(f"Student: {username} ({student_id}) - Enrollments: {len(codes)}")
+            if codes:
+                self.stdout.write(f"  Codes: {codes}")
+
+    def handle_users(self, **options):
+        rows = User.objects.order_by('username', 'student__enrollments__course__code').values_list(
+            'username', 'is_staff', 'student__student_id', 'student__enrollments__course__code'
+        )
+        for (username, is_staff, student_id), group in groupby(rows.iterator(chunk_size=5000), key=lambda r: r[:3]):
+            codes = [code for *_, code in group if code]
+            line = f"User: {username}, Is Staff: {is_staff}"
+            if student_id:
+                line += f", Student ID: {student_id}, Enrollments: {codes}"
+            self.stdout.write(line)
+
+    def handle_anomalies(self, **options):
+        problems = 0
+
+        rows = anomalies.over_credit()
+        problems += len(rows)
+        self.stdout.write(f"Over-credit students: {len(rows)}")
+        for row in rows:
+            self.stdout.write(f"  {row['student_id']}: {row['total']} credits")
+
+        rows = anomalies.duplicate_codes()
+        problems += len(rows)
+        self.stdout.write(f"Duplicate course codes: {len(rows)}")
+        for row in rows:
+            self.stdout.write(f"  {row['student__student_id']}: {row['course__code']} x{row['sections']}")
+
+        rows = anomalies.clashes()
+        problems += len(rows)
+        self.stdout.write(f"Time clashes: {len(rows)}")
+        for row in rows:
+            self.stdout.write(f"  {row['student_id']}: {row['code']} / {row['other_code']} on {row['day']}")
+
+        rows = anomalies.oversold_sections()
+        problems += len(rows)
+        self.stdout.write(f"Oversold sections: {len(rows)}")
+        for row in rows:
+            self.stdout.write(f"  {row['code']} Sec {row['section']}: {row['enrolled']}/{row['capacity']}")
+
+        style = self.style.SUCCESS if not problems else self.style.WARNING
+        self.stdout.write(style(f"{problems} problems found."))
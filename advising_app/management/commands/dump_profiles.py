@@ -0,0 +1,53 @@
+import glob
+import os
+import pstats
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advising_app import profiling
+
+
+class Command(BaseCommand):
+    help = (
+        "Merges the request profiles written to PROFILING['DIR'] and prints the hottest "
+        "functions per URL name."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', help="Profile directory (default: PROFILING['DIR']).")
+        parser.add_argument('--url', help="Only this URL name, e.g. advising_view.")
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument('--output', help="Also write the merged profile to this file (for snakeviz etc.).")
+        parser.add_argument('--clear', action='store_true', help="Delete the profile files afterwards.")
+
+    def handle(self, *args, **options):
+        directory = options['dir'] or profiling.get_config()['DIR']
+        if not directory:
+            raise CommandError("No profile directory. Set ADVISING_PROFILING_DIR or pass --dir.")
+
+        by_url = {}
+        for path in sorted(glob.glob(os.path.join(directory, '*.prof'))):
+            url_name = os.path.basename(path).split('.', 1)[0]
+            if options['url'] and url_name != options['url']:
+                continue
+            by_url.setdefault(url_name, []).append(path)
+        if not by_url:
+            self.stdout.write("No profiles found.")
+            return
+
+        merged = None
+        for url_name, paths in sorted(by_url.items()):
+            stats = pstats.Stats(*paths)
+            merged = stats if merged is None else merged.add(stats)
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{url_name}: {len(paths)} profiles"))
+            self.stdout.write(f"  {'calls':>8} {'own ms':>10} {'cum ms':>10}  function")
+            for label, calls, own, cumulative in profiling.summarize(stats, options['top']):
+                self.stdout.write(f"  {calls:>8} {own:>10.2f} {cumulative:>10.2f}  {label}")
+
+        if options['output']:
+            merged.dump_stats(options['output'])
+            self.stdout.write(self.style.SUCCESS(f"Merged profile written to {options['output']}."))
+        if options['clear']:
+            for paths in by_url.values():
+                for path in paths:
+                    os.remove(path)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from advising_app import exports
+from advising_app.models import Course
+
+
+class Command(BaseCommand):
+    help = "Exports class rosters, department enrollments or advisor assignments as CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=['roster', 'department', 'advisors'])
+        parser.add_argument('--course', type=int, help="Course ID (roster).")
+        parser.add_argument('--department', help="Department (department, advisors).")
+        parser.add_argument('-o', '--output', help="Output file (defaults to stdout).")
+
+    def handle(self, *args, **options):
+        kind = options['kind']
+        if kind == 'roster':
+            if not options['course']:
+                raise CommandError("--course is required for roster exports.")
+            try:
+                course = Course.objects.get(id=options['course'])
+            except Course.DoesNotExist:
+                raise CommandError(f"Course {options['course']} not found.")
+            header, rows = exports.ROSTER_HEADER, exports.roster_rows(course)
+        elif kind == 'department':
+            if not options['department']:
+                raise CommandError("--department is required for department exports.")
+            header, rows = exports.DEPARTMENT_HEADER, exports.department_rows(options['department'])
+        else:
+            header, rows = exports.ADVISOR_HEADER, exports.advisor_rows(options['department'])
+
+        lines = exports.csv_lines(header, rows)
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        # utf-8-sig adds the BOM Excel needs to detect UTF-8
+        with open(options['output'], 'w', newline='', encoding='utf-8-sig') as out:
+            out.writelines(lines)
+        self.stderr.write(f"Wrote {options['output']}")
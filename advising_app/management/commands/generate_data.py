@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advising_app import synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a seeded synthetic university (faculty, students, sections, enrollments and advising "
+        "requests) in the current term for scale testing. The same arguments always give the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=2000)
+        parser.add_argument('--sections', type=int, help="Default: one per 10 students.")
+        parser.add_argument('--faculty', type=int, help="Default: one per 4 sections.")
+        parser.add_argument('--departments', type=int, choices=range(1, len(synthetic.DEPARTMENTS) + 1),
+                            metavar=f'1-{len(synthetic.DEPARTMENTS)}')
+        parser.add_argument('--load', type=float, default=4.0, help="Average sections per student.")
+        parser.add_argument('--requests', type=float, default=0.3, help="Share of students with an advising request.")
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--password', default='password', help="Password of every generated user.")
+        parser.add_argument('--intake-year', type=int, default=synthetic.INTAKE_YEAR,
+                            help="Intake year of the newest students; ids start with the year.")
+        parser.add_argument('--flush', action='store_true',
+                            help=f"Remove previously generated data (users named {synthetic.PREFIX}*) first.")
+        parser.add_argument('--flush-only', action='store_true', help="Remove previously generated data and stop.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['flush'] or options['flush_only']:
+            removed = synthetic.flush()
+            self.stdout.write(f"Removed {removed} generated users and their data.")
+            if options['flush_only']:
+                return
+        elif synthetic.exists():
+            raise CommandError("Generated data already exists. Pass --flush to replace it.")
+
+        try:
+            counts = synthetic.generate(
+                students=options['students'], sections=options['sections'], faculty=options['faculty'],
+                departments=options['departments'], load=options['load'], requests=options['requests'],
+                seed=options['seed'], password=options['password'], intake_year=options['intake_year'],
+                log=self.stdout.write,
+            )
+        except ValueError as exc:
+            raise CommandError(exc)
+        summary = ', '.join(f"{n} {name}" for name, n in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Generated {summary} in {time.perf_counter() - started:.1f}s."))
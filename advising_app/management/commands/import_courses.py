@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from advising_app import pdf_courses
+
+
+class Command(BaseCommand):
+    help = "Imports current-term sections (day, time, room) from the registrar's PDF schedule."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='faculty_list.pdf')
+
+    def handle(self, *args, **options):
+        try:
+            counts = pdf_courses.import_courses(options['path'], log=self.stdout.write)
+        except (ImportError, OSError) as exc:
+            raise CommandError(exc)
+        if counts['conflicts']:
+            self.stdout.write(self.style.WARNING(
+                f"{counts['conflicts']} scheduling conflicts; those rows were not imported."
+            ))
+        self.stdout.write(self.style.SUCCESS(f"{counts['created']} sections created, {counts['updated']} updated."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from advising_app import pdf_courses
+
+
+class Command(BaseCommand):
+    help = "Prints the start of a PDF page's text and tables, to check what import_courses will see."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='faculty_list.pdf')
+        parser.add_argument('--page', type=int, default=1)
+        parser.add_argument('--chars', type=int, default=500, help="Characters of text to show.")
+        parser.add_argument('--rows', type=int, default=5, help="Rows to show per table.")
+
+    def handle(self, *args, **options):
+        try:
+            pdf = pdf_courses.open_pdf(options['path'])
+        except (ImportError, OSError) as exc:
+            raise CommandError(exc)
+        with pdf:
+            if not 1 <= options['page'] <= len(pdf.pages):
+                raise CommandError(f"The PDF has {len(pdf.pages)} pages.")
+            page = pdf.pages[options['page'] - 1]
+            text = page.extract_text() or ''
+            self.stdout.write("--- TEXT ---")
+            self.stdout.write(text[:options['chars']])
+            self.stdout.write("--- TABLES ---")
+            for table in page.extract_tables():
+                for row in table[:options['rows']]:
+                    self.stdout.write(str(row))
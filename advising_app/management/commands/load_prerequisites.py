@@ -0,0 +1,46 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from advising_app import prerequisites, versions
+from advising_app.models import Prerequisite
+
+
+class Command(BaseCommand):
+    help = "Loads prerequisites from a CSV file with 'course' and 'requires' columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument('file')
+        parser.add_argument('--replace', action='store_true', help="Delete existing prerequisites first.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['file'], newline='', encoding='utf-8-sig') as f:
+                pairs = {
+                    (row['course'].strip(), row['requires'].strip())
+                    for row in csv.DictReader(f)
+                    if row.get('course') and row.get('requires')
+                }
+        except (OSError, KeyError) as exc:
+            raise CommandError(f"Could not read {options['file']}: {exc}")
+
+        # One prerequisite bump, not one per row that --replace deletes
+        with versions.deferred(), transaction.atomic():
+            if options['replace']:
+                Prerequisite.objects.all().delete()
+            # With ignore_conflicts, bulk_create returns the skipped rows too
+            before = Prerequisite.objects.count()
+            Prerequisite.objects.bulk_create(
+                [Prerequisite(course_code=course, requires_code=requires) for course, requires in sorted(pairs)],
+                ignore_conflicts=True,
+            )
+            added = Prerequisite.objects.count() - before
+            # bulk_create sends no signals
+            prerequisites.bump()
+
+        graph = prerequisites.graph()
+        cyclic = [code for code in graph.codes if graph.closure[code] & graph.bit[code]]
+        self.stdout.write(self.style.SUCCESS(f"Loaded {added} new prerequisites over {len(graph.codes)} codes."))
+        if cyclic:
+            self.stdout.write(self.style.WARNING(f"Codes that require themselves through a cycle: {', '.join(cyclic)}"))
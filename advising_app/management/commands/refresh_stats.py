@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from advising_app import stats
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the materialized dashboard statistics from scratch."
+
+    def handle(self, *args, **options):
+        departments = stats.refresh_all()
+        self.stdout.write(self.style.SUCCESS(f"Statistics rebuilt for {departments} departments."))
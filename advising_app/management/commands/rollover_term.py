@@ -0,0 +1,32 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advising_app import terms
+from advising_app.models import Term
+
+
+class Command(BaseCommand):
+    help = "Opens a new current term, optionally copying the current sections and archiving the old term."
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', help="Name of the new term, e.g. 'Spring 2027'.")
+        parser.add_argument('--starts-on', type=datetime.date.fromisoformat, help="First day (YYYY-MM-DD).")
+        parser.add_argument('--copy-sections', action='store_true', help="Copy the current term's sections.")
+        parser.add_argument('--archive-previous', action='store_true', help="Archive the previous term afterwards.")
+
+    def handle(self, *args, **options):
+        if Term.objects.filter(name=options['name']).exists():
+            raise CommandError(f"Term '{options['name']}' already exists.")
+
+        previous, term, copied = terms.rollover(options['name'], options['starts_on'], options['copy_sections'])
+        self.stdout.write(self.style.SUCCESS(f"{term} is now the current term (was {previous})."))
+        if options['copy_sections']:
+            self.stdout.write(f"Copied {copied} sections.")
+
+        if options['archive_previous']:
+            counts = terms.archive(previous)
+            self.stdout.write(self.style.SUCCESS(
+                f"Archived {previous}: {counts['courses']} sections, {counts['enrollments']} enrollments, "
+                f"{counts['requests']} requests."
+            ))
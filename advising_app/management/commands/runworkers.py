@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _worker_main(poll_interval, once):
+    # Spawned children (Windows/macOS) start with a fresh interpreter
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+    from advising_app import tasks
+    tasks.work(poll_interval=poll_interval, once=once)
+
+
+class Command(BaseCommand):
+    help = "Runs a pool of background job workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Number of worker processes (defaults to the CPU count).")
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--once', action='store_true',
+                            help="Exit when the queue is empty instead of polling forever.")
+
+    def handle(self, *args, **options):
+        # Imported here so spawned children can unpickle _worker_main before django.setup()
+        from advising_app import tasks
+
+        workers = max(1, options['workers'])
+        requeued = tasks.requeue_stale()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale jobs.")
+
+        if workers == 1:
+            processed = tasks.work(poll_interval=options['poll_interval'], once=options['once'])
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs."))
+            return
+
+        # Children must not inherit the parent's open database connection
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(
+                target=_worker_main,
+                args=(options['poll_interval'], options['once']),
+                daemon=True,
+            )
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {workers} workers.")
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from advising_app import anomalies
+
+
+class Command(BaseCommand):
+    help = (
+        "Finds oversold sections, clashes, duplicate codes and over-credit loads. "
+        "Scans incrementally from the previous run unless --full is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Scan all enrollments.")
+        parser.add_argument('--apply', action='store_true', help="Drop the enrollments in the repair plan.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        scan_run, violations = anomalies.run_scan(full=options['full'])
+        elapsed = time.perf_counter() - started
+
+        scope = "full" if scan_run.full else f"since {scan_run.since:%Y-%m-%d %H:%M:%S}"
+        self.stdout.write(f"Scan #{scan_run.id} ({scope}) finished in {elapsed * 1000:.0f} ms.")
+        for kind, rows in violations.items():
+            self.stdout.write(f"  {kind}: {len(rows)}")
+
+        if not scan_run.repair_plan:
+            self.stdout.write(self.style.SUCCESS("No violations found."))
+            return
+
+        self.stdout.write("Repair plan (drop):")
+        for item in scan_run.repair_plan:
+            reasons = ', '.join(item['reasons'])
+            self.stdout.write(f"  enrollment {item['enrollment_id']}: {item['student_id']} {item['code']} ({reasons})")
+
+        if options['apply']:
+            deleted = anomalies.apply_repair_plan(scan_run)
+            self.stdout.write(self.style.SUCCESS(f"Dropped {deleted} enrollments."))
+        else:
+            self.stdout.write(self.style.WARNING("Run with --apply to carry out the plan."))
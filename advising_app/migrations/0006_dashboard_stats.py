@@ -0,0 +1,41 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advising_app', '0005_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CreditLoadStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('credits', models.FloatField(unique=True)),
+                ('students', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['credits'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DepartmentStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department', models.CharField(max_length=100, unique=True)),
+                ('sections', models.IntegerField(default=0)),
+                ('seats', models.IntegerField(default=0)),
+                ('enrolled', models.IntegerField(default=0)),
+                ('students', models.IntegerField(default=0)),
+                ('unassigned_students', models.IntegerField(default=0)),
+                ('pending_requests', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['department'],
+            },
+        ),
+    ]
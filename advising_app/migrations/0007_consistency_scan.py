@@ -0,0 +1,34 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advising_app', '0006_dashboard_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsistencyScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('full', models.BooleanField(default=False)),
+                ('since', models.DateTimeField(blank=True, null=True)),
+                ('high_water_mark', models.DateTimeField(blank=True, null=True)),
+                ('violations', models.IntegerField(default=0)),
+                ('repair_plan', models.JSONField(blank=True, default=list)),
+                ('repaired', models.BooleanField(default=False)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['enrolled_at'], name='enrollment_enrolled_at_idx'),
+        ),
+    ]
@@ -0,0 +1,151 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:59
+
+import advising_app.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def assign_default_term(apps, schema_editor):
+    """Puts every existing section, enrollment and request in one current term."""
+    Term = apps.get_model('advising_app', 'Term')
+    term = Term.objects.create(name='Default', is_current=True)
+    for name in ('Course', 'Enrollment', 'AdvisingRequest'):
+        apps.get_model('advising_app', name).objects.update(term=term)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advising_app', '0007_consistency_scan'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedCourse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', models.IntegerField(help_text='Id the section had while live')),
+                ('code', models.CharField(max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('credit', models.FloatField()),
+                ('department', models.CharField(max_length=100)),
+                ('section', models.CharField(max_length=10)),
+                ('room', models.CharField(blank=True, max_length=20, null=True)),
+                ('capacity', models.IntegerField()),
+                ('day', models.CharField(choices=[('Mon', 'Monday'), ('Tue', 'Tuesday'), ('Wed', 'Wednesday'), ('Thu', 'Thursday'), ('Fri', 'Friday'), ('Sat', 'Saturday'), ('Sun', 'Sunday')], max_length=3)),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('assigned_faculty', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='advising_app.faculty')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Term',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('starts_on', models.DateField(blank=True, null=True)),
+                ('is_current', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('is_current', True)), fields=('is_current',), name='one_current_term')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedEnrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20)),
+                ('credit', models.FloatField()),
+                ('enrolled_at', models.DateTimeField()),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='advising_app.archivedcourse')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_enrollments', to='advising_app.student')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='advising_app.term')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='archivedcourse',
+            name='term',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_courses', to='advising_app.term'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedAdvisingRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Approved', 'Approved'), ('Rejected', 'Rejected')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('preferred_codes', models.JSONField(blank=True, default=list, help_text='Course codes by priority')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='advising_app.student')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='advising_app.term')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='course',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='advisingrequest',
+            name='term',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='advising_app.term'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='term',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='courses', to='advising_app.term'),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='term',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='advising_app.term'),
+        ),
+        migrations.RunPython(assign_default_term, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='advisingrequest',
+            name='term',
+            field=models.ForeignKey(default=advising_app.models.current_term_id, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='advising_app.term'),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='term',
+            field=models.ForeignKey(default=advising_app.models.current_term_id, on_delete=django.db.models.deletion.PROTECT, related_name='courses', to='advising_app.term'),
+        ),
+        migrations.AlterField(
+            model_name='enrollment',
+            name='term',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='advising_app.term'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='course',
+            unique_together={('term', 'code', 'section')},
+        ),
+        migrations.AddIndex(
+            model_name='advisingrequest',
+            index=models.Index(fields=['term', 'status'], name='request_term_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='advisingrequest',
+            index=models.Index(fields=['term', 'student'], name='request_term_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['term', 'department'], name='course_term_department_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['term', 'assigned_faculty'], name='course_term_faculty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['term', 'student'], name='enrollment_term_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedenrollment',
+            index=models.Index(fields=['student', 'code'], name='archived_enr_student_code_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='archivedcourse',
+            unique_together={('term', 'code', 'section')},
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advising_app', '0008_term'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Prerequisite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_code', models.CharField(max_length=20)),
+                ('requires_code', models.CharField(max_length=20)),
+            ],
+            options={
+                'ordering': ['course_code', 'requires_code'],
+                'unique_together': {('course_code', 'requires_code')},
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:13
+
+from django.db import migrations, models
+
+
+def reject_duplicate_pending(apps, schema_editor):
+    """Keeps only the newest pending request per student and term."""
+    AdvisingRequest = apps.get_model('advising_app', 'AdvisingRequest')
+    seen = set()
+    duplicates = []
+    pending = AdvisingRequest.objects.filter(status='Pending').order_by('-created_at', '-id')
+    for request_id, student_id, term_id in pending.values_list('id', 'student_id', 'term_id'):
+        if (student_id, term_id) in seen:
+            duplicates.append(request_id)
+        seen.add((student_id, term_id))
+    AdvisingRequest.objects.filter(id__in=duplicates).update(status='Rejected')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advising_app', '0010_enrollment_events'),
+    ]
+
+    operations = [
+        migrations.RunPython(reject_duplicate_pending, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='advisingrequest',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'Pending')), fields=('student', 'term'), name='one_pending_request'),
+        ),
+    ]
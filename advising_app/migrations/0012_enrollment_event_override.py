@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advising_app', '0011_pending_request_constraint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollmentevent',
+            name='override',
+            field=models.BooleanField(default=False),
+        ),
+    ]
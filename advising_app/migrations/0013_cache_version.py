@@ -0,0 +1,32 @@
+# Generated by Django 5.1.3 on 2026-10-19 16:05
+
+import time
+
+from django.db import migrations, models
+
+
+def create_versions(apps, schema_editor):
+    # Seeded from the clock so entries cached under an older database's
+    # versions are never reused
+    CacheVersion = apps.get_model('advising_app', 'CacheVersion')
+    for name in ('catalog', 'prereq', 'prereq-completed'):
+        CacheVersion.objects.create(name=name, version=int(time.time()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advising_app', '0012_enrollment_event_override'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('version', models.BigIntegerField()),
+            ],
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advising_app', '0014_bulk_plan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollmentevent',
+            name='overridden',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
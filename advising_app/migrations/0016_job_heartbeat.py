@@ -0,0 +1,26 @@
+# Generated by Django 5.1.3 on 2026-10-19 16:22
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_started_at(apps, schema_editor):
+    # Jobs running during the upgrade would otherwise never look stale
+    Job = apps.get_model('advising_app', 'Job')
+    Job.objects.filter(status='Running').update(heartbeat_at=F('started_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advising_app', '0015_enrollment_event_overridden'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_started_at, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,50 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+CURRENT_TERM_KEY = 'term:current'
+# Rollovers run as management commands; with a per-process cache their
+# invalidation never reaches the web workers, so the id is only kept briefly
+CURRENT_TERM_SECONDS = 10
+
+def current_term_id():
+    """Id of the term open for registration (migration 0008 creates the first one)."""
+    term_id = cache.get(CURRENT_TERM_KEY)
+    if term_id is None:
+        term_id = Term.objects.filter(is_current=True).values_list('id', flat=True).first()
+        if term_id is None:
+            raise Term.DoesNotExist("There is no current term. Open one with `manage.py rollover_term`.")
+        cache.set(CURRENT_TERM_KEY, term_id, CURRENT_TERM_SECONDS)
+    return term_id
+
+class Term(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    starts_on = models.DateField(null=True, blank=True)
+    is_current = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    archived_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['is_current'], condition=models.Q(is_current=True), name='one_current_term'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+class CacheVersion(models.Model):
+    """A counter bumped on every change to cached data, shared by all workers (see versions.py)."""
+    name = models.CharField(max_length=50, unique=True)
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.name} {self.version}"
+
+class TermQuerySet(models.QuerySet):
+    def current(self):
+        return self.filter(term_id=current_term_id())
 
 class Faculty(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -42,20 +87,53 @@ class Course(models.Model):
     day = models.CharField(max_length=3, choices=DAYS_CHOICES, default='Mon')
     start_time = models.TimeField(default='09:00')
     end_time = models.TimeField(default='10:30')
+    term = models.ForeignKey(Term, on_delete=models.PROTECT, default=current_term_id, related_name='courses')
+
+    objects = TermQuerySet.as_manager()
 
     class Meta:
-        unique_together = ('code', 'section')
+        unique_together = ('term', 'code', 'section')
+        indexes = [
+            models.Index(fields=['term', 'department'], name='course_term_department_idx'),
+            models.Index(fields=['term', 'assigned_faculty'], name='course_term_faculty_idx'),
+        ]
 
     def __str__(self):
         return f"{self.code} - {self.title} (Sec: {self.section}, {self.day} {self.start_time}-{self.end_time})"
 
+class Prerequisite(models.Model):
+    """`course_code` can only be taken after `requires_code` (any section, any term)."""
+    course_code = models.CharField(max_length=20)
+    requires_code = models.CharField(max_length=20)
+
+    class Meta:
+        unique_together = ('course_code', 'requires_code')
+        ordering = ['course_code', 'requires_code']
+
+    def __str__(self):
+        return f"{self.course_code} requires {self.requires_code}"
+
 class Enrollment(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='enrollments')
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     enrolled_at = models.DateTimeField(auto_now_add=True)
+    # Copied from the course so per-term queries need no join
+    term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name='+')
+
+    objects = TermQuerySet.as_manager()
 
     class Meta:
         unique_together = ('student', 'course')
+        indexes = [
+            # High-water mark for incremental consistency scans
+            models.Index(fields=['enrolled_at'], name='enrollment_enrolled_at_idx'),
+            models.Index(fields=['term', 'student'], name='enrollment_term_student_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.term_id is None:
+            self.term_id = self.course.term_id
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.student.student_id} enrolled in {self.course.code}"
@@ -69,6 +147,21 @@ class AdvisingRequest(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
     created_at = models.DateTimeField(auto_now_add=True)
+    term = models.ForeignKey(Term, on_delete=models.PROTECT, default=current_term_id, related_name='+')
+
+    objects = TermQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['term', 'status'], name='request_term_status_idx'),
+            models.Index(fields=['term', 'student'], name='request_term_student_idx'),
+        ]
+        constraints = [
+            # At most one pending request per student and term, even under concurrent submits
+            models.UniqueConstraint(
+                fields=['student', 'term'], condition=models.Q(status='Pending'), name='one_pending_request',
+            ),
+        ]
 
     def __str__(self):
         return f"Request by {self.student.student_id} - {self.status}"
@@ -83,3 +176,199 @@ class PreferredCourse(models.Model):
 
     def __str__(self):
         return f"{self.course.code} (Priority: {self.priority})"
+
+class EnrollmentEvent(models.Model):
+    """
+    Append-only log of enrollment changes, written in the same transaction
+    as the change and read by the consumers in events.py. References are not
+    database constraints so events outlive deleted students and sections.
+    """
+    ADD = 'add'
+    DROP = 'drop'
+    APPROVE = 'approve'
+    KIND_CHOICES = [
+        (ADD, 'Add'),
+        (DROP, 'Drop'),
+        (APPROVE, 'Approve'),
+    ]
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    student = models.ForeignKey(Student, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    course = models.ForeignKey(Course, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+')
+    term = models.ForeignKey(Term, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    # Copied from the section so consumers need no joins
+    code = models.CharField(max_length=20, blank=True)
+    department = models.CharField(max_length=100, blank=True)
+    credit = models.FloatField(default=0)
+    # The student's credits in the term once this change is applied
+    total_after = models.FloatField(default=0)
+    actor = models.ForeignKey(User, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+')
+    # An advisor added the section past a failed enrollment rule
+    override = models.BooleanField(default=False)
+    # The rule messages the override let through
+    overridden = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"#{self.id} {self.kind} {self.code} for student {self.student_id}"
+
+class EventCursor(models.Model):
+    """How far a consumer has read the enrollment event log."""
+    name = models.CharField(max_length=50, unique=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} at event {self.position}"
+
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('Pending', 'Pending'),
+        ('Running', 'Running'),
+        ('Done', 'Done'),
+        ('Failed', 'Failed'),
+    ]
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    progress = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    result = models.TextField(blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    run_after = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed whenever the job reports progress
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+        ]
+
+    @property
+    def percent(self):
+        if not self.total:
+            return 100 if self.status == 'Done' else 0
+        return int(self.progress * 100 / self.total)
+
+    def __str__(self):
+        return f"{self.name} #{self.id} - {self.status}"
+
+class DepartmentStats(models.Model):
+    """Pre-aggregated numbers for the admin dashboard, kept up to date by stats.py."""
+    department = models.CharField(max_length=100, unique=True)
+    sections = models.IntegerField(default=0)
+    seats = models.IntegerField(default=0)
+    enrolled = models.IntegerField(default=0)
+    students = models.IntegerField(default=0)
+    unassigned_students = models.IntegerField(default=0)
+    pending_requests = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['department']
+
+    @property
+    def fill_rate(self):
+        if not self.seats:
+            return 0
+        return round(self.enrolled * 100 / self.seats, 1)
+
+    def __str__(self):
+        return f"{self.department} stats"
+
+class CreditLoadStats(models.Model):
+    """Number of students currently carrying a given credit load."""
+    credits = models.FloatField(unique=True)
+    students = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['credits']
+
+    def __str__(self):
+        return f"{self.credits} credits: {self.students} students"
+
+class BulkPlan(models.Model):
+    """A previewed bulk section change waiting to be confirmed (see bulk_courses.py)."""
+    token = models.CharField(max_length=32, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    plan = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.plan.get('kind')} plan by {self.user}"
+
+class ConsistencyScan(models.Model):
+    """One run of the enrollment consistency scanner (see anomalies.py)."""
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    full = models.BooleanField(default=False)
+    since = models.DateTimeField(null=True, blank=True)
+    high_water_mark = models.DateTimeField(null=True, blank=True)
+    violations = models.IntegerField(default=0)
+    repair_plan = models.JSONField(default=list, blank=True)
+    repaired = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Scan #{self.id} - {self.violations} violations"
+
+# --- Archive ---
+# Closed terms are moved here by `archive_term`, keeping the live tables small.
+
+class ArchivedCourse(models.Model):
+    term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name='archived_courses')
+    course_id = models.IntegerField(help_text="Id the section had while live")
+    code = models.CharField(max_length=20)
+    title = models.CharField(max_length=200)
+    credit = models.FloatField()
+    department = models.CharField(max_length=100)
+    section = models.CharField(max_length=10)
+    room = models.CharField(max_length=20, null=True, blank=True)
+    capacity = models.IntegerField()
+    assigned_faculty = models.ForeignKey(Faculty, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    day = models.CharField(max_length=3, choices=Course.DAYS_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        unique_together = ('term', 'code', 'section')
+
+    def __str__(self):
+        return f"{self.term} {self.code} (Sec: {self.section})"
+
+class ArchivedEnrollment(models.Model):
+    term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name='+')
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='archived_enrollments')
+    course = models.ForeignKey(ArchivedCourse, on_delete=models.CASCADE, related_name='enrollments')
+    code = models.CharField(max_length=20)
+    credit = models.FloatField()
+    enrolled_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['student', 'code'], name='archived_enr_student_code_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student.student_id} took {self.code} in {self.term}"
+
+class ArchivedAdvisingRequest(models.Model):
+    term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name='+')
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='+')
+    status = models.CharField(max_length=20, choices=AdvisingRequest.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    preferred_codes = models.JSONField(default=list, blank=True, help_text="Course codes by priority")
+
+    def __str__(self):
+        return f"Request by {self.student.student_id} in {self.term} - {self.status}"
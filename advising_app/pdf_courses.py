@@ -0,0 +1,120 @@
+"""
+Section import from the registrar's PDF schedule.
+
+pdfplumber (and pdfminer underneath it) is slow to import and only needed
+here, so it is imported when a PDF is opened rather than at module level;
+web workers and other management commands never load it.
+"""
+import re
+from datetime import datetime
+
+from . import scheduling
+from .models import Course
+
+# Code, Section, Faculty, Capacity, Day, Time, Room, e.g.
+# CSE101 2 AT 0/30 S 08:30 AM - 10:00 AM 217
+LINE_RE = re.compile(
+    r"^([A-Z]{3}\d{3})\s+(\d+)\s+([A-Z]+)\s+\d+/\d*\s+([A-Z]+)\s+(\d{2}:\d{2} [AP]M - \d{2}:\d{2} [AP]M)\s+(.+)$"
+)
+
+DAY_CODES = {
+    'S': 'Sun',
+    'M': 'Mon',
+    'T': 'Tue',
+    'W': 'Wed',
+    'R': 'Thu',
+    'F': 'Fri',
+    'A': 'Sat',
+    # Sections have a single day, so combined codes use their first day
+    'ST': 'Sun',
+    'MW': 'Mon',
+}
+
+
+def open_pdf(path):
+    try:
+        import pdfplumber
+    except ImportError as exc:
+        raise ImportError("Reading PDFs needs pdfplumber (pip install pdfplumber).") from exc
+    return pdfplumber.open(path)
+
+
+def parse_time(time_str):
+    # Format: 08:30 AM - 10:00 AM
+    try:
+        start_str, end_str = time_str.split(' - ')
+        start_time = datetime.strptime(start_str, '%I:%M %p').time()
+        end_time = datetime.strptime(end_str, '%I:%M %p').time()
+        return start_time, end_time
+    except ValueError:
+        return None, None
+
+
+def map_day(day_code):
+    return DAY_CODES.get(day_code, 'Mon')
+
+
+def import_courses(pdf_path, log=print):
+    """
+    Creates or updates current-term sections from the schedule lines in the
+    PDF. Rows that would double-book a room or instructor are reported and
+    left out. Returns {'created', 'updated', 'conflicts'}.
+    """
+    counts = {'created': 0, 'updated': 0, 'conflicts': 0}
+    with open_pdf(pdf_path) as pdf:
+        # Built once, then kept up to date as rows are written
+        timetable = scheduling.Timetable.for_term()
+        for page in pdf.pages:
+            text = page.extract_text()
+            if not text:
+                continue
+
+            for line in text.split('\n'):
+                match = LINE_RE.match(line.strip())
+                if not match:
+                    continue
+                code, section, faculty_initials, day_code, time_range, room = match.groups()
+
+                start_time, end_time = parse_time(time_range)
+                if not start_time:
+                    continue
+                day = map_day(day_code)
+
+                # Updated sections keep their instructor, so check that one too
+                stored = timetable.sections.get(timetable.find(code, section))
+                clashes = timetable.conflicts(scheduling.Section(
+                    stored.id if stored else None, code, section, day, start_time, end_time, room,
+                    stored.assigned_faculty_id if stored else None,
+                ))
+                if clashes:
+                    counts['conflicts'] += len(clashes)
+                    for clash in clashes:
+                        log(f"Conflict: {scheduling.describe(clash)}")
+                    continue
+
+                # The PDF has no title or credit; copy them from another
+                # section of the same course, or use placeholders
+                existing_course = Course.objects.filter(code=code).first()
+                title = existing_course.title if existing_course else f"Course {code}"
+                credit = existing_course.credit if existing_course else 3.0
+                department = existing_course.department if existing_course else "CSE"
+
+                # Imports always target the current term. Faculty initials
+                # cannot be linked to a faculty profile.
+                course, created = Course.objects.current().update_or_create(
+                    code=code,
+                    section=section,
+                    defaults={
+                        'title': title,
+                        'credit': credit,
+                        'department': department,
+                        'day': day,
+                        'start_time': start_time,
+                        'end_time': end_time,
+                        'room': room,
+                    }
+                )
+                timetable.update(scheduling.section_of(course))
+                counts['created' if created else 'updated'] += 1
+                log(f"{'Created' if created else 'Updated'}: {code} Sec {section} {day} {time_range} Room {room}")
+    return counts
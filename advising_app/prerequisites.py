@@ -0,0 +1,131 @@
+"""
+Prerequisite graph over course codes.
+
+Each code gets a bit position; a code's direct prerequisites and its full
+(transitive) prerequisite closure are stored as integer bitmasks. The graph
+is rebuilt once per prerequisite version and kept in process memory, and a
+student's completed codes are cached per student, so checking every section
+of the catalog is a few integer operations per distinct code and no queries.
+
+A completed course also counts as completing everything it requires, so a
+waived or transferred foundation course does not lock the rest of the chain.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from . import versions
+from .models import ArchivedEnrollment, Enrollment, Prerequisite, current_term_id
+
+COMPLETED_SECONDS = 60 * 60
+
+
+def bump():
+    """Call after changing prerequisites without model signals (e.g. bulk loads)."""
+    versions.bump('prereq')
+
+
+def completed_changed():
+    """Call when past-term enrollments change, i.e. on term rollover."""
+    versions.bump('prereq-completed')
+
+
+def version():
+    """Changes whenever prerequisites or completed courses may have changed."""
+    return f"{versions.get('prereq')}.{versions.get('prereq-completed')}"
+
+
+class PrerequisiteGraph:
+    def __init__(self, pairs):
+        codes = sorted({code for pair in pairs for code in pair})
+        self.codes = codes
+        self.bit = {code: 1 << i for i, code in enumerate(codes)}
+        self.direct = dict.fromkeys(codes, 0)
+        for course_code, requires_code in pairs:
+            self.direct[course_code] |= self.bit[requires_code]
+
+        # Fixed point of closure(c) = direct(c) | closure of each direct
+        # prerequisite; terminates on cycles too
+        self.closure = dict(self.direct)
+        changed = True
+        while changed:
+            changed = False
+            for code in codes:
+                mask = self.closure[code]
+                for prereq in self.codes_of(self.direct[code]):
+                    mask |= self.closure[prereq]
+                if mask != self.closure[code]:
+                    self.closure[code] = mask
+                    changed = True
+
+    def mask(self, codes):
+        mask = 0
+        for code in codes:
+            mask |= self.bit.get(code, 0)
+        return mask
+
+    def codes_of(self, mask):
+        codes = []
+        while mask:
+            lowest = mask & -mask
+            codes.append(self.codes[lowest.bit_length() - 1])
+            mask ^= lowest
+        return codes
+
+    def completed_mask(self, codes):
+        """Completed codes plus everything they required."""
+        mask = self.mask(codes)
+        for code in codes:
+            mask |= self.closure.get(code, 0)
+        return mask
+
+    def missing(self, code, completed):
+        """Direct prerequisites of `code` not covered by the `completed` mask."""
+        return self.direct.get(code, 0) & ~completed
+
+
+_graph = (None, None)
+
+
+def graph():
+    global _graph
+    version = versions.get('prereq')
+    if _graph[0] != version:
+        pairs = list(Prerequisite.objects.values_list('course_code', 'requires_code'))
+        _graph = (version, PrerequisiteGraph(pairs))
+    return _graph[1]
+
+
+def completed_codes(student):
+    """Codes the student took in earlier terms, archived or not yet archived."""
+    key = f"prereq:completed:{versions.get('prereq-completed')}:{student.id}"
+    codes = cache.get(key)
+    if codes is None:
+        codes = set(ArchivedEnrollment.objects.filter(student=student).values_list('code', flat=True))
+        codes.update(
+            Enrollment.objects.filter(student=student).exclude(term_id=current_term_id())
+            .values_list('course__code', flat=True)
+        )
+        cache.set(key, codes, COMPLETED_SECONDS)
+    return codes
+
+
+def eligibility(student, codes):
+    """
+    Maps each code to the list of direct prerequisites the student is still
+    missing (empty when eligible). Each distinct code is checked once.
+    """
+    g = graph()
+    completed = g.completed_mask(completed_codes(student))
+    result = {}
+    for code in set(codes):
+        missing = g.missing(code, completed)
+        result[code] = g.codes_of(missing) if missing else []
+    return result
+
+
+def _prerequisites_changed(sender, **kwargs):
+    bump()
+
+
+post_save.connect(_prerequisites_changed, sender=Prerequisite, dispatch_uid='prereq_save')
+post_delete.connect(_prerequisites_changed, sender=Prerequisite, dispatch_uid='prereq_delete')
@@ -0,0 +1,170 @@
+"""
+Opt-in request profiling.
+
+`ProfilingMiddleware` runs cProfile on a random SAMPLE_RATE fraction of
+requests. A request slower than SLOW_MS is not profiled itself (it was not
+sampled), but it arms its path so the next request to the same path is.
+Each profile is reduced to its TOP functions by own time and kept, with
+the URL name and timing, in a ring buffer of the last BUFFER profiles per
+process; the admin profiling page aggregates hot functions per URL name
+from it. With DIR set the raw profiles are also written there as .prof
+files, which `dump_profiles` merges.
+
+When PROFILING['ENABLED'] is off the middleware removes itself at startup.
+Unsampled requests only pay for a random number and two clock reads.
+"""
+import cProfile
+import os
+import pstats
+import random
+import re
+import sysconfig
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+DEFAULTS = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 0.01,
+    'SLOW_MS': 1000,
+    'TOP': 25,
+    'BUFFER': 200,
+    'DIR': None,
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'PROFILING', {}))
+    return config
+
+
+# Paths waiting for their next request to be profiled
+MAX_ARMED = 1000
+
+_config = get_config()
+_samples = deque(maxlen=_config['BUFFER'])
+_armed = set()
+# cProfile allows one active profiler per process on recent Pythons
+_profiler_lock = threading.Lock()
+
+
+def _label(func):
+    filename, line, name = func
+    if filename == '~':
+        return name
+    if 'site-packages' + os.sep in filename:
+        filename = filename.split('site-packages' + os.sep, 1)[1]
+    else:
+        for base in (str(settings.BASE_DIR), sysconfig.get_paths()['stdlib']):
+            if filename.startswith(base + os.sep):
+                filename = filename[len(base) + 1:]
+                break
+    return f'{filename}:{line}({name})'
+
+
+def summarize(stats, top):
+    """Top functions of a pstats.Stats by own time: (label, calls, own ms, cumulative ms)."""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+    return [(_label(func), nc, tt * 1000, ct * 1000) for func, (cc, nc, tt, ct, callers) in rows]
+
+
+def samples():
+    return list(_samples)
+
+
+def clear():
+    _samples.clear()
+    _armed.clear()
+
+
+def hot_functions(url_name=None, top=None):
+    """
+    Own time per function summed over the buffered profiles, per URL name:
+    {url_name: {'samples', 'avg_ms', 'functions': [(label, calls, own ms, cum ms)]}}.
+    """
+    groups = {}
+    for sample in samples():
+        if url_name and sample['url_name'] != url_name:
+            continue
+        group = groups.setdefault(sample['url_name'], {'samples': 0, 'total_ms': 0.0, 'functions': {}})
+        group['samples'] += 1
+        group['total_ms'] += sample['ms']
+        for label, calls, own, cumulative in sample['top']:
+            totals = group['functions'].setdefault(label, [0, 0.0, 0.0])
+            totals[0] += calls
+            totals[1] += own
+            totals[2] += cumulative
+    result = {}
+    for name, group in sorted(groups.items(), key=lambda item: -item[1]['total_ms']):
+        functions = sorted(
+            ((label, calls, own, cumulative) for label, (calls, own, cumulative) in group['functions'].items()),
+            key=lambda row: row[2], reverse=True,
+        )
+        result[name] = {
+            'samples': group['samples'],
+            'avg_ms': group['total_ms'] / group['samples'],
+            'functions': functions[:top or _config['TOP']],
+        }
+    return result
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not _config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        path = request.path_info
+        reason = None
+        if path in _armed:
+            reason = 'slow'
+        elif random.random() < _config['SAMPLE_RATE']:
+            reason = 'sampled'
+        if reason and _profiler_lock.acquire(blocking=False):
+            try:
+                _armed.discard(path)
+                return self.profile(request, reason)
+            finally:
+                _profiler_lock.release()
+
+        started = time.perf_counter()
+        response = self.get_response(request)
+        if (time.perf_counter() - started) * 1000 > _config['SLOW_MS'] and len(_armed) < MAX_ARMED:
+            _armed.add(path)
+        return response
+
+    def profile(self, request, reason):
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        elapsed = (time.perf_counter() - started) * 1000
+
+        match = request.resolver_match
+        url_name = (match.view_name if match else None) or request.path_info
+        stats = pstats.Stats(profiler)
+        _samples.append({
+            'url_name': url_name,
+            'path': request.path_info,
+            'method': request.method,
+            'status': response.status_code,
+            'reason': reason,
+            'at': timezone.now(),
+            'ms': elapsed,
+            'top': summarize(stats, _config['TOP']),
+        })
+        if _config['DIR']:
+            os.makedirs(_config['DIR'], exist_ok=True)
+            name = re.sub(r'[^\w-]', '-', url_name)
+            filename = f"{name}.{time.time():.6f}.{os.getpid()}.prof"
+            stats.dump_stats(os.path.join(_config['DIR'], filename))
+        return response
@@ -0,0 +1,104 @@
+"""
+Role and profile resolution, done once per user rather than once per view.
+
+`RoleMiddleware` attaches `request.role`, `request.student` and
+`request.faculty`. Only the role and the profile ids are cached, keyed by
+user id, and dropped whenever the user or one of their profiles is saved or
+deleted. On a cache hit the profiles are attached lazily: a request that
+only needs the role runs no queries, and one that touches the profile loads
+it once, through `request.user`, so `request.user.student` and
+`request.student` share that row. A missing profile is None, and
+`hasattr(user, 'faculty')` does not query for it either. The rows are never
+cached themselves: an instance cached in another process could be stale,
+and saving it would silently revert changes made elsewhere.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.utils.functional import SimpleLazyObject
+
+from .models import Faculty, Student
+
+ADMIN = 'admin'
+FACULTY = 'faculty'
+STUDENT = 'student'
+
+CACHE_SECONDS = 15 * 60
+
+DASHBOARDS = {
+    ADMIN: 'admin_dashboard',
+    FACULTY: 'faculty_dashboard',
+    STUDENT: 'student_dashboard',
+}
+
+
+def _key(user_id):
+    return f'role:{user_id}'
+
+
+def resolve(user):
+    """Returns (role, student, faculty) for an authenticated user."""
+    cached = cache.get(_key(user.pk))
+    if cached is None:
+        student = Student.objects.filter(user_id=user.pk).first()
+        faculty = Faculty.objects.filter(user_id=user.pk).first()
+        if user.is_staff:
+            role = ADMIN
+        elif faculty is not None:
+            role = FACULTY
+        elif student is not None:
+            role = STUDENT
+        else:
+            role = None
+        cache.set(_key(user.pk), (role, student and student.pk, faculty and faculty.pk), CACHE_SECONDS)
+        # Link the profiles to this user object and the user to its profiles
+        for name, profile in (('student', student), ('faculty', faculty)):
+            if profile is not None:
+                profile._state.fields_cache['user'] = user
+            user._state.fields_cache[name] = profile
+        return role, student, faculty
+
+    role, student_pk, faculty_pk = cached
+    return role, _lazy_profile(user, 'student', student_pk), _lazy_profile(user, 'faculty', faculty_pk)
+
+
+def _lazy_profile(user, name, pk):
+    if pk is None:
+        user._state.fields_cache[name] = None
+        return None
+    # The reverse one-to-one accessor caches the row on the user
+    return SimpleLazyObject(lambda: getattr(user, name))
+
+
+def forget(user_ids):
+    cache.delete_many([_key(user_id) for user_id in user_ids])
+
+
+def landing_url_name(role):
+    return DASHBOARDS.get(role, 'student_dashboard')
+
+
+class RoleMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.role = request.student = request.faculty = None
+        if request.user.is_authenticated:
+            request.role, request.student, request.faculty = resolve(request.user)
+        return self.get_response(request)
+
+
+def _profile_changed(sender, instance, **kwargs):
+    forget([instance.user_id])
+
+
+def _user_changed(sender, instance, **kwargs):
+    forget([instance.pk])
+
+
+for model in (Student, Faculty):
+    post_save.connect(_profile_changed, sender=model, dispatch_uid=f'roles_{model.__name__}_save')
+    post_delete.connect(_profile_changed, sender=model, dispatch_uid=f'roles_{model.__name__}_delete')
+post_save.connect(_user_changed, sender=User, dispatch_uid='roles_user_save')
+post_delete.connect(_user_changed, sender=User, dispatch_uid='roles_user_delete')
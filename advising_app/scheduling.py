@@ -0,0 +1,167 @@
+"""
+Room and instructor double-booking checks.
+
+A `Timetable` keeps one interval index per (room, day) and one per
+(faculty, day). Each slot is a list of (start, end, section id) sorted by
+start minute, and the slot remembers its longest interval, so the sections
+overlapping [start, end) are found with one bisect over starts in
+(start - longest, end), i.e. O(log n) per section.
+
+Imports build a timetable once and update it as rows are written; the web
+views share a per-process timetable that is rebuilt when the catalog
+version changes and updated in place after this process's own edits.
+"""
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+from . import catalog
+from .models import Course, current_term_id
+
+FIELDS = ['id', 'code', 'section', 'day', 'start_time', 'end_time', 'room', 'assigned_faculty_id']
+
+Section = namedtuple('Section', FIELDS)
+Conflict = namedtuple('Conflict', ['kind', 'section', 'other'])
+
+
+def section_of(course):
+    return Section(*(getattr(course, field) for field in FIELDS))
+
+
+def _minutes(value):
+    if isinstance(value, str):
+        hours, minutes = value.split(':')[:2]
+        return int(hours) * 60 + int(minutes)
+    return value.hour * 60 + value.minute
+
+
+def _clock(value):
+    """HH:MM of a time, or of the 'HH:MM[:SS]' string an unsaved section may hold."""
+    return value[:5] if isinstance(value, str) else f'{value:%H:%M}'
+
+
+def _room(room):
+    return (room or '').strip().upper()
+
+
+class IntervalIndex:
+    def __init__(self):
+        self._slots = {}
+        self._longest = {}
+
+    def add(self, key, start, end, item):
+        insort(self._slots.setdefault(key, []), (start, end, item))
+        self._longest[key] = max(self._longest.get(key, 0), end - start)
+
+    def remove(self, key, start, end, item):
+        slot = self._slots.get(key, [])
+        i = bisect_left(slot, (start, end, item))
+        if i < len(slot) and slot[i] == (start, end, item):
+            del slot[i]
+
+    def overlapping(self, key, start, end):
+        """Items whose interval overlaps [start, end)."""
+        slot = self._slots.get(key)
+        if not slot:
+            return []
+        i = bisect_left(slot, (start - self._longest[key] + 1,))
+        found = []
+        while i < len(slot) and slot[i][0] < end:
+            if slot[i][1] > start:
+                found.append(slot[i][2])
+            i += 1
+        return found
+
+
+class Timetable:
+    def __init__(self, sections=()):
+        self.rooms = IntervalIndex()
+        self.faculty = IntervalIndex()
+        self.sections = {}
+        self.by_code = {}
+        for section in sections:
+            self.add(section)
+
+    @classmethod
+    def for_term(cls, term_id=None):
+        rows = Course.objects.filter(term_id=term_id or current_term_id()).values_list(*FIELDS)
+        return cls(Section(*row) for row in rows.iterator(chunk_size=2000))
+
+    def _keys(self, section):
+        start, end = _minutes(section.start_time), _minutes(section.end_time)
+        if _room(section.room):
+            yield 'room', self.rooms, (_room(section.room), section.day), start, end
+        if section.assigned_faculty_id:
+            yield 'faculty', self.faculty, (section.assigned_faculty_id, section.day), start, end
+
+    def find(self, code, section):
+        """Id of the stored section with this code and section number, if any."""
+        return self.by_code.get((code, str(section)))
+
+    def conflicts(self, section):
+        """Stored sections sharing a room or instructor with `section` at overlapping times."""
+        found = []
+        for kind, index, key, start, end in self._keys(section):
+            for other_id in index.overlapping(key, start, end):
+                if other_id != section.id:
+                    found.append(Conflict(kind, section, self.sections[other_id]))
+        return found
+
+    def add(self, section):
+        self.sections[section.id] = section
+        self.by_code[(section.code, str(section.section))] = section.id
+        for kind, index, key, start, end in self._keys(section):
+            index.add(key, start, end, section.id)
+
+    def remove(self, section_id):
+        section = self.sections.pop(section_id, None)
+        if section is None:
+            return
+        self.by_code.pop((section.code, str(section.section)), None)
+        for kind, index, key, start, end in self._keys(section):
+            index.remove(key, start, end, section.id)
+
+    def update(self, section):
+        self.remove(section.id)
+        self.add(section)
+
+    def check_all(self):
+        """Every conflicting pair, each reported once."""
+        found = []
+        for section in self.sections.values():
+            found.extend(c for c in self.conflicts(section) if c.other.id > section.id)
+        return found
+
+
+def describe(conflict):
+    section, other = conflict.section, conflict.other
+    what = f"room {_room(section.room)}" if conflict.kind == 'room' else "instructor"
+    return (
+        f"{section.code} Sec {section.section} and {other.code} Sec {other.section} share "
+        f"{what} on {section.day} ({_clock(other.start_time)}-{_clock(other.end_time)})"
+    )
+
+
+_timetable = (None, None)
+
+
+def timetable():
+    """The current term's timetable, shared within the process."""
+    global _timetable
+    version = (current_term_id(), catalog.version())
+    if _timetable[0] != version:
+        _timetable = (version, Timetable.for_term(version[0]))
+    return _timetable[1]
+
+
+def saved(course, previous_version):
+    """
+    Applies this process's own save of `course` to the shared timetable.
+    Only when the save was the sole catalog change since `previous_version`;
+    otherwise the next `timetable()` call rebuilds it.
+    """
+    global _timetable
+    (term_id, version), table = _timetable
+    if table is not None and term_id == course.term_id and version == previous_version:
+        if catalog.version() == previous_version + 1:
+            table.update(section_of(course))
+            _timetable = ((term_id, previous_version + 1), table)
@@ -0,0 +1,239 @@
+"""
+Course catalog search.
+
+An in-process inverted index over the current term's sections, rebuilt when
+the catalog version changes. Sections are numbered in code order, and every
+word of a title maps to a bitmask of section positions, as do the
+department, day and time-band facets. A query word matches as a prefix of a
+code (a bisect giving a contiguous range of positions) or of a title word (a
+bisect over the sorted vocabulary), so a query is a handful of mask unions
+and intersections, and facet counts are popcounts.
+
+Seat availability changes with every enrollment, so it is not part of the
+index: the sections that are full come from a grouped count cached for a
+few seconds.
+"""
+import re
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from . import catalog
+from .models import Course, Enrollment, current_term_id
+
+SEATS_KEY = 'search:seats'
+SEATS_SECONDS = 15
+PER_PAGE = 25
+
+# Start-time bands, in minutes after midnight
+BANDS = [
+    ('morning', 0, 12 * 60),
+    ('afternoon', 12 * 60, 17 * 60),
+    ('evening', 17 * 60, 24 * 60),
+]
+
+FACET_ORDER = {
+    'day': {value: i for i, (value, _) in enumerate(Course.DAYS_CHOICES)},
+    'band': {value: i for i, (value, *_) in enumerate(BANDS)},
+}
+
+_token_re = re.compile(r'[a-z]+|\d+')
+
+
+def _tokens(code, title):
+    return set(_token_re.findall(f'{code} {title}'.lower()))
+
+
+def _mask(positions, size):
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _band(start_time):
+    minutes = start_time.hour * 60 + start_time.minute
+    for value, low, high in BANDS:
+        if low <= minutes < high:
+            return value
+
+
+class CatalogIndex:
+    def __init__(self, rows):
+        self.rows = rows
+        self.size = len(rows)
+        self.all = (1 << self.size) - 1
+        self.position = {row['id']: i for i, row in enumerate(rows)}
+        self.codes = [row['code'].lower() for row in rows]
+
+        postings = {}
+        facets = {'department': {}, 'day': {}, 'band': {}}
+        for i, row in enumerate(rows):
+            for token in _tokens(row['code'], row['title']):
+                postings.setdefault(token, []).append(i)
+            for facet, value in (('department', row['department']), ('day', row['day']), ('band', row['band'])):
+                facets[facet].setdefault(value, []).append(i)
+
+        self.vocabulary = sorted(postings)
+        self.postings = {token: _mask(positions, self.size) for token, positions in postings.items()}
+        self.facets = {
+            facet: {value: _mask(positions, self.size) for value, positions in values.items()}
+            for facet, values in facets.items()
+        }
+
+    def match(self, query):
+        """Sections matching every word of `query`, each word as a prefix."""
+        mask = self.all
+        for word in query.lower().split():
+            # Sections whose code starts with the word are one run of positions
+            low = bisect_left(self.codes, word)
+            high = bisect_left(self.codes, word + '\uffff')
+            code_mask = ((1 << high) - 1) ^ ((1 << low) - 1)
+            # Otherwise each part of it ("data-struct", "cse 101") must start a title or code word
+            parts = _token_re.findall(word)
+            word_mask = self.all if parts else 0
+            for part in parts:
+                word_mask &= self._prefix_mask(part)
+            mask &= code_mask | word_mask
+            if not mask:
+                break
+        return mask
+
+    def _prefix_mask(self, word):
+        mask = 0
+        i = bisect_left(self.vocabulary, word)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(word):
+            mask |= self.postings[self.vocabulary[i]]
+            i += 1
+        return mask
+
+    def full_mask(self, enrolled):
+        mask = 0
+        for course_id, count in enrolled.items():
+            i = self.position.get(course_id)
+            if i is not None and count >= self.rows[i]['capacity']:
+                mask |= 1 << i
+        return mask
+
+    def positions(self, mask, offset, limit):
+        """Positions of the set bits of `mask`, skipping `offset`, at most `limit`."""
+        found = []
+        for byte_index, byte in enumerate(mask.to_bytes((self.size + 7) // 8, 'little')):
+            if not byte:
+                continue
+            count = byte.bit_count()
+            if offset >= count:
+                offset -= count
+                continue
+            for bit in range(8):
+                if byte >> bit & 1:
+                    if offset:
+                        offset -= 1
+                    else:
+                        found.append(byte_index * 8 + bit)
+                        if len(found) == limit:
+                            return found
+        return found
+
+
+def _load():
+    courses = (
+        Course.objects.current()
+        .values(
+            'id', 'code', 'section', 'title', 'credit', 'department', 'day', 'start_time', 'end_time',
+            'room', 'capacity', 'assigned_faculty__user__first_name', 'assigned_faculty__user__last_name',
+        )
+    )
+    rows = []
+    for row in courses.iterator(chunk_size=2000):
+        first = row.pop('assigned_faculty__user__first_name')
+        last = row.pop('assigned_faculty__user__last_name')
+        row['faculty'] = f'{first or ""} {last or ""}'.strip() or None
+        row['band'] = _band(row['start_time'])
+        rows.append(row)
+    # Code order (sections numerically) as the advising page, sorted here so
+    # that code prefixes are contiguous under Python's string comparison
+    rows.sort(key=lambda row: (row['code'].lower(), int(row['section']) if row['section'].isdigit() else 0))
+    return CatalogIndex(rows)
+
+
+_index = (None, None)
+
+
+def index():
+    """The current term's catalog index, shared within the process."""
+    global _index
+    version = (current_term_id(), catalog.version())
+    if _index[0] != version:
+        _index = (version, _load())
+    return _index[1]
+
+
+def enrolled_counts():
+    """{course_id: enrolled} for the current term, at most SEATS_SECONDS old."""
+    counts = cache.get(SEATS_KEY)
+    if counts is None:
+        counts = dict(
+            Enrollment.objects.current().values('course_id').annotate(n=Count('id')).values_list('course_id', 'n')
+        )
+        cache.set(SEATS_KEY, counts, SEATS_SECONDS)
+    return counts
+
+
+def search(query='', department=None, day=None, band=None, open_only=False, page=1, per_page=PER_PAGE):
+    """
+    One page of matching sections with facet counts. Each facet is counted
+    under the other filters, so choosing a department still shows how many
+    matches the other departments have.
+    """
+    idx = index()
+    enrolled = enrolled_counts()
+    full = idx.full_mask(enrolled)
+    text = idx.match(query) if query else idx.all
+    filters = {
+        'department': idx.facets['department'].get(department, 0) if department else idx.all,
+        'day': idx.facets['day'].get(day, 0) if day else idx.all,
+        'band': idx.facets['band'].get(band, 0) if band else idx.all,
+        'open': idx.all & ~full if open_only else idx.all,
+    }
+
+    def narrowed(*skip):
+        mask = text
+        for name, facet_mask in filters.items():
+            if name not in skip:
+                mask &= facet_mask
+        return mask
+
+    matched = narrowed()
+    total = matched.bit_count()
+    pages = max(1, -(-total // per_page))
+    page = min(max(1, page), pages)
+
+    results = []
+    for i in idx.positions(matched, (page - 1) * per_page, per_page):
+        row = dict(idx.rows[i])
+        row['enrolled'] = enrolled.get(row['id'], 0)
+        row['seats_left'] = max(0, row['capacity'] - row['enrolled'])
+        results.append(row)
+
+    facets = {}
+    for facet in ('department', 'day', 'band'):
+        base = narrowed(facet)
+        order = FACET_ORDER.get(facet, {})
+        facets[facet] = sorted(
+            ((value, (base & mask).bit_count()) for value, mask in idx.facets[facet].items() if value),
+            key=lambda item: (order.get(item[0], 0), item[0]),
+        )
+    open_base = narrowed('open')
+    facets['open'] = (open_base & ~full).bit_count()
+
+    return {
+        'query': query,
+        'total': total,
+        'page': page,
+        'pages': pages,
+        'per_page': per_page,
+        'results': results,
+        'facets': facets,
+    }
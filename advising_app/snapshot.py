@@ -0,0 +1,222 @@
+"""
+Compact, immutable catalog snapshot.
+
+The current term's sections as parallel arrays (id, day mask, start and end
+minute, capacity, credit) plus code and section strings, in catalog order
+(code, then section number). A snapshot is built once per catalog version
+and shared by every request in the process, so pages that walk the whole
+catalog index arrays instead of materializing `Course` instances.
+
+With CATALOG_SNAPSHOT_DIR set, the first process to need a version writes
+it to a file there and every process maps that file read-only, so worker
+processes share one copy of the catalog through the page cache.
+"""
+import datetime
+import glob
+import mmap
+import os
+import struct
+from array import array
+
+from django.conf import settings
+
+from . import catalog
+from .models import Course, current_term_id
+
+DAYS = [value for value, _ in Course.DAYS_CHOICES]
+DAY_LABELS = dict(Course.DAYS_CHOICES)
+DAY_BITS = {day: 1 << i for i, day in enumerate(DAYS)}
+
+MAGIC = b'CATS'
+FORMAT = 1
+HEADER = struct.Struct('<4sIqqI')
+# Numeric columns and their array type codes, in file order
+COLUMNS = [('ids', 'q'), ('credits', 'd'), ('capacities', 'i'), ('starts', 'H'), ('ends', 'H'), ('days', 'B')]
+STRINGS = ['codes', 'sections']
+
+
+def _time(minutes):
+    return datetime.time(minutes // 60, minutes % 60)
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+class SectionRecord:
+    """A section read from a snapshot, with the attributes templates use on Course."""
+    __slots__ = ['id', 'code', 'section', 'day', 'start_time', 'end_time', 'capacity', 'credit']
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def get_day_display(self):
+        return DAY_LABELS.get(self.day, self.day)
+
+
+class _Strings:
+    """Read-only sequence of strings stored as utf-8 with an offset array."""
+    __slots__ = ['offsets', 'blob']
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+
+class CatalogSnapshot:
+    def __init__(self, version, columns, strings):
+        self.version = version
+        for name, values in columns.items():
+            setattr(self, name, values)
+        for name, values in strings.items():
+            setattr(self, name, values)
+        self._positions = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def position(self, course_id):
+        if self._positions is None:
+            self._positions = {course_id: i for i, course_id in enumerate(self.ids)}
+        return self._positions.get(course_id)
+
+    def day(self, i):
+        mask = self.days[i]
+        return DAYS[mask.bit_length() - 1] if mask else ''
+
+    def overlaps(self, i, j):
+        return bool(self.days[i] & self.days[j]) and self.starts[i] < self.ends[j] and self.ends[i] > self.starts[j]
+
+    def record(self, i):
+        return SectionRecord(
+            id=self.ids[i], code=self.codes[i], section=self.sections[i], day=self.day(i),
+            start_time=_time(self.starts[i]), end_time=_time(self.ends[i]),
+            capacity=self.capacities[i], credit=self.credits[i],
+        )
+
+    @classmethod
+    def build(cls, version, courses):
+        """From (id, code, section, day, start_time, end_time, capacity, credit) rows."""
+        rows = sorted(courses, key=lambda row: (row[1], int(row[2]) if row[2].isdigit() else 0))
+        columns = {name: array(typecode) for name, typecode in COLUMNS}
+        strings = {'codes': [], 'sections': []}
+        for course_id, code, section, day, start, end, capacity, credit in rows:
+            columns['ids'].append(course_id)
+            columns['credits'].append(credit)
+            columns['capacities'].append(capacity)
+            columns['starts'].append(_minutes(start))
+            columns['ends'].append(_minutes(end))
+            columns['days'].append(DAY_BITS.get(day, 0))
+            strings['codes'].append(code)
+            strings['sections'].append(section)
+        return cls(version, columns, {name: tuple(values) for name, values in strings.items()})
+
+    # --- Files ---
+
+    def write(self, path):
+        """Writes the snapshot to `path` atomically."""
+        chunks = [_padded(HEADER.pack(MAGIC, FORMAT, self.version[0], self.version[1], len(self)))]
+        for name, typecode in COLUMNS:
+            chunks.append(_padded(array(typecode, getattr(self, name)).tobytes()))
+        for name in STRINGS:
+            encoded = [value.encode() for value in getattr(self, name)]
+            offsets = array('I', [0])
+            for value in encoded:
+                offsets.append(offsets[-1] + len(value))
+            chunks.append(_padded(offsets.tobytes()))
+            chunks.append(_padded(b''.join(encoded)))
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(b''.join(chunks))
+        os.replace(temporary, path)
+
+    @classmethod
+    def open(cls, path):
+        """Maps a snapshot file read-only; the arrays are views into the mapping."""
+        with open(path, 'rb') as f:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        magic, file_format, term_id, catalog_version, n = HEADER.unpack_from(data)
+        if magic != MAGIC or file_format != FORMAT:
+            raise ValueError(f"{path} is not a catalog snapshot.")
+        offset = _align(HEADER.size)
+        columns = {}
+        for name, typecode in COLUMNS:
+            size = n * array(typecode).itemsize
+            columns[name] = data[offset:offset + size].cast(typecode)
+            offset = _align(offset + size)
+        strings = {}
+        for name in STRINGS:
+            size = (n + 1) * array('I').itemsize
+            offsets = data[offset:offset + size].cast('I')
+            offset = _align(offset + size)
+            strings[name] = _Strings(offsets, data[offset:offset + offsets[n]])
+            offset = _align(offset + offsets[n])
+        return cls((term_id, catalog_version), columns, strings)
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _padded(data):
+    return data + b'\0' * (_align(len(data)) - len(data))
+
+
+def _path(version):
+    directory = getattr(settings, 'CATALOG_SNAPSHOT_DIR', None)
+    if directory:
+        return os.path.join(directory, f'catalog-{version[0]}-{version[1]}.snap')
+
+
+def _load(version):
+    rows = Course.objects.filter(term_id=version[0]).values_list(
+        'id', 'code', 'section', 'day', 'start_time', 'end_time', 'capacity', 'credit',
+    )
+    snapshot = CatalogSnapshot.build(version, rows.iterator(chunk_size=2000))
+
+    path = _path(version)
+    if path is None:
+        return snapshot
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        snapshot.write(path)
+        # Older versions of this term are no longer needed; mappings that
+        # are still open keep working after the unlink
+        for old in glob.glob(os.path.join(os.path.dirname(path), f'catalog-{version[0]}-*.snap')):
+            if old != path:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+    try:
+        return CatalogSnapshot.open(path)
+    except (OSError, ValueError):
+        return snapshot
+
+
+_snapshot = None
+
+
+def current():
+    """
+    The current term's snapshot, shared within the process. It is rebuilt
+    once the shared catalog version moves, so changes made on other workers
+    show up within versions.VERSION_SECONDS.
+    """
+    global _snapshot
+    version = (current_term_id(), catalog.version())
+    if _snapshot is None or _snapshot.version != version:
+        path = _path(version)
+        try:
+            # Another worker may have written this version already
+            _snapshot = CatalogSnapshot.open(path) if path else _load(version)
+        except (OSError, ValueError):
+            _snapshot = _load(version)
+    return _snapshot
@@ -0,0 +1,167 @@
+"""
+Materialized statistics for the admin dashboard, for the current term.
+
+`DepartmentStats` and `CreditLoadStats` are updated incrementally, so the
+dashboard reads a handful of small rows instead of aggregating the whole
+database. Enrolled counts and credit loads follow the enrollment event log
+(the `stats` consumer in events.py); the other numbers are updated by the
+code paths that change requests, students and courses. `refresh_all()`
+(the `refresh_stats` command) rebuilds both tables from scratch, corrects
+any drift, e.g. after edits made through the Django admin, and moves the
+`stats` consumer past every event the rebuild already includes.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import (
+    AdvisingRequest, Course, CreditLoadStats, DepartmentStats, Enrollment, EnrollmentEvent, Student, current_term_id,
+)
+
+
+def _credit_key(credits):
+    return round(float(credits or 0), 2)
+
+
+def _department_rows(departments=None):
+    courses = Course.objects.current()
+    enrollments = Enrollment.objects.current()
+    students = Student.objects.all()
+    requests = AdvisingRequest.objects.current().filter(status='Pending')
+    if departments is not None:
+        courses = courses.filter(department__in=departments)
+        enrollments = enrollments.filter(course__department__in=departments)
+        students = students.filter(department__in=departments)
+        requests = requests.filter(student__department__in=departments)
+
+    rows = {}
+
+    def row(department):
+        if department not in rows:
+            rows[department] = DepartmentStats(department=department)
+        return rows[department]
+
+    for item in courses.values('department').annotate(n=Count('id'), seats=Coalesce(Sum('capacity'), 0)):
+        stats = row(item['department'])
+        stats.sections = item['n']
+        stats.seats = item['seats']
+    for department, n in enrollments.values('course__department').annotate(n=Count('id')).values_list('course__department', 'n'):
+        row(department).enrolled = n
+    for item in students.values('department').annotate(n=Count('id'), unassigned=Count('id', filter=Q(advisor__isnull=True))):
+        stats = row(item['department'])
+        stats.students = item['n']
+        stats.unassigned_students = item['unassigned']
+    for department, n in requests.values('student__department').annotate(n=Count('id')).values_list('student__department', 'n'):
+        row(department).pending_requests = n
+
+    if departments is not None:
+        for department in departments:
+            row(department)
+    return list(rows.values())
+
+
+def _current_credits():
+    return Coalesce(Sum('enrollments__course__credit', filter=Q(enrollments__term_id=current_term_id())), 0.0)
+
+
+def student_credits(student):
+    total = Enrollment.objects.current().filter(student=student).aggregate(total=Sum('course__credit'))['total']
+    return _credit_key(total)
+
+
+def refresh_all():
+    """Rebuilds both statistics tables with a few grouped queries."""
+    from . import events
+
+    with transaction.atomic():
+        department_rows = _department_rows()
+        totals = Student.objects.annotate(total=_current_credits()).values_list('total', flat=True)
+        loads = Counter(_credit_key(total) for total in totals.iterator(chunk_size=2000))
+
+        events.skip_to_latest('stats')
+        DepartmentStats.objects.all().delete()
+        DepartmentStats.objects.bulk_create(department_rows)
+        CreditLoadStats.objects.all().delete()
+        CreditLoadStats.objects.bulk_create([CreditLoadStats(credits=k, students=n) for k, n in loads.items()])
+    return len(department_rows)
+
+
+def refresh_departments(departments):
+    departments = [d for d in set(departments) if d]
+    if not departments:
+        return
+    with transaction.atomic():
+        for stats in _department_rows(departments):
+            defaults = {
+                'sections': stats.sections,
+                'seats': stats.seats,
+                'students': stats.students,
+                'unassigned_students': stats.unassigned_students,
+                'pending_requests': stats.pending_requests,
+            }
+            # Enrolled counts of existing rows belong to the event consumer
+            DepartmentStats.objects.update_or_create(
+                department=stats.department,
+                defaults=defaults,
+                create_defaults=dict(defaults, enrolled=stats.enrolled),
+            )
+
+
+def _bump(department, **deltas):
+    updated = DepartmentStats.objects.filter(department=department).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    if not updated:
+        refresh_departments([department])
+
+
+def _add_credit_load(credits, count):
+    if CreditLoadStats.objects.filter(credits=credits).update(students=F('students') + count):
+        return
+    try:
+        with transaction.atomic():
+            CreditLoadStats.objects.create(credits=credits, students=count)
+    except IntegrityError:
+        CreditLoadStats.objects.filter(credits=credits).update(students=F('students') + count)
+
+
+def _shift_credit_load(old, new, count=1):
+    old, new = _credit_key(old), _credit_key(new)
+    if old == new or not count:
+        return
+    CreditLoadStats.objects.filter(credits=old).update(students=F('students') - count)
+    _add_credit_load(new, count)
+
+
+# --- Incremental hooks ---
+
+def apply_enrollment_events(batch):
+    """Applies a batch of logged adds and drops of the current term."""
+    current = current_term_id()
+    deltas = Counter()
+    before = {}
+    after = {}
+    for event in batch:
+        if event.kind not in (EnrollmentEvent.ADD, EnrollmentEvent.DROP) or event.term_id != current:
+            continue
+        sign = 1 if event.kind == EnrollmentEvent.ADD else -1
+        deltas[event.department] += sign
+        before.setdefault(event.student_id, event.total_after - sign * event.credit)
+        after[event.student_id] = event.total_after
+    for department, delta in deltas.items():
+        if delta:
+            _bump(department, enrolled=delta)
+    for student_id, old in before.items():
+        _shift_credit_load(old, after[student_id])
+
+
+def request_changed(department, delta):
+    _bump(department, pending_requests=delta)
+
+
+def student_added(student):
+    _bump(student.department, students=1, unassigned_students=0 if student.advisor_id else 1)
+    _add_credit_load(0.0, 1)
+
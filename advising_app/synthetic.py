@@ -0,0 +1,366 @@
+"""
+Seeded synthetic university data for scale testing.
+
+`generate()` builds departments of faculty (Q1 IDs) and students
+(year-based IDs), sections with plausible schedules, enrollments and
+advising requests with priorities. Everything is drawn from one
+random.Random(seed), so the same arguments give the same dataset. Rows go
+in with bulk_create in chunks inside one transaction, and every generated
+user shares one password hash computed up front, which keeps a
+100k-student dataset to well under a minute on SQLite.
+
+The data obeys the application's rules: no room or instructor is
+double-booked, enrollments respect capacity, clashes, one section per
+course and the credit limit, and a student has at most one request.
+Generated usernames start with PREFIX and every generated section has a
+generated instructor, which is how `flush()` finds the data again.
+"""
+import datetime
+import math
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+
+from . import catalog, stats, versions
+from .enrollment import MAX_CREDITS
+from .models import AdvisingRequest, Course, Enrollment, Faculty, PreferredCourse, Student, current_term_id
+
+PREFIX = 'gen-'
+CHUNK = 5000
+# Fixed, not the current year, so a seed gives the same student ids every year
+INTAKE_YEAR = 2025
+
+DEPARTMENTS = [
+    ('CSE', ['Programming', 'Data Structures', 'Algorithms', 'Databases', 'Operating Systems',
+             'Computer Networks', 'Software Engineering', 'Artificial Intelligence', 'Compilers', 'Computer Graphics']),
+    ('EEE', ['Circuits', 'Electronics', 'Signals and Systems', 'Power Systems', 'Control Systems',
+             'Electromagnetics', 'Digital Logic', 'Communication Systems']),
+    ('MAT', ['Calculus', 'Linear Algebra', 'Discrete Mathematics', 'Probability', 'Differential Equations',
+             'Numerical Methods', 'Real Analysis', 'Statistics']),
+    ('PHY', ['Mechanics', 'Waves and Optics', 'Thermodynamics', 'Electricity and Magnetism', 'Modern Physics',
+             'Quantum Mechanics']),
+    ('BUS', ['Accounting', 'Marketing', 'Finance', 'Management', 'Business Law', 'Operations Management']),
+    ('ECO', ['Microeconomics', 'Macroeconomics', 'Econometrics', 'Development Economics', 'Public Finance',
+             'International Trade']),
+    ('ENG', ['Composition', 'Public Speaking', 'Literature', 'Technical Writing', 'Linguistics']),
+    ('CIV', ['Structural Analysis', 'Surveying', 'Fluid Mechanics', 'Geotechnics', 'Transportation Engineering',
+             'Concrete Design']),
+]
+LEVEL_TITLES = ['Introduction to ', '', 'Advanced ', 'Topics in ']
+DESIGNATIONS = ['Lecturer', 'Lecturer', 'Senior Lecturer', 'Assistant Professor', 'Associate Professor', 'Professor']
+FIRST_NAMES = [
+    'Sadaf', 'Tanvir', 'Nusrat', 'Rafi', 'Farhana', 'Imran', 'Ayesha', 'Mahir', 'Sumaiya', 'Arif', 'Tasnim',
+    'Rakib', 'Mehjabin', 'Fahim', 'Anika', 'Sabbir', 'Lamia', 'Hasan', 'Priya', 'Omar', 'Maria', 'David',
+]
+LAST_NAMES = [
+    'Rahman', 'Hossain', 'Ahmed', 'Islam', 'Chowdhury', 'Khan', 'Akter', 'Sarker', 'Das', 'Roy', 'Siddiqui',
+    'Karim', 'Haque', 'Alam', 'Uddin', 'Begum', 'Smith', 'Garcia',
+]
+
+DAYS = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu']
+SLOTS = [
+    (datetime.time(8, 0), datetime.time(9, 20)),
+    (datetime.time(9, 30), datetime.time(10, 50)),
+    (datetime.time(11, 0), datetime.time(12, 20)),
+    (datetime.time(12, 30), datetime.time(13, 50)),
+    (datetime.time(14, 0), datetime.time(15, 20)),
+    (datetime.time(15, 30), datetime.time(16, 50)),
+]
+# Every section meets once a week in one of these (day, slot) pairs, so two
+# sections clash exactly when they share a meeting
+MEETINGS = [(day, slot) for day in DAYS for slot in range(len(SLOTS))]
+CAPACITIES = [30, 35, 40, 40, 45, 50]
+STATUS_WEIGHTS = [('Pending', 7), ('Approved', 2), ('Rejected', 1)]
+
+
+def _insert(model, objects):
+    """bulk_create in chunks from any iterable; returns the number of rows."""
+    count = 0
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == CHUNK:
+            model.objects.bulk_create(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+def _split(total, parts):
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def _next_number(values, prefix):
+    """One more than the largest number following `prefix` in `values`."""
+    numbers = [int(value[len(prefix):]) for value in values if value[len(prefix):].isdigit()]
+    return max(numbers, default=0) + 1
+
+
+def _name(rng):
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+def exists():
+    return User.objects.filter(username__startswith=PREFIX).exists()
+
+
+def flush():
+    """Removes the data `generate()` created. Returns the number of users removed."""
+    users = User.objects.filter(username__startswith=PREFIX)
+    course_ids = list(Course.objects.filter(assigned_faculty__user__in=users).values_list('id', flat=True))
+    # Sections and faculty bump the catalog once, not once per deleted row
+    with versions.deferred(), transaction.atomic():
+        # Children first, with one statement each
+        PreferredCourse.objects.filter(Q(course_id__in=course_ids) | Q(request__student__user__in=users)).delete()
+        AdvisingRequest.objects.filter(student__user__in=users).delete()
+        Enrollment.objects.filter(Q(course_id__in=course_ids) | Q(student__user__in=users)).delete()
+        Course.objects.filter(id__in=course_ids).delete()
+        Student.objects.filter(user__in=users).delete()
+        Faculty.objects.filter(user__in=users).delete()
+        removed, _ = users.delete()
+        catalog.bump()
+    stats.refresh_all()
+    return removed
+
+
+class _Section:
+    __slots__ = ['department', 'code', 'section', 'title', 'credit', 'capacity', 'room', 'teacher', 'meeting']
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+def _plan_sections(rng, department, topics, count, teachers, taken_codes):
+    """`count` sections of `department`, each with a free room and instructor."""
+    rooms = math.ceil(count / len(MEETINGS) * 1.2) + 1
+    free_rooms = {meeting: [f'{department}-{101 + r}' for r in range(rooms)] for meeting in MEETINGS}
+    busy = set()
+    numbers = [1] * len(LEVEL_TITLES)
+    sections = []
+    k = 0
+    while len(sections) < count:
+        topic = topics[k % len(topics)]
+        level = (k // len(topics)) % len(LEVEL_TITLES)
+        series = k // (len(topics) * len(LEVEL_TITLES))
+        k += 1
+        code = f'{department}{level + 1}{numbers[level]:02d}'
+        while code in taken_codes:
+            numbers[level] += 1
+            code = f'{department}{level + 1}{numbers[level]:02d}'
+        numbers[level] += 1
+        title = LEVEL_TITLES[level] + topic + (f' {series + 1}' if series else '')
+        credit = 3.0
+        if rng.random() < 0.15:
+            title, credit = f'{title} Lab', 1.0
+
+        for number in range(1, min(rng.choice([1, 1, 2, 2, 3, 4]), count - len(sections)) + 1):
+            meetings = rng.sample(MEETINGS, len(MEETINGS))
+            found = None
+            # A few random instructors first, everyone if they are all busy
+            for pool in (rng.sample(teachers, min(len(teachers), 3)), teachers):
+                for meeting in meetings:
+                    if not free_rooms[meeting]:
+                        continue
+                    teacher = next((t for t in pool if (t, meeting) not in busy), None)
+                    if teacher is not None:
+                        found = (teacher, meeting)
+                        break
+                if found:
+                    break
+            if found is None:
+                raise ValueError(
+                    f"Not enough instructors or rooms in {department} for {count} sections; use more faculty."
+                )
+            teacher, meeting = found
+            busy.add(found)
+            sections.append(_Section(
+                department=department, code=code, section=str(number), title=title, credit=credit,
+                capacity=rng.choice(CAPACITIES), room=free_rooms[meeting].pop(), teacher=teacher, meeting=meeting,
+            ))
+    return sections
+
+
+def _pick(rng, candidates, count, sections, left=None, blocked_codes=(), blocked_meetings=(), credits=0.0):
+    """
+    Up to `count` section indexes with distinct codes, no clashes, legal
+    credits and, if `left` seat counts are given, open seats.
+    """
+    picked = []
+    codes = set(blocked_codes)
+    meetings = set(blocked_meetings)
+    for _ in range(count * 6):
+        if len(picked) == count:
+            break
+        i = rng.choice(candidates)
+        section = sections[i]
+        if ((left and left[i] <= 0) or section.code in codes or section.meeting in meetings
+                or credits + section.credit > MAX_CREDITS):
+            continue
+        picked.append(i)
+        codes.add(section.code)
+        meetings.add(section.meeting)
+        credits += section.credit
+    return picked
+
+
+def generate(students=2000, sections=None, faculty=None, departments=None, load=4.0, requests=0.3,
+             seed=1, password='password', intake_year=INTAKE_YEAR, log=None):
+    """
+    Generates a dataset into the current term and returns the row counts.
+    `load` is the average number of sections per student and `requests`
+    the share of students with an advising request.
+    """
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+    departments = DEPARTMENTS[:departments or len(DEPARTMENTS)]
+    sections = sections or max(len(departments) * 5, students // 10)
+    faculty = faculty or max(len(departments), sections // 4)
+    term_id = current_term_id()
+    hashed = make_password(password, salt=f'synthetic{seed}')
+
+    taken_codes = set(Course.objects.filter(term_id=term_id).values_list('code', flat=True))
+    faculty_number = _next_number(Faculty.objects.filter(faculty_id__startswith='Q1').values_list('faculty_id', flat=True), 'Q1')
+    years = [intake_year - offset for offset in range(4, -1, -1)]
+    student_numbers = {
+        year: _next_number(Student.objects.filter(student_id__startswith=str(year)).values_list('student_id', flat=True), str(year))
+        for year in years
+    }
+
+    # --- Plan everything in memory ---
+    teachers = []  # (faculty_id, department, first, last, designation)
+    people = []  # (student_id, department, first, last, cgpa, advisor faculty_id)
+    planned = []
+    for (department, topics), n_faculty, n_sections, n_students in zip(
+        departments, _split(faculty, len(departments)), _split(sections, len(departments)),
+        _split(students, len(departments)),
+    ):
+        ids = []
+        for _ in range(max(n_faculty, 1)):
+            faculty_id = f'Q1{faculty_number:04d}'
+            faculty_number += 1
+            ids.append(faculty_id)
+            teachers.append((faculty_id, department, *_name(rng), rng.choice(DESIGNATIONS)))
+        planned.extend(_plan_sections(rng, department, topics, n_sections, ids, taken_codes))
+        for _ in range(n_students):
+            year = rng.choice(years)
+            student_id = f'{year}{student_numbers[year]:04d}'
+            student_numbers[year] += 1
+            cgpa = round(min(4.0, max(2.0, rng.gauss(3.1, 0.45))), 2)
+            people.append((student_id, department, *_name(rng), cgpa, rng.choice(ids)))
+    log(f"Planned {len(teachers)} faculty, {len(planned)} sections and {len(people)} students.")
+
+    by_department = {}
+    for i, section in enumerate(planned):
+        by_department.setdefault(section.department, []).append(i)
+    everything = range(len(planned))
+    left = [section.capacity for section in planned]
+    schedules = []
+    order = list(range(len(people)))
+    rng.shuffle(order)
+    for p in order:
+        count = max(1, round(rng.gauss(load, 1.0)))
+        own = by_department[people[p][1]]
+        # Mostly the student's own department, some electives from anywhere
+        picked = _pick(rng, own, count - count // 4, planned, left)
+        if len(picked) < count:
+            picked += _pick(
+                rng, everything, count - len(picked), planned, left,
+                [planned[i].code for i in picked], [planned[i].meeting for i in picked],
+                sum(planned[i].credit for i in picked),
+            )
+        for i in picked:
+            left[i] -= 1
+        schedules.append((p, picked))
+    schedules.sort()
+
+    wishes = []
+    for p, picked in schedules:
+        if rng.random() >= requests:
+            continue
+        status = rng.choices([s for s, _ in STATUS_WEIGHTS], [w for _, w in STATUS_WEIGHTS])[0]
+        codes = [planned[i].code for i in picked]
+        meetings = [planned[i].meeting for i in picked]
+        # Preferences ignore seats: they are wishes, not enrollments
+        preferred = _pick(rng, by_department[people[p][1]], rng.randint(2, 5), planned, None, codes, meetings)
+        if preferred:
+            wishes.append((p, status, preferred))
+
+    # --- Write ---
+    with transaction.atomic():
+        _insert(User, (
+            User(username=f'{PREFIX}{faculty_id.lower()}', first_name=first, last_name=last, password=hashed,
+                 email=f'{faculty_id.lower()}@faculty.example.edu')
+            for faculty_id, department, first, last, designation in teachers
+        ))
+        _insert(User, (
+            User(username=f'{PREFIX}{student_id}', first_name=first, last_name=last, password=hashed,
+                 email=f'{student_id}@students.example.edu')
+            for student_id, department, first, last, cgpa, advisor in people
+        ))
+        # Ids are read back rather than taken from bulk_create, which not
+        # every backend returns
+        users = dict(User.objects.filter(username__startswith=PREFIX).values_list('username', 'id'))
+
+        _insert(Faculty, (
+            Faculty(user_id=users[f'{PREFIX}{faculty_id.lower()}'], faculty_id=faculty_id, department=department,
+                    designation=designation)
+            for faculty_id, department, first, last, designation in teachers
+        ))
+        faculty_ids = dict(Faculty.objects.filter(user__username__startswith=PREFIX).values_list('faculty_id', 'id'))
+
+        _insert(Course, (
+            Course(code=s.code, section=s.section, title=s.title, credit=s.credit, department=s.department,
+                   capacity=s.capacity, room=s.room, assigned_faculty_id=faculty_ids[s.teacher], day=s.meeting[0],
+                   start_time=SLOTS[s.meeting[1]][0], end_time=SLOTS[s.meeting[1]][1], term_id=term_id)
+            for s in planned
+        ))
+        course_ids = {
+            (code, section): course_id for code, section, course_id in
+            Course.objects.filter(term_id=term_id, assigned_faculty__user__username__startswith=PREFIX)
+            .values_list('code', 'section', 'id')
+        }
+        course_of = [course_ids[(s.code, s.section)] for s in planned]
+
+        credits = {p: sum(planned[i].credit for i in picked) for p, picked in schedules}
+        _insert(Student, (
+            Student(user_id=users[f'{PREFIX}{student_id}'], student_id=student_id, department=department, cgpa=cgpa,
+                    advisor_id=faculty_ids[advisor], current_balance=credits[p] * 6000)
+            for p, (student_id, department, first, last, cgpa, advisor) in enumerate(people)
+        ))
+        student_ids = dict(Student.objects.filter(user__username__startswith=PREFIX).values_list('student_id', 'id'))
+        of_person = [student_ids[person[0]] for person in people]
+
+        enrollments = _insert(Enrollment, (
+            Enrollment(student_id=of_person[p], course_id=course_of[i], term_id=term_id)
+            for p, picked in schedules for i in picked
+        ))
+        _insert(AdvisingRequest, (
+            AdvisingRequest(student_id=of_person[p], status=status, term_id=term_id) for p, status, preferred in wishes
+        ))
+        request_ids = dict(
+            AdvisingRequest.objects.filter(term_id=term_id, student__user__username__startswith=PREFIX)
+            .values_list('student_id', 'id')
+        )
+        preferences = _insert(PreferredCourse, (
+            PreferredCourse(request_id=request_ids[of_person[p]], course_id=course_of[i], priority=priority)
+            for p, status, preferred in wishes for priority, i in enumerate(preferred, start=1)
+        ))
+
+    # bulk_create sends no signals
+    catalog.bump()
+    stats.refresh_all()
+    return {
+        'faculty': len(teachers),
+        'sections': len(planned),
+        'students': len(people),
+        'enrollments': enrollments,
+        'requests': len(wishes),
+        'preferred courses': preferences,
+    }
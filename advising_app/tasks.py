@@ -0,0 +1,227 @@
+"""
+Lightweight database-backed job queue.
+
+Heavy admin operations are stored as `Job` rows and executed by worker
+processes started with `python manage.py runworkers`. No external broker
+is needed; workers claim jobs with a conditional UPDATE so several
+processes can share the same table safely.
+"""
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from . import events, roles, stats
+from .models import AdvisingRequest, Faculty, Job, Student, current_term_id
+
+# Seconds to wait before the first retry; doubled on every further attempt
+RETRY_DELAY = getattr(settings, 'JOB_RETRY_DELAY', 10)
+# Running jobs that have not reported progress for this long are assumed to
+# belong to a dead worker
+STALE_AFTER = getattr(settings, 'JOB_STALE_AFTER', 60 * 60)
+# How often each worker looks for stale jobs
+REQUEUE_EVERY = 60
+CHUNK_SIZE = 500
+ADVISEE_LIMIT = 50
+
+_registry = {}
+
+
+def task(name):
+    """Registers a function as a job handler under `name`."""
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, user=None, max_attempts=3, **payload):
+    if name not in _registry:
+        raise ValueError(f"Unknown job: {name}")
+    job = Job.objects.create(name=name, payload=payload, created_by=user, max_attempts=max_attempts)
+    return job
+
+
+def report_progress(job, done, total=None):
+    """Stores progress without touching the rest of the row. Also tells
+    requeue_stale that the job's worker is still alive."""
+    job.progress = done
+    job.heartbeat_at = timezone.now()
+    fields = {'progress': done, 'heartbeat_at': job.heartbeat_at}
+    if total is not None:
+        job.total = total
+        fields['total'] = total
+    Job.objects.filter(id=job.id).update(**fields)
+
+
+def claim_next(worker_name):
+    now = timezone.now()
+    candidates = Job.objects.filter(
+        Q(run_after__isnull=True) | Q(run_after__lte=now),
+        status='Pending',
+    ).order_by('created_at').values_list('id', flat=True)[:10]
+
+    for job_id in candidates:
+        # Only one worker can flip a given row from Pending to Running
+        claimed = Job.objects.filter(id=job_id, status='Pending').update(
+            status='Running',
+            worker=worker_name,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+def run_job(job):
+    func = _registry.get(job.name)
+    try:
+        if func is None:
+            raise ValueError(f"Unknown job: {job.name}")
+        result = func(job, **job.payload)
+    except Exception:
+        job.result = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = 'Pending'
+            job.run_after = timezone.now() + timedelta(seconds=RETRY_DELAY * 2 ** (job.attempts - 1))
+        else:
+            job.status = 'Failed'
+            job.finished_at = timezone.now()
+    else:
+        job.status = 'Done'
+        job.result = '' if result is None else str(result)
+        job.finished_at = timezone.now()
+        if job.total:
+            job.progress = job.total
+    job.save(update_fields=['status', 'result', 'run_after', 'finished_at', 'progress'])
+    return job
+
+
+def requeue_stale():
+    """
+    Puts jobs whose worker stopped reporting progress back in the queue, or
+    fails them if they already used all their attempts (a job that kills its
+    worker would otherwise be retried forever). Returns the number requeued.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status='Running', heartbeat_at__lt=now - timedelta(seconds=STALE_AFTER))
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status='Failed', worker='', finished_at=now, result="The worker stopped responding while running the job.",
+    )
+    return stale.update(status='Pending', worker='')
+
+
+def work(worker_name=None, poll_interval=1.0, once=False):
+    """
+    Processes jobs until interrupted. With `once`, returns as soon as the
+    queue is empty.
+    """
+    worker_name = worker_name or f"{socket.gethostname()}:{os.getpid()}"
+    processed = 0
+    requeued_at = 0
+    while True:
+        close_old_connections()
+        if time.monotonic() - requeued_at > REQUEUE_EVERY:
+            # Jobs of workers that died while running go back to the queue
+            requeue_stale()
+            requeued_at = time.monotonic()
+        job = claim_next(worker_name)
+        if job is None:
+            if not events.inline():
+                # Idle workers keep dashboard counts and balances up to date
+                events.consume_all()
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        processed += 1
+
+
+# --- Jobs ---
+
+@task('update_requests')
+def update_requests(job, request_ids, status):
+    total = len(request_ids)
+    report_progress(job, 0, total)
+    for start in range(0, total, CHUNK_SIZE):
+        chunk = request_ids[start:start + CHUNK_SIZE]
+        with transaction.atomic():
+            pending = list(AdvisingRequest.objects.filter(id__in=chunk, status='Pending').select_related('student'))
+            AdvisingRequest.objects.filter(id__in=[r.id for r in pending]).update(status=status)
+            if status == 'Approved':
+                events.record_approvals(pending, actor=job.created_by)
+        report_progress(job, min(start + CHUNK_SIZE, total))
+    departments = AdvisingRequest.objects.filter(id__in=request_ids).values_list('student__department', flat=True)
+    stats.refresh_departments(departments.distinct())
+    return f"{total} requests marked {status}"
+
+
+@task('assign_advisor')
+def assign_advisor(job, advisor_id, student_ids):
+    total = len(student_ids)
+    report_progress(job, 0, total)
+    with transaction.atomic():
+        # The limit was checked when the job was queued; other assignments
+        # may have run since, so it is checked again under the advisor's lock
+        advisor = Faculty.objects.select_for_update().get(id=advisor_id)
+        advisees = advisor.advisees.exclude(id__in=student_ids).count()
+        if advisees + total > ADVISEE_LIMIT:
+            raise ValueError(
+                f"Advisor limit ({ADVISEE_LIMIT}) would be exceeded. Current: {advisees}, Adding: {total}"
+            )
+        for start in range(0, total, CHUNK_SIZE):
+            chunk = student_ids[start:start + CHUNK_SIZE]
+            Student.objects.filter(id__in=chunk).update(advisor_id=advisor_id)
+            roles.forget(Student.objects.filter(id__in=chunk).values_list('user_id', flat=True))
+            report_progress(job, min(start + CHUNK_SIZE, total))
+    departments = Student.objects.filter(id__in=student_ids).values_list('department', flat=True)
+    stats.refresh_departments(departments.distinct())
+    return f"{total} students assigned"
+
+
+@task('recompute_balances')
+def recompute_balances(job):
+    students = Student.objects.annotate(
+        total_credit=Sum('enrollments__course__credit', filter=Q(enrollments__term_id=current_term_id()))
+    ).order_by('id')
+    total = students.count()
+    report_progress(job, 0, total)
+
+    batch = []
+    done = 0
+    for student in students.iterator(chunk_size=CHUNK_SIZE):
+        # 6000 per credit, same rule as the student dashboard
+        student.current_balance = (student.total_credit or 0) * 6000
+        batch.append(student)
+        if len(batch) == CHUNK_SIZE:
+            Student.objects.bulk_update(batch, ['current_balance'])
+            roles.forget(s.user_id for s in batch)
+            done += len(batch)
+            batch = []
+            report_progress(job, done)
+    if batch:
+        Student.objects.bulk_update(batch, ['current_balance'])
+        roles.forget(s.user_id for s in batch)
+        done += len(batch)
+    return f"{done} balances recomputed"
+
+
+@task('refresh_stats')
+def refresh_stats(job):
+    departments = stats.refresh_all()
+    return f"Statistics rebuilt for {departments} departments"
+
+
+@task('consume_events')
+def consume_events(job):
+    handled = events.consume_all()
+    return ", ".join(f"{name}: {n} events" for name, n in handled.items())
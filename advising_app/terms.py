@@ -0,0 +1,124 @@
+"""
+Term rollover and archival.
+
+Live tables (courses, enrollments, advising requests) only hold terms that
+have not been archived, and hot queries are scoped to the current term with
+`.current()`. `archive_term` copies a closed term into the Archived* tables
+in chunks and deletes it from the live tables in one transaction.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from . import catalog, prerequisites, stats
+from .models import (
+    CURRENT_TERM_KEY, AdvisingRequest, ArchivedAdvisingRequest, ArchivedCourse, ArchivedEnrollment,
+    Course, Enrollment, PreferredCourse, Term, current_term_id,
+)
+
+CHUNK_SIZE = 2000
+
+COURSE_FIELDS = [
+    'id', 'code', 'title', 'credit', 'department', 'section', 'room', 'capacity',
+    'assigned_faculty_id', 'day', 'start_time', 'end_time',
+]
+
+
+def current_term():
+    return Term.objects.get(id=current_term_id())
+
+
+def _chunks(rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def rollover(name, starts_on=None, copy_sections=False):
+    """
+    Opens a new current term. With `copy_sections` the current term's
+    sections (times, rooms, faculty, capacity) are copied into it.
+    """
+    previous = current_term()
+    with transaction.atomic():
+        term = Term.objects.create(name=name, starts_on=starts_on)
+        copied = 0
+        if copy_sections:
+            sections = Course.objects.filter(term=previous).order_by('id').values(*COURSE_FIELDS[1:])
+            for chunk in _chunks(sections.iterator(chunk_size=CHUNK_SIZE)):
+                Course.objects.bulk_create([Course(term=term, **row) for row in chunk])
+                copied += len(chunk)
+        Term.objects.filter(is_current=True).update(is_current=False)
+        Term.objects.filter(id=term.id).update(is_current=True)
+        transaction.on_commit(_term_switched)
+    return previous, term, copied
+
+
+def _term_switched():
+    cache.delete(CURRENT_TERM_KEY)
+    catalog.bump()
+    # The previous term's enrollments now count as completed courses
+    prerequisites.completed_changed()
+    stats.refresh_all()
+
+
+def archive(term):
+    """Moves a closed term out of the live tables. Returns row counts."""
+    if term.id == current_term_id():
+        raise ValueError(f"{term} is the current term and cannot be archived.")
+
+    counts = {'courses': 0, 'enrollments': 0, 'requests': 0}
+    with transaction.atomic():
+        sections = Course.objects.filter(term=term).order_by('id').values(*COURSE_FIELDS)
+        for chunk in _chunks(sections.iterator(chunk_size=CHUNK_SIZE)):
+            ArchivedCourse.objects.bulk_create([
+                ArchivedCourse(term=term, course_id=row.pop('id'), **row) for row in chunk
+            ])
+            counts['courses'] += len(chunk)
+        archived_ids = dict(ArchivedCourse.objects.filter(term=term).values_list('course_id', 'id'))
+
+        enrollments = Enrollment.objects.filter(term=term).order_by('id').values_list(
+            'student_id', 'course_id', 'course__code', 'course__credit', 'enrolled_at',
+        )
+        for chunk in _chunks(enrollments.iterator(chunk_size=CHUNK_SIZE)):
+            ArchivedEnrollment.objects.bulk_create([
+                ArchivedEnrollment(
+                    term=term, student_id=student_id, course_id=archived_ids[course_id],
+                    code=code, credit=credit, enrolled_at=enrolled_at,
+                )
+                for student_id, course_id, code, credit, enrolled_at in chunk
+            ])
+            counts['enrollments'] += len(chunk)
+
+        requests = AdvisingRequest.objects.filter(term=term).order_by('id').prefetch_related('preferred_courses__course')
+        for chunk in _chunks(requests.iterator(chunk_size=CHUNK_SIZE)):
+            ArchivedAdvisingRequest.objects.bulk_create([
+                ArchivedAdvisingRequest(
+                    term=term, student_id=r.student_id, status=r.status, created_at=r.created_at,
+                    preferred_codes=[p.course.code for p in r.preferred_courses.all()],
+                )
+                for r in chunk
+            ])
+            counts['requests'] += len(chunk)
+
+        # Children first, so deleting the sections has nothing left to cascade
+        PreferredCourse.objects.filter(request__term=term).delete()
+        AdvisingRequest.objects.filter(term=term).delete()
+        Enrollment.objects.filter(term=term).delete()
+        Course.objects.filter(term=term).delete()
+        Term.objects.filter(id=term.id).update(archived_at=timezone.now())
+    return counts
+
+
+def _term_changed(sender, **kwargs):
+    cache.delete(CURRENT_TERM_KEY)
+
+
+post_save.connect(_term_changed, sender=Term, dispatch_uid='terms_term_save')
+post_delete.connect(_term_changed, sender=Term, dispatch_uid='terms_term_delete')
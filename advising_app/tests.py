@@ -1,3 +1,739 @@
-from django.test import TestCase
+import datetime
+import io
+import os
+import tempfile
+import threading
+from collections import Counter
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError, connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import (
+    admission, anomalies, bulk_courses, catalog, classification, db_router, events, exports, prerequisites, roles,
+    scheduling, search, snapshot, stats, tasks, terms,
+)
+from .enrollment import apply_changes, submit_request
+from .models import (
+    AdvisingRequest, CacheVersion, Course, CreditLoadStats, DepartmentStats, Enrollment, EnrollmentEvent, Faculty, Job,
+    PreferredCourse, Prerequisite, Student, Term,
+)
+
+
+def make_student(username='student', student_id='20250001'):
+    user = User.objects.create_user(username, password='pw')
+    return Student.objects.create(user=user, student_id=student_id, department='CSE', cgpa=3.0)
+
+
+def make_faculty(username='faculty', faculty_id='F1001'):
+    user = User.objects.create_user(username, password='pw')
+    return Faculty.objects.create(user=user, faculty_id=faculty_id, department='CSE', designation='Lecturer')
+
+
+def make_course(code, credit=3, day='Mon', hour=9, capacity=40, section='1', title=None, **fields):
+    fields.setdefault('department', 'CSE')
+    return Course.objects.create(
+        code=code, title=title or code, credit=credit, section=section, day=day,
+        start_time=datetime.time(hour), end_time=datetime.time(hour + 1), capacity=capacity, room='R1', **fields,
+    )
+
+
+class AdvisingTestCase(TestCase):
+    def setUp(self):
+        # Cached versions and ids would outlive each test's rolled back rows
+        cache.clear()
+
+
+class RepairPlanTests(AdvisingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = make_student()
+
+    def enroll(self, *courses, student=None):
+        return [Enrollment.objects.create(student=student or self.student, course=course) for course in courses]
+
+    def planned(self):
+        scan_run, _ = anomalies.run_scan(full=True)
+        return scan_run, {item['enrollment_id']: item['reasons'] for item in scan_run.repair_plan}
+
+    def test_drops_only_what_breaks_the_credit_limit(self):
+        credits = [4, 4, 4, 4, 3]
+        enrollments = self.enroll(*(make_course(f'CSE10{i}', credit=c, hour=8 + i) for i, c in enumerate(credits)))
+        scan_run, planned = self.planned()
+        self.assertEqual(planned, {enrollments[3].id: ['over_credit']})
+
+        self.assertEqual(anomalies.apply_repair_plan(scan_run), 1)
+        self.assertEqual(sum(e.course.credit for e in self.student.enrollments.all()), 15)
+        self.assertEqual(self.planned()[1], {})
+
+    def test_one_drop_fixes_several_violations(self):
+        first, retake = make_course('CSE100', hour=9), make_course('CSE100', hour=9, section='2')
+        enrollments = self.enroll(first, retake)
+        self.assertEqual(self.planned()[1], {enrollments[1].id: ['duplicate', 'clash']})
+
+    def test_oversold_sections_keep_the_earliest_seats(self):
+        course = make_course('CSE200', capacity=3)
+        students = [make_student(f's{i}', f'2025010{i}') for i in range(5)]
+        enrollments = [self.enroll(course, student=student)[0] for student in students]
+        self.assertEqual(self.planned()[1], {e.id: ['oversold'] for e in enrollments[3:]})
+
+    def test_student_drops_free_seats_first(self):
+        course = make_course('CSE200', capacity=1, hour=9)
+        clashing = make_course('CSE300', hour=9)
+        other = make_student('other', '20250002')
+        mine = self.enroll(clashing, course)
+        theirs = self.enroll(course, student=other)
+        # Dropping the clash also gives the seat back, so `other` keeps theirs
+        self.assertEqual(self.planned()[1], {mine[1].id: ['clash']})
+
+
+class CatalogVersionTests(AdvisingTestCase):
+    def test_saving_a_section_bumps_the_version(self):
+        before = catalog.version()
+        make_course('CSE100')
+        self.assertEqual(catalog.version(), before + 1)
+
+    def test_bumps_from_other_processes_are_seen(self):
+        before = catalog.version()
+        # Another worker bumped it; this process still holds its cached read
+        CacheVersion.objects.filter(name='catalog').update(version=before + 5)
+        self.assertEqual(catalog.version(fresh=True), before + 5)
+        cache.clear()
+        self.assertEqual(catalog.version(), before + 5)
+
+
+class SnapshotTests(AdvisingTestCase):
+    def test_follows_changes_made_by_other_processes(self):
+        course = make_course('CSE100', capacity=40)
+        self.assertEqual(snapshot.current().capacities[0], 40)
+
+        # As another worker would: a write this process gets no signal for
+        Course.objects.filter(pk=course.pk).update(capacity=10)
+        CacheVersion.objects.filter(name='catalog').update(version=catalog.version() + 1)
+        cache.clear()
+        current = snapshot.current()
+        self.assertEqual(current.version[1], catalog.version())
+        self.assertEqual(current.capacities[0], 10)
+
+
+class BulkPlanTests(AdvisingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_user('admin', password='pw', is_staff=True)
+
+    def upload(self, text):
+        return bulk_courses.plan_upload(io.BytesIO(text.encode()))
+
+    def test_upload_survives_a_trip_through_the_database(self):
+        existing = make_course('CSE100', capacity=40)
+        plan = self.upload(
+            "code,section,title,credit,department,capacity,day,start_time,end_time\n"
+            "CSE100,1,,,,30,Tue,11:00,12:30\n"
+            "CSE200,1,Algorithms,3,CSE,35,Wed,14:00,15:30\n"
+        )
+        self.assertEqual(plan['errors'], [])
+        token = bulk_courses.save_plan(plan, self.admin)
+
+        # The confirming request may reach a worker with an empty cache
+        cache.clear()
+        loaded = bulk_courses.load_plan(token, self.admin)
+        self.assertEqual(loaded['create'][0]['start_time'], datetime.time(14))
+        self.assertEqual(loaded['update'][0]['changes']['end_time'], [datetime.time(10), datetime.time(12, 30)])
+        self.assertEqual(bulk_courses.apply(loaded), {'created': 1, 'updated': 1, 'deleted': 0})
+
+        existing.refresh_from_db()
+        self.assertEqual((existing.capacity, existing.day, existing.start_time), (30, 'Tue', datetime.time(11)))
+        self.assertTrue(Course.objects.filter(code='CSE200', end_time=datetime.time(15, 30)).exists())
+
+    def test_plans_belong_to_their_author(self):
+        token = bulk_courses.save_plan(bulk_courses.plan_delete([]), self.admin)
+        other = User.objects.create_user('other', password='pw', is_staff=True)
+        self.assertIsNone(bulk_courses.load_plan(token, other))
+        bulk_courses.discard_plan(token)
+        self.assertIsNone(bulk_courses.load_plan(token, self.admin))
+
+    def test_clashing_upload_is_refused(self):
+        make_course('CSE100', day='Mon', hour=9)
+        plan = self.upload("code,section,title,credit,department,room,day,start_time,end_time\nCSE300,1,X,3,CSE,R1,Mon,09:30,10:30\n")
+        self.assertEqual(len(plan['errors']), 1)
+        with self.assertRaises(ValueError):
+            bulk_courses.apply(plan)
+
+    def test_deleted_section_stops_the_apply(self):
+        course = make_course('CSE100')
+        plan = bulk_courses.plan_edits({course.id: {'capacity': '10'}})
+        # Removed without a catalog bump, e.g. by a raw cleanup
+        Course.objects.filter(pk=course.pk)._raw_delete(Course.objects.db)
+        with self.assertRaisesMessage(ValueError, 'CSE100 Sec 1 no longer exists'):
+            bulk_courses.apply(plan)
+
+    def test_deletes_bump_the_catalog_once(self):
+        courses = [make_course(f'CSE{100 + i}', hour=8 + i % 10, section=str(i)) for i in range(20)]
+        plan = bulk_courses.plan_delete([course.id for course in courses])
+        before = catalog.version()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(bulk_courses.apply(plan)['deleted'], 20)
+        self.assertEqual(catalog.version(), before + 1)
+        # The fresh version check, then one bump (UPDATE and read back)
+        self.assertEqual(sum('advising_app_cacheversion' in q['sql'] for q in queries.captured_queries), 3)
+        self.assertEqual(sum(q['sql'].startswith('DELETE FROM "advising_app_course"') for q in queries.captured_queries), 1)
+        self.assertFalse(Course.objects.exists())
+
+    def test_catalog_change_after_preview_is_refused(self):
+        course = make_course('CSE100')
+        plan = bulk_courses.plan_edits({course.id: {'capacity': '10'}})
+        make_course('CSE200')
+        with self.assertRaisesMessage(ValueError, 'Sections changed'):
+            bulk_courses.apply(plan)
+
+
+class CartTests(AdvisingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = make_student()
+        self.client.force_login(self.student.user)
+        # Rate limits and registration slots have their own checks
+        patcher = mock.patch.dict(admission._config, ENABLED=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.courses = [make_course(f'CSE10{i}', hour=9 + i) for i in range(3)]
+
+    def post(self, body):
+        return self.client.post(reverse('advising_cart'), body, content_type='application/json')
+
+    def test_adds_and_drops_in_one_request(self):
+        Enrollment.objects.create(student=self.student, course=self.courses[0])
+        response = self.post({'add': [self.courses[1].id, self.courses[2].id], 'drop': [self.courses[0].id]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['added'], ['CSE101', 'CSE102'])
+        self.assertEqual(
+            set(self.student.enrollments.values_list('course__code', flat=True)), {'CSE101', 'CSE102'},
+        )
+
+    def test_rejects_bodies_that_are_not_objects(self):
+        for body in ('[1, 2]', '"add"', '5', '{"add": 5}', '{"add": "12"}', 'not json'):
+            with self.subTest(body=body):
+                response = self.post(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['ok'])
+        self.assertFalse(self.student.enrollments.exists())
+
+    def test_invalid_batch_writes_nothing(self):
+        clash = make_course('CSE200', hour=9)
+        response = self.post({'add': [self.courses[0].id, clash.id]})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.student.enrollments.exists())
+
+    def test_locked_database_asks_to_try_again(self):
+        with mock.patch.object(Enrollment.objects, 'bulk_create', side_effect=OperationalError('database is locked')):
+            result = apply_changes(self.student, [self.courses[0].id])
+        self.assertEqual(result.errors, ["Registration is busy right now and nothing was saved. Please try again."])
+        self.assertFalse(self.student.enrollments.exists())
+
+
+class AdmissionTests(AdvisingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = make_student()
+        self.client.force_login(self.student.user)
+        self.course = make_course('CSE100')
+
+    def post(self):
+        return self.client.post(reverse('advising_cart'), {'add': [self.course.id]}, content_type='application/json')
+
+    def test_exhausted_bucket_is_rate_limited(self):
+        for _ in range(admission._config['BURST']):
+            self.assertTrue(admission.take_token(self.student.user_id))
+        response = self.post()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertFalse(self.student.enrollments.exists())
+
+    def test_bucket_refills_in_the_next_window(self):
+        config = dict(admission._config, RATE=1.0, BURST=2)
+        start = 1000.0
+        self.assertEqual([admission.take_token(1, config, start) for _ in range(3)], [True, True, False])
+        self.assertTrue(admission.take_token(1, config, start + 2))
+
+    def test_concurrent_requests_share_the_last_token(self):
+        config = dict(admission._config, RATE=1.0, BURST=5)
+        barrier = threading.Barrier(20)
+        results = []
+
+        def take():
+            barrier.wait()
+            results.append(admission.take_token(2, config, 1000.0))
+
+        threads = [threading.Thread(target=take) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(True), 5)
+
+    def test_full_write_slots_are_overloaded(self):
+        slots = threading.BoundedSemaphore(1)
+        slots.acquire()
+        with mock.patch.object(admission, '_write_slots', slots), mock.patch.dict(admission._config, ACQUIRE_TIMEOUT=0):
+            response = self.post()
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(self.student.enrollments.exists())
+
+
+class JobQueueTests(AdvisingTestCase):
+    def setUp(self):
+        super().setUp()
+        # Workers close stale connections between jobs, which would end the
+        # test's transaction
+        patcher = mock.patch.object(tasks, 'close_old_connections')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.advisor = make_faculty()
+        self.students = [make_student(f's{i}', f'2025010{i}') for i in range(3)]
+
+    def assign(self, students):
+        return tasks.enqueue('assign_advisor', advisor_id=self.advisor.id, student_ids=[s.id for s in students])
+
+    def test_worker_runs_queued_jobs(self):
+        job = self.assign(self.students)
+        self.assertEqual(tasks.work(once=True), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress, job.total), ('Done', 3, 3))
+        self.assertEqual(self.advisor.advisees.count(), 3)
+
+    def test_advisee_limit_is_checked_when_the_job_runs(self):
+        job = self.assign(self.students)
+        # Filled up after the job was queued
+        others = [make_student(f'o{i}', f'2025020{i}') for i in range(tasks.ADVISEE_LIMIT - 1)]
+        Student.objects.filter(id__in=[s.id for s in others]).update(advisor=self.advisor)
+
+        tasks.work(once=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'Pending')
+        self.assertIn('Advisor limit', job.result)
+        self.assertEqual(self.advisor.advisees.count(), tasks.ADVISEE_LIMIT - 1)
+
+    def test_failed_jobs_retry_then_fail(self):
+        job = tasks.enqueue('assign_advisor', max_attempts=2, advisor_id=0, student_ids=[])
+        tasks.work(once=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('Pending', 1))
+        self.assertGreater(job.run_after, timezone.now())
+
+        Job.objects.filter(id=job.id).update(run_after=None)
+        tasks.work(once=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('Failed', 2))
+
+    def test_jobs_of_dead_workers_are_requeued(self):
+        job = self.assign(self.students)
+        stale = timezone.now() - datetime.timedelta(seconds=tasks.STALE_AFTER + 1)
+        Job.objects.filter(id=job.id).update(
+            status='Running', worker='gone:1', started_at=stale, heartbeat_at=stale, attempts=1,
+        )
+        self.assertEqual(tasks.work(once=True), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('Done', 2))
+
+    def test_long_jobs_that_report_progress_are_not_requeued(self):
+        job = self.assign(self.students)
+        stale = timezone.now() - datetime.timedelta(seconds=tasks.STALE_AFTER + 1)
+        Job.objects.filter(id=job.id).update(status='Running', worker='busy:1', started_at=stale, attempts=1)
+        tasks.report_progress(job, 1, 3)
+        self.assertEqual(tasks.requeue_stale(), 0)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker), ('Running', 'busy:1'))
+
+    def test_jobs_that_keep_killing_their_worker_fail(self):
+        job = self.assign(self.students)
+        stale = timezone.now() - datetime.timedelta(seconds=tasks.STALE_AFTER + 1)
+        Job.objects.filter(id=job.id).update(status='Running', heartbeat_at=stale, attempts=job.max_attempts)
+        self.assertEqual(tasks.requeue_stale(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'Failed')
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(tasks.work(once=True), 0)
+
+    def test_idle_workers_consume_enrollment_events(self):
+        course = make_course('CSE100')
+        apply_changes(self.students[0], [course.id])
+        self.assertTrue(EnrollmentEvent.objects.exists())
+        tasks.work(once=True)
+        self.assertEqual(events.lag(), dict.fromkeys(events.CONSUMERS, 0))
+        self.students[0].refresh_from_db()
+        self.assertEqual(self.students[0].current_balance, 3 * 6000)
+
+    def test_assign_view_ignores_malformed_ids(self):
+        admin = User.objects.create_user('admin', password='pw', is_staff=True)
+        self.client.force_login(admin)
+        response = self.client.post(
+            reverse('admin_assign_advisor') + '?department=CSE',
+            {'advisor_id': self.advisor.id, 'student_ids': [self.students[0].id, 'x', '']},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Job.objects.get().payload['student_ids'], [self.students[0].id])
+
+
+class SchedulingTests(AdvisingTestCase):
+    def test_describes_unsaved_sections_with_string_times(self):
+        saved = make_course('CSE100', hour=9)
+        saved.room = 'R1'
+        new = Course(id=-1, code='CSE200', section='1', day='Mon', room='r1')
+        conflicts = scheduling.Timetable([scheduling.section_of(new)]).conflicts(scheduling.section_of(saved))
+        self.assertEqual(
+            [scheduling.describe(c) for c in conflicts],
+            ["CSE100 Sec 1 and CSE200 Sec 1 share room R1 on Mon (09:00-10:30)"],
+        )
+
+    def test_manage_courses_rejects_unknown_days(self):
+        admin = User.objects.create_user('admin', password='pw', is_staff=True)
+        self.client.force_login(admin)
+        response = self.client.post(
+            reverse('manage_courses'),
+            {'code': 'CSE100', 'title': 'Intro', 'credit': '3', 'department': 'CSE', 'day': 'Someday'},
+            follow=True,
+        )
+        self.assertContains(response, "Invalid schedule.")
+        self.assertFalse(Course.objects.exists())
+
+
+class ExportTests(AdvisingTestCase):
+    def test_filenames_are_escaped(self):
+        response = exports.csv_response('Genie "Civil"\r\nX: 1.csv', ['A'], [['1']])
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="Genie \\"Civil\\"X: 1.csv"')
+        response = exports.csv_response('Génie.csv', ['A'], [])
+        self.assertEqual(response['Content-Disposition'], "attachment; filename*=utf-8''G%C3%A9nie.csv")
+
+
+class CapacityBatchTests(AdvisingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.faculty = make_faculty()
+        self.client.force_login(self.faculty.user)
+        self.courses = [make_course(f'CSE10{i}', hour=9 + i, assigned_faculty=self.faculty) for i in range(2)]
+
+    def post(self, capacities):
+        response = self.client.post(
+            reverse('update_course_capacities'), {f'capacity_{c.id}': value for c, value in capacities.items()},
+        )
+        self.assertRedirects(response, reverse('faculty_dashboard'), fetch_redirect_response=False)
+        return [(m.level_tag, m.message) for m in get_messages(response.wsgi_request)]
+
+    def test_saves_a_valid_batch(self):
+        before = catalog.version()
+        notes = self.post({self.courses[0]: 30, self.courses[1]: 50})
+        self.assertEqual(notes, [('success', "Updated capacity for 2 section(s).")])
+        self.assertEqual(sorted(Course.objects.values_list('capacity', flat=True)), [30, 50])
+        self.assertGreater(catalog.version(fresh=True), before)
+
+    def test_capacity_below_enrollment_is_saved_with_a_warning(self):
+        for i in range(3):
+            Enrollment.objects.create(student=make_student(f's{i}', f'2025010{i}'), course=self.courses[0])
+        notes = self.post({self.courses[0]: 2})
+        self.assertEqual(notes, [
+            ('warning', "CSE100 Sec 1: capacity 2 is below the 3 students already enrolled."),
+            ('success', "Updated capacity for 1 section(s)."),
+        ])
+        self.courses[0].refresh_from_db()
+        self.assertEqual(self.courses[0].capacity, 2)
+
+    def test_other_instructors_sections_change_nothing(self):
+        other = make_course('CSE200', assigned_faculty=make_faculty('other', 'F2002'))
+        notes = self.post({self.courses[0]: 10, other: 10})
+        self.assertEqual(notes, [('error', "You can only update your own courses.")])
+        self.assertEqual(set(Course.objects.values_list('capacity', flat=True)), {40})
+
+
+class AdvisorOverrideTests(AdvisingTestCase):
+    def test_override_records_the_rules_it_bypassed(self):
+        advisor = make_faculty()
+        student = make_student()
+        full = make_course('CSE100', capacity=0)
+        result = apply_changes(student, [full.id], actor=advisor.user, override=True)
+        self.assertEqual(result.errors, [])
+        self.assertEqual(result.overridden, ["Course CSE100 is full."])
+
+        event = EnrollmentEvent.objects.get(kind=EnrollmentEvent.ADD)
+        self.assertEqual((event.override, event.overridden, event.actor_id), (True, ["Course CSE100 is full."], advisor.user.id))
+
+    def test_plain_adds_record_no_override(self):
+        student = make_student()
+        apply_changes(student, [make_course('CSE100').id], actor=student.user)
+        event = EnrollmentEvent.objects.get(kind=EnrollmentEvent.ADD)
+        self.assertEqual((event.override, event.overridden), (False, []))
+
+
+class ConcurrentCartTests(TransactionTestCase):
+    # Threads need committed rows; the flush would also lose the rows the
+    # migrations create (the current term and cache versions)
+    serialized_rollback = True
+
+    def setUp(self):
+        cache.clear()
+
+    def run_together(self, work, n):
+        """Runs work(i) for i in range(n) on n threads at once; returns their results."""
+        results = [None] * n
+        barrier = threading.Barrier(n)
+
+        def run(i):
+            try:
+                barrier.wait()
+                results[i] = work(i)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_students_saving_at_once_do_not_fail(self):
+        students = [make_student(f's{i}', f'2025010{i}') for i in range(8)]
+        courses = [make_course(f'CSE10{i}', hour=8 + i) for i in range(4)]
+
+        def add_all(i):
+            return [apply_changes(students[i], [course.id]).errors for course in courses]
+
+        results = self.run_together(add_all, len(students))
+        self.assertEqual(results, [[[]] * len(courses)] * len(students))
+        self.assertEqual(Enrollment.objects.count(), len(students) * len(courses))
+
+    def test_last_seats_are_not_oversold(self):
+        students = [make_student(f's{i}', f'2025010{i}') for i in range(8)]
+        course = make_course('CSE100', capacity=3)
+        results = self.run_together(lambda i: apply_changes(students[i], [course.id]).errors, len(students))
+        self.assertEqual(sorted(results, key=len), [[]] * 3 + [["Course CSE100 is full."]] * 5)
+        self.assertEqual(Enrollment.objects.filter(course=course).count(), 3)
+
+
+class SubmitRequestTests(AdvisingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = make_student()
+        self.course = make_course('CSE100')
+
+    def test_second_pending_request_is_a_warning(self):
+        first, result = submit_request(self.student, [self.course.id])
+        self.assertIsNotNone(first)
+        second, result = submit_request(self.student, [self.course.id])
+        self.assertIsNone(second)
+        self.assertEqual((result.errors, result.warnings), ([], ["You already have a pending request."]))
+
+    def test_other_integrity_errors_are_not_reported_as_pending(self):
+        with mock.patch.object(PreferredCourse.objects, 'bulk_create', side_effect=IntegrityError('FOREIGN KEY')):
+            advising_request, result = submit_request(self.student, [self.course.id])
+        self.assertIsNone(advising_request)
+        self.assertEqual(result.errors, ["Your request could not be saved. Please try again."])
+        self.assertFalse(AdvisingRequest.objects.exists())
+
+
+class RolloverTests(AdvisingTestCase):
+    def test_courses_from_earlier_terms_cannot_be_retaken(self):
+        student = make_student()
+        apply_changes(student, [make_course('CSE101').id, make_course('CSE102', hour=11).id])
+        with self.captureOnCommitCallbacks(execute=True):
+            terms.rollover('Next', copy_sections=True)
+
+        copy = Course.objects.current().get(code='CSE101')
+        result = apply_changes(student, [copy.id])
+        self.assertEqual(result.errors, ["You have already taken CSE101. You cannot retake the same course."])
+
+        snap, items = classification.classify(student)
+        statuses = {snap.codes[item['position']]: item['status'] for item in items}
+        self.assertEqual(statuses, {'CSE101': 'Taken', 'CSE102': 'Taken'})
+
+
+class SearchTests(AdvisingTestCase):
+    def setUp(self):
+        super().setUp()
+        make_course('CSE101', title='Data Structures', day='Mon', hour=9)
+        make_course('CSE201', title='Databases', day='Tue', hour=14)
+        self.full = make_course('MAT101', title='Calculus', day='Mon', hour=18, capacity=1, department='MAT')
+        Enrollment.objects.create(student=make_student(), course=self.full)
+
+    def codes(self, **filters):
+        return [row['code'] for row in search.search(**filters)['results']]
+
+    def test_prefixes_of_codes_and_title_words(self):
+        self.assertEqual(self.codes(query='cse'), ['CSE101', 'CSE201'])
+        self.assertEqual(self.codes(query='cse2'), ['CSE201'])
+        self.assertEqual(self.codes(query='data'), ['CSE101', 'CSE201'])
+        self.assertEqual(self.codes(query='data struct'), ['CSE101'])
+        self.assertEqual(self.codes(query='physics'), [])
+
+    def test_filters_and_facets(self):
+        self.assertEqual(self.codes(band='afternoon'), ['CSE201'])
+        self.assertEqual(self.codes(day='Mon'), ['CSE101', 'MAT101'])
+        self.assertEqual(self.codes(open_only=True), ['CSE101', 'CSE201'])
+
+        result = search.search(department='CSE')
+        self.assertEqual(result['total'], 2)
+        # Each facet is counted under the other filters only
+        self.assertEqual(result['facets']['department'], [('CSE', 2), ('MAT', 1)])
+        self.assertEqual(result['facets']['day'], [('Mon', 1), ('Tue', 1)])
+        self.assertEqual(result['facets']['open'], 2)
+
+    def test_pages(self):
+        result = search.search(per_page=2, page=2)
+        self.assertEqual((result['pages'], [row['code'] for row in result['results']]), (2, ['MAT101']))
+        self.assertEqual(result['results'][0]['seats_left'], 0)
+
+    def test_index_follows_catalog_changes(self):
+        self.assertEqual(self.codes(query='algo'), [])
+        make_course('CSE301', title='Algorithms')
+        self.assertEqual(self.codes(query='algo'), ['CSE301'])
+
+
+class PrerequisiteTests(AdvisingTestCase):
+    def test_closure_follows_chains_and_cycles(self):
+        graph = prerequisites.PrerequisiteGraph([('B', 'A'), ('C', 'B'), ('D', 'C'), ('X', 'Y'), ('Y', 'X')])
+        self.assertEqual(graph.codes_of(graph.closure['D']), ['A', 'B', 'C'])
+        self.assertEqual(graph.codes_of(graph.closure['X']), ['X', 'Y'])
+        # Completing C counts as completing what it required
+        completed = graph.completed_mask(['C'])
+        self.assertEqual(graph.codes_of(completed), ['A', 'B', 'C'])
+        self.assertEqual(graph.missing('B', completed), 0)
+        self.assertEqual(graph.codes_of(graph.missing('D', graph.completed_mask(['B']))), ['C'])
+
+    def test_eligibility_uses_earlier_terms(self):
+        student = make_student()
+        old_term = Term.objects.create(name='Old')
+        Enrollment.objects.create(student=student, course=make_course('CSE101', term=old_term))
+        Prerequisite.objects.create(course_code='CSE201', requires_code='CSE101')
+        Prerequisite.objects.create(course_code='CSE301', requires_code='CSE201')
+
+        self.assertEqual(
+            prerequisites.eligibility(student, ['CSE201', 'CSE301', 'CSE999']),
+            {'CSE201': [], 'CSE301': ['CSE201'], 'CSE999': []},
+        )
+        locked = make_course('CSE301')
+        result = apply_changes(student, [locked.id])
+        self.assertEqual(result.errors, ["Cannot enroll in CSE301. Missing prerequisites: CSE201"])
+
+    def test_loader_counts_only_new_rows(self):
+        Prerequisite.objects.create(course_code='CSE201', requires_code='CSE101')
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write('course,requires\nCSE201,CSE101\nCSE301,CSE201\n')
+        self.addCleanup(os.remove, f.name)
+        out = io.StringIO()
+        call_command('load_prerequisites', f.name, stdout=out)
+        self.assertIn("Loaded 1 new prerequisites", out.getvalue())
+        self.assertEqual(Prerequisite.objects.count(), 2)
+
+        call_command('load_prerequisites', f.name, '--replace', stdout=out)
+        self.assertIn("Loaded 2 new prerequisites", out.getvalue())
+
+
+class RoleTests(AdvisingTestCase):
+    def test_cached_role_loads_profiles_only_when_used(self):
+        student = make_student()
+        roles.resolve(User.objects.get(pk=student.user_id))
+        user = User.objects.get(pk=student.user_id)
+        with self.assertNumQueries(0):
+            role, lazy_student, faculty = roles.resolve(user)
+            self.assertEqual(role, roles.STUDENT)
+            self.assertIsNone(faculty)
+            self.assertFalse(hasattr(user, 'faculty'))
+        # The profile and the user's reverse accessor share one query
+        with self.assertNumQueries(1):
+            self.assertEqual(lazy_student.student_id, student.student_id)
+            self.assertEqual(user.student.pk, student.pk)
+
+    def test_requests_that_only_need_the_role_skip_the_profile(self):
+        student = make_student()
+        self.client.force_login(student.user)
+        self.client.get(reverse('landing_page'))
+        # The session and the user
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('landing_page'))
+        self.assertRedirects(response, reverse('student_dashboard'), fetch_redirect_response=False)
+
+
+class RouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = db_router.PrimaryReplicaRouter()
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_reads_use_the_replica_only_when_opted_in(self):
+        self.assertEqual(self.router.db_for_read(Course), 'default')
+        with db_router.read_from_replica():
+            self.assertEqual(self.router.db_for_read(Course), 'replica')
+            with db_router.pin_primary():
+                self.assertEqual(self.router.db_for_read(Course), 'default')
+        self.assertEqual(self.router.db_for_read(Course), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_reads_fall_back_to_default_without_a_replica(self):
+        with db_router.read_from_replica():
+            self.assertEqual(self.router.db_for_read(Course), 'default')
+        view = db_router.replica_reads(lambda request: self.router.db_for_read(Course))
+        self.assertEqual(view(None), 'default')
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_writes_always_go_to_default(self):
+        self.assertEqual(self.router.db_for_write(Course), 'default')
+        with db_router.read_from_replica():
+            self.assertEqual(self.router.db_for_write(Course), 'default')
+        view = db_router.replica_reads(lambda request: self.router.db_for_write(Enrollment))
+        self.assertEqual(view(None), 'default')
+
+
+class PasswordTests(AdvisingTestCase):
+    @override_settings(PASSWORD_HASHERS=[settings.PASSWORD_PROFILES['scrypt'], settings.PASSWORD_PROFILES['pbkdf2']])
+    def test_old_hashes_are_upgraded_on_login(self):
+        user = User.objects.create(username='old', password=make_password('pw', hasher='pbkdf2_sha256'))
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+        self.assertIsNone(authenticate(username='old', password='wrong'))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+
+        self.assertEqual(authenticate(username='old', password='pw'), user)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$'))
+        self.assertEqual(authenticate(username='old', password='pw'), user)
+
+
+class StatsTests(AdvisingTestCase):
+    FIELDS = ['sections', 'seats', 'enrolled', 'students', 'unassigned_students', 'pending_requests']
+
+    def setUp(self):
+        super().setUp()
+        self.students = [make_student(f's{i}', f'2025010{i}') for i in range(3)]
+        self.courses = [make_course('CSE100', credit=3), make_course('EEE100', credit=4, hour=11, department='EEE')]
+        stats.refresh_all()
+
+    def materialized(self):
+        departments = {row.department: [getattr(row, f) for f in self.FIELDS] for row in DepartmentStats.objects.all()}
+        loads = dict(CreditLoadStats.objects.filter(students__gt=0).values_list('credits', 'students'))
+        return departments, loads
+
+    def live(self):
+        departments = {row.department: [getattr(row, f) for f in self.FIELDS] for row in stats._department_rows()}
+        loads = Counter(stats.student_credits(student) for student in Student.objects.all())
+        return departments, dict(loads)
+
+    def test_materialized_stats_follow_adds_and_drops(self):
+        self.assertEqual(self.materialized(), self.live())
+        for student in self.students[:2]:
+            self.assertTrue(apply_changes(student, [c.id for c in self.courses]).ok)
+        events.consume_all()
+        self.assertEqual(self.materialized(), self.live())
+        self.assertEqual(self.materialized()[1], {0.0: 1, 7.0: 2})
+
+        self.assertTrue(apply_changes(self.students[0], drop_ids=[self.courses[1].id]).ok)
+        events.consume_all()
+        self.assertEqual(self.materialized(), self.live())
+        self.assertEqual(self.materialized()[1], {0.0: 1, 3.0: 1, 7.0: 1})
@@ -15,19 +15,35 @@ urlpatterns = [
     path('faculty/student/<str:student_id>/', views.advisee_detail, name='advisee_detail'),
     path('faculty/student/<str:student_id>/add-drop/', views.advisor_add_drop_course, name='advisor_add_drop_course'),
     path('faculty/course/<int:course_id>/update-capacity/', views.update_course_capacity, name='update_course_capacity'),
+    path('faculty/courses/update-capacity/', views.update_course_capacities, name='update_course_capacities'),
     
     # Student URLs
     path('student/dashboard/', views.student_dashboard, name='student_dashboard'),
     path('student/advising/', views.advising_view, name='advising_view'),
+    path('student/advising/cart/', views.advising_cart, name='advising_cart'),
     path('student/courses/', views.course_list, name='course_list'),
+    path('student/courses/search/', views.course_search, name='course_search'),
     path('student/request/', views.submit_advising_request, name='submit_advising_request'),
     
     # Admin URLs
     path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
     path('admin/courses/', views.manage_courses, name='manage_courses'),
     path('admin/courses/delete/<int:course_id>/', views.delete_course, name='delete_course'),
+    path('admin/courses/upload/', views.upload_courses, name='upload_courses'),
+    path('admin/courses/bulk/', views.bulk_courses_action, name='bulk_courses_action'),
+    path('admin/courses/bulk/edit/', views.bulk_edit_courses, name='bulk_edit_courses'),
+    path('admin/courses/bulk/<str:token>/', views.bulk_course_preview, name='bulk_course_preview'),
     path('admin/requests/', views.manage_requests, name='manage_requests'),
     path('admin/requests/approve/<int:request_id>/', views.approve_request, name='approve_request'),
     path('admin/requests/reject/<int:request_id>/', views.reject_request, name='reject_request'),
+    path('admin/requests/bulk/', views.bulk_update_requests, name='bulk_update_requests'),
     path('admin/assign-advisor/', views.admin_assign_advisor, name='admin_assign_advisor'),
+    path('admin/jobs/', views.job_list, name='job_list'),
+    path('admin/export/enrollments/', views.export_department_enrollments, name='export_department_enrollments'),
+    path('admin/export/advisors/', views.export_advisor_assignments, name='export_advisor_assignments'),
+    path('courses/<int:course_id>/roster.csv', views.export_course_roster, name='export_course_roster'),
+    path('admin/admission/', views.admission_stats, name='admission_stats'),
+    path('admin/profiling/', views.profiling_stats, name='profiling_stats'),
+    path('admin/jobs/recompute-balances/', views.recompute_balances, name='recompute_balances'),
+    path('admin/jobs/refresh-stats/', views.refresh_stats, name='refresh_stats'),
 ]
@@ -0,0 +1,63 @@
+"""
+Shared version counters for cached data.
+
+Caches and per-process structures (catalog fragments, the timetable, the
+search index, the snapshot, the prerequisite graph) are keyed by a version
+that changes whenever their source data does. The counters live in the
+CacheVersion table so a bump from any worker or management command reaches
+every process; the cache only saves the read for VERSION_SECONDS.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from .models import CacheVersion
+
+VERSION_SECONDS = 2
+
+
+def get(name, fresh=False):
+    """The current version of `name`, at most VERSION_SECONDS old unless `fresh`."""
+    key = f'version:{name}'
+    current = None if fresh else cache.get(key)
+    if current is None:
+        current = CacheVersion.objects.values_list('version', flat=True).get(name=name)
+        cache.set(key, current, VERSION_SECONDS)
+    return current
+
+
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred():
+    """
+    Bumps each version at most once, when the block ends, however many rows
+    the block saves or deletes. For bulk changes, where the per-row signal
+    receivers would otherwise bump once per row.
+    """
+    if getattr(_deferred, 'names', None) is not None:
+        yield
+        return
+    _deferred.names = set()
+    try:
+        yield
+    finally:
+        names, _deferred.names = _deferred.names, None
+        for name in sorted(names):
+            bump(name)
+
+
+def bump(name):
+    names = getattr(_deferred, 'names', None)
+    if names is not None:
+        names.add(name)
+        return get(name)
+    CacheVersion.objects.filter(name=name).update(version=F('version') + 1)
+    # Forget it again on commit, so a version read inside the transaction
+    # (here or by another worker sharing the cache) is not kept
+    transaction.on_commit(lambda: cache.delete(f'version:{name}'))
+    return get(name, fresh=True)
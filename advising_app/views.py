@@ -1,21 +1,26 @@
+import datetime
+import json
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from .models import Course, AdvisingRequest, PreferredCourse, Student, Enrollment, Faculty
+from django.http import JsonResponse
+from .models import Course, AdvisingRequest, Student, Enrollment, Faculty, Job, DepartmentStats, CreditLoadStats
 from .forms import StudentRegistrationForm, FacultyRegistrationForm
-from django.db.models import Q, Count, IntegerField
-from django.db.models.functions import Cast
+from . import bulk_courses, catalog, classification, events, exports, profiling, roles, scheduling, search, stats, tasks
+from .enrollment import apply_changes, submit_request
+from .admission import admission_controlled, get_counters, get_config
+from .db_router import replica_reads
+from django.db import transaction
+from django.db.models import Q, Count
 
 # --- Authentication ---
 
 def landing_page(request):
     if request.user.is_authenticated:
-        if request.user.is_staff:
-            return redirect('admin_dashboard')
-        else:
-            return redirect('student_dashboard')
+        return redirect(roles.landing_url_name(request.role))
     return render(request, 'advising_app/landing.html')
 
 def student_login_view(request):
@@ -54,8 +59,9 @@ def faculty_login_view(request):
         form = AuthenticationForm(request, data=request.POST)
         if form.is_valid():
             user = form.get_user()
-            # Check if user has a faculty profile
-            if hasattr(user, 'faculty'):
+            # Check if user has a faculty profile (the role is cached for the requests that follow)
+            _, _, faculty = roles.resolve(user)
+            if faculty is not None:
                 login(request, user)
                 return redirect('faculty_dashboard')
             else:
@@ -79,7 +85,8 @@ def student_register(request):
     if request.method == 'POST':
         form = StudentRegistrationForm(request.POST)
         if form.is_valid():
-            form.save()
+            user = form.save()
+            stats.student_added(user.student)
             messages.success(request, "Registration successful. Please login.")
             return redirect('student_login')
     else:
@@ -100,19 +107,20 @@ def student_dashboard(request):
     if request.user.is_staff:
         return redirect('admin_dashboard')
     
-    try:
-        student = request.user.student
-        enrollments = student.enrollments.all().select_related('course')
+    student = request.student
+    if student is not None:
+        enrollments = student.enrollments.current().select_related('course')
         # Calculate total credit and payable amount (6000 per credit)
         total_credit = sum(e.course.credit for e in enrollments)
         payable_amount = total_credit * 6000
         
-        # Update student balance (simple logic for demo)
-        student.current_balance = payable_amount
-        student.save()
+        # Update student balance (simple logic for demo). Only the balance is
+        # written, so concurrent changes to other fields are not reverted.
+        if student.current_balance != payable_amount:
+            student.current_balance = payable_amount
+            student.save(update_fields=['current_balance'])
         
-    except Student.DoesNotExist:
-        student = None
+    else:
         enrollments = []
         payable_amount = 0
         
@@ -123,14 +131,14 @@ def student_dashboard(request):
     })
 
 @login_required
+@admission_controlled
 def advising_view(request):
     """
     Handles the student advising process, including course selection,
     conflict detection (time, credit limit), and enrollment.
     """
-    try:
-        student = request.user.student
-    except Student.DoesNotExist:
+    student = request.student
+    if student is None:
         messages.error(request, "Student profile not found.")
         return redirect('student_dashboard')
 
@@ -140,95 +148,26 @@ def advising_view(request):
         course = get_object_or_404(Course, id=course_id)
         
         if action == 'drop':
-            enrollment = Enrollment.objects.filter(student=student, course=course).first()
-            if enrollment:
-                enrollment.delete()
+            result = apply_changes(student, drop_ids=[course.id], actor=request.user)
+            if result.dropped:
                 messages.success(request, f"Successfully dropped {course.code}")
-            else:
-                messages.error(request, f"Not enrolled in {course.code}")
-            return redirect('advising_view')
-
-        # Default to 'add' logic
-        # Check if already enrolled in this specific section
-        if Enrollment.objects.filter(student=student, course=course).exists():
-            messages.warning(request, f"Already enrolled in {course.code}")
-            return redirect('advising_view')
-
-        # Check if already enrolled in any section of this course code
-        if Enrollment.objects.filter(student=student, course__code=course.code).exists():
-            messages.error(request, f"You have already taken {course.code}. You cannot retake the same course.")
-            return redirect('advising_view')
-
-        # Check credit limit
-        current_enrollments = Enrollment.objects.filter(student=student)
-        current_credits = sum(e.course.credit for e in current_enrollments)
-        if current_credits + course.credit > 15:
-            messages.error(request, f"Cannot enroll. Total credits would exceed 15. Current: {current_credits}, Course: {course.credit}")
-            return redirect('advising_view')
-            
-        # Check for time clash
-        clashing_enrollment = Enrollment.objects.filter(
-            student=student,
-            course__day=course.day,
-            course__start_time__lt=course.end_time,
-            course__end_time__gt=course.start_time
-        ).first()
-        
-        if clashing_enrollment:
-            messages.error(request, f"Time clash with {clashing_enrollment.course.code} ({clashing_enrollment.course.day} {clashing_enrollment.course.start_time})")
-            return redirect('advising_view')
-
-        # Check capacity
-        current_count = Enrollment.objects.filter(course=course).count()
-        if current_count >= course.capacity:
-            messages.error(request, f"Course {course.code} is full.")
-            return redirect('advising_view')
-            
-        # Enroll
-        Enrollment.objects.create(student=student, course=course)
-        messages.success(request, f"Successfully enrolled in {course.code}")
+        else:
+            # Default to 'add' logic; all rules are checked by the shared validator
+            result = apply_changes(student, add_ids=[course.id], actor=request.user)
+            if result.added:
+                messages.success(request, f"Successfully enrolled in {course.code}")
+        _report_cart_problems(request, result)
         return redirect('advising_view')
 
-    # Get all courses with enrollment count, ordered by code and section (numerically)
-    all_courses = Course.objects.annotate(
-        enrolled_count=Count('enrollment'),
-        section_int=Cast('section', IntegerField())
-    ).order_by('code', 'section_int')
-    
-    # Get enrolled course IDs and Codes
-    enrolled_courses = Enrollment.objects.filter(student=student)
-    enrolled_course_ids = enrolled_courses.values_list('course_id', flat=True)
-    enrolled_course_codes = enrolled_courses.values_list('course__code', flat=True)
-    
-    # Prepare course list with status (Enrolled, Clash, Available)
-    courses_with_status = []
-    for course in all_courses:
-        status = 'Available'
-        if course.id in enrolled_course_ids:
-            status = 'Enrolled'
-        elif course.code in enrolled_course_codes:
-            status = 'Taken'
-        elif course.enrolled_count >= course.capacity:
-            status = 'Full'
-        else:
-            # Check for clash
-            is_clash = Enrollment.objects.filter(
-                student=student,
-                course__day=course.day,
-                course__start_time__lt=course.end_time,
-                course__end_time__gt=course.start_time
-            ).exists()
-            if is_clash:
-                status = 'Clash'
-        
-        courses_with_status.append({
-            'course': course,
-            'status': status,
-            'enrolled_count': course.enrolled_count
-        })
-        
+    # Prepare course list with status (Enrolled, Taken, Locked, Full, Clash, Available)
+    snap, courses_with_status = classification.classify(student)
+    cells = _catalog_cells(snap)
+    for item in courses_with_status:
+        item['cells'] = cells[item['id']]
+
     # Calculate totals for display
-    total_credits = sum(e.course.credit for e in Enrollment.objects.filter(student=student))
+    enrolled_courses = Enrollment.objects.current().filter(student=student).select_related('course')
+    total_credits = sum(e.course.credit for e in enrolled_courses)
     total_cost = total_credits * 6000
 
     return render(request, 'advising_app/student/advising.html', {
@@ -237,66 +176,144 @@ def advising_view(request):
         'total_cost': total_cost
     })
 
+def _catalog_cells(snap):
+    """Rendered catalog cells for every section of the snapshot."""
+    cells = catalog.cached_cells()
+    missing = [snap.record(i) for i in range(len(snap)) if snap.ids[i] not in cells]
+    if missing:
+        cells = catalog.course_cells(missing)
+    return cells
+
+def _report_cart_problems(request, result):
+    for warning in result.warnings:
+        messages.warning(request, warning)
+    for error in result.errors:
+        messages.error(request, error)
+
+@login_required
+@admission_controlled
+def advising_cart(request):
+    """
+    Applies several adds and drops in one request. Accepts either form data
+    (`add` / `drop` lists) or a JSON body {"add": [...], "drop": [...]}.
+    """
+    is_json = request.content_type == 'application/json'
+    if request.method != 'POST':
+        return redirect('advising_view')
+
+    student = request.student
+    if student is None:
+        if is_json:
+            return JsonResponse({'ok': False, 'errors': ["Student profile not found."]}, status=404)
+        messages.error(request, "Student profile not found.")
+        return redirect('student_dashboard')
+
+    if is_json:
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'ok': False, 'errors': ["Invalid JSON body."]}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({'ok': False, 'errors': ["The body must be a JSON object."]}, status=400)
+        add_ids = data.get('add', [])
+        drop_ids = data.get('drop', [])
+        if not isinstance(add_ids, list) or not isinstance(drop_ids, list):
+            return JsonResponse({'ok': False, 'errors': ["add and drop must be lists of section ids."]}, status=400)
+    else:
+        add_ids = request.POST.getlist('add')
+        drop_ids = request.POST.getlist('drop')
+
+    result = apply_changes(student, add_ids, drop_ids, actor=request.user)
+    if is_json:
+        return JsonResponse(result.as_dict(), status=200 if result.ok else 400)
+
+    if result.added or result.dropped:
+        changes = [f"added {c.code}" for c in result.added] + [f"dropped {c.code}" for c in result.dropped]
+        messages.success(request, "Schedule updated: " + ", ".join(changes))
+    _report_cart_problems(request, result)
+    return redirect('advising_view')
+
 @login_required
+@replica_reads
 def course_list(request):
-    courses = Course.objects.all()
-    return render(request, 'advising_app/student/course_list.html', {'courses': courses})
+    result = _search(request)
+    params = request.GET.copy()
+    params.pop('page', None)
+    return render(request, 'advising_app/student/course_list.html', {
+        'result': result,
+        'courses': result['results'],
+        'params': params.urlencode(),
+    })
+
+@login_required
+@replica_reads
+def course_search(request):
+    return JsonResponse(_search(request))
+
+def _search(request):
+    try:
+        page = int(request.GET.get('page', 1))
+        per_page = min(int(request.GET.get('per_page', search.PER_PAGE)), 100)
+    except ValueError:
+        page, per_page = 1, search.PER_PAGE
+    return search.search(
+        query=request.GET.get('q', '').strip(),
+        department=request.GET.get('department') or None,
+        day=request.GET.get('day') or None,
+        band=request.GET.get('band') or None,
+        open_only=request.GET.get('open') == '1',
+        page=page,
+        per_page=max(1, per_page),
+    )
 
 @login_required
+@admission_controlled
 def submit_advising_request(request):
     if request.method == 'POST':
-        selected_course_ids = request.POST.getlist('courses')
-        if not selected_course_ids:
-            messages.error(request, "Please select at least one course.")
-            return redirect('submit_advising_request')
-        
-        # Check credit limit
-        selected_courses = Course.objects.filter(id__in=selected_course_ids)
-        total_credits = sum(c.credit for c in selected_courses)
-        if total_credits > 15:
-             messages.error(request, f"Cannot submit request. Total credits exceed 15. Selected: {total_credits}")
-             return redirect('submit_advising_request')
-        
-        try:
-            student = request.user.student
-        except Student.DoesNotExist:
+        student = request.student
+        if student is None:
              messages.error(request, "Student profile not found.")
              return redirect('student_dashboard')
 
-        # Check if pending request exists
-        if AdvisingRequest.objects.filter(student=student, status='Pending').exists():
-            messages.warning(request, "You already have a pending request.")
-            return redirect('student_dashboard')
+        advising_request, result = submit_request(student, request.POST.getlist('courses'))
+        if advising_request is None:
+            for warning in result.warnings:
+                messages.warning(request, warning)
+            for error in result.errors:
+                messages.error(request, error)
+            return redirect('student_dashboard' if result.warnings else 'submit_advising_request')
+        stats.request_changed(student.department, 1)
 
-        advising_request = AdvisingRequest.objects.create(student=student)
-        
-        for priority, course_id in enumerate(selected_course_ids, start=1):
-            course = get_object_or_404(Course, id=course_id)
-            PreferredCourse.objects.create(request=advising_request, course=course, priority=priority)
-            
         messages.success(request, "Advising request submitted successfully!")
         return redirect('student_dashboard')
     
-    courses = Course.objects.all()
+    courses = Course.objects.current()
     return render(request, 'advising_app/student/request_form.html', {'courses': courses})
 
 # --- Faculty Views ---
 
 @login_required
+@replica_reads
 def faculty_dashboard(request):
-    try:
-        faculty = request.user.faculty
-        assigned_courses = Course.objects.filter(assigned_faculty=faculty).order_by('code', 'section')
-        advisees = Student.objects.filter(advisor=faculty)
-        
-        # Search functionality
-        query = request.GET.get('q')
-        if query:
-            advisees = advisees.filter(student_id__icontains=query)
-            
-    except Faculty.DoesNotExist:
+    faculty = request.faculty
+    if faculty is None:
         messages.error(request, "Faculty profile not found.")
         return redirect('landing_page')
+
+    # Enrollment and waitlist per section in one grouped query. The
+    # waitlist is the pending advising requests that ask for the section.
+    assigned_courses = Course.objects.current().filter(assigned_faculty=faculty).annotate(
+        enrolled=Count('enrollment', distinct=True),
+        waitlist=Count(
+            'preferredcourse__request', filter=Q(preferredcourse__request__status='Pending'), distinct=True
+        ),
+    ).order_by('code', 'section')
+    advisees = Student.objects.filter(advisor=faculty)
+    
+    # Search functionality
+    query = request.GET.get('q')
+    if query:
+        advisees = advisees.filter(student_id__icontains=query)
         
     return render(request, 'advising_app/faculty/dashboard.html', {
         'faculty': faculty,
@@ -306,29 +323,31 @@ def faculty_dashboard(request):
 
 @login_required
 def advisee_detail(request, student_id):
-    try:
-        faculty = request.user.faculty
-        student = get_object_or_404(Student, student_id=student_id)
-        
-        # Check if this student is an advisee of the logged-in faculty
-        if student.advisor != faculty:
-            messages.error(request, "You are not the advisor for this student.")
-            return redirect('faculty_dashboard')
-            
-        # Enforce Department Check
-        if student.department != faculty.department:
-             messages.error(request, "You can only advise students from your own department.")
-             return redirect('faculty_dashboard')
-
-        enrollments = Enrollment.objects.filter(student=student).select_related('course')
-        total_credits = sum(e.course.credit for e in enrollments)
-        
-        # Get all courses for add/drop functionality (simplified for advisor)
-        all_courses = Course.objects.all().order_by('code', 'section')
-        
-    except Faculty.DoesNotExist:
+    faculty = request.faculty
+    if faculty is None:
         return redirect('landing_page')
+
+    student = get_object_or_404(Student, student_id=student_id)
+    
+    # Check if this student is an advisee of the logged-in faculty
+    if student.advisor != faculty:
+        messages.error(request, "You are not the advisor for this student.")
+        return redirect('faculty_dashboard')
         
+    # Enforce Department Check
+    if student.department != faculty.department:
+         messages.error(request, "You can only advise students from your own department.")
+         return redirect('faculty_dashboard')
+
+    enrollments = Enrollment.objects.current().filter(student=student).select_related('course')
+    total_credits = sum(e.course.credit for e in enrollments)
+    
+    # The same classification the student sees on the advising page
+    snap, all_courses = classification.classify(student)
+    cells = _catalog_cells(snap)
+    for item in all_courses:
+        item['cells'] = cells[item['id']]
+    
     return render(request, 'advising_app/faculty/advisee_detail.html', {
         'student': student,
         'enrollments': enrollments,
@@ -339,8 +358,11 @@ def advisee_detail(request, student_id):
 @login_required
 def advisor_add_drop_course(request, student_id):
     if request.method == 'POST':
+        faculty = request.faculty
+        if faculty is None:
+            messages.error(request, "Faculty profile not found.")
+            return redirect('landing_page')
         try:
-            faculty = request.user.faculty
             student = get_object_or_404(Student, student_id=student_id)
             
             if student.advisor != faculty:
@@ -354,22 +376,24 @@ def advisor_add_drop_course(request, student_id):
 
             course_id = request.POST.get('course_id')
             action = request.POST.get('action')
-            course = get_object_or_404(Course, id=course_id)
+            course = get_object_or_404(Course.objects.current(), id=course_id)
             
             if action == 'drop':
-                Enrollment.objects.filter(student=student, course=course).delete()
-                messages.success(request, f"Dropped {course.code} for {student.student_id}")
+                result = apply_changes(student, drop_ids=[course.id], actor=request.user)
+                if result.dropped:
+                    messages.success(request, f"Dropped {course.code} for {student.student_id}")
+                _report_cart_problems(request, result)
             elif action == 'add':
-                # Basic checks for advisor override (skip capacity/clash for now or keep them? User said "dewaite parbe", implies power)
-                # Let's keep basic checks but maybe allow override? For now, standard checks.
-                
-                # Check if already enrolled
-                if Enrollment.objects.filter(student=student, course=course).exists():
-                     messages.warning(request, "Already enrolled.")
-                else:
-                     Enrollment.objects.create(student=student, course=course)
-                     messages.success(request, f"Added {course.code} for {student.student_id}")
-                     
+                # Advisors go through the same rules; an explicit override
+                # lets the add past them and is recorded on the event
+                override = request.POST.get('override') == '1'
+                result = apply_changes(student, add_ids=[course.id], actor=request.user, override=override)
+                if result.added:
+                    messages.success(request, f"Added {course.code} for {student.student_id}")
+                for message in result.overridden:
+                    messages.warning(request, f"Overridden: {message}")
+                _report_cart_problems(request, result)
+
         except Exception as e:
             messages.error(request, f"Error: {str(e)}")
             
@@ -378,8 +402,11 @@ def advisor_add_drop_course(request, student_id):
 @login_required
 def update_course_capacity(request, course_id):
     if request.method == 'POST':
+        faculty = request.faculty
+        if faculty is None:
+            messages.error(request, "Faculty profile not found.")
+            return redirect('landing_page')
         try:
-            faculty = request.user.faculty
             course = get_object_or_404(Course, id=course_id)
             
             if course.assigned_faculty != faculty:
@@ -397,23 +424,85 @@ def update_course_capacity(request, course_id):
              
     return redirect('faculty_dashboard')
 
+@login_required
+def update_course_capacities(request):
+    """Saves the capacities of several of the instructor's sections in one transaction."""
+    if request.method != 'POST':
+        return redirect('faculty_dashboard')
+    faculty = request.faculty
+    if faculty is None:
+        messages.error(request, "Faculty profile not found.")
+        return redirect('landing_page')
+
+    requested = {}
+    for name, value in request.POST.items():
+        if not name.startswith('capacity_') or not value.strip():
+            continue
+        try:
+            requested[int(name[len('capacity_'):])] = int(value)
+        except ValueError:
+            messages.error(request, f"Invalid capacity '{value}'.")
+            return redirect('faculty_dashboard')
+    if any(capacity < 0 for capacity in requested.values()):
+        messages.error(request, "Capacity cannot be negative.")
+        return redirect('faculty_dashboard')
+
+    with transaction.atomic():
+        courses = list(
+            Course.objects.current().select_for_update().filter(assigned_faculty=faculty, id__in=requested)
+        )
+        if len(courses) != len(requested):
+            messages.error(request, "You can only update your own courses.")
+            return redirect('faculty_dashboard')
+        changed = [course for course in courses if course.capacity != requested[course.id]]
+        enrolled = dict(
+            Enrollment.objects.filter(course__in=changed).values('course_id').annotate(n=Count('id'))
+            .values_list('course_id', 'n')
+        )
+        for course in changed:
+            course.capacity = requested[course.id]
+            if course.capacity < enrolled.get(course.id, 0):
+                messages.warning(
+                    request,
+                    f"{course.code} Sec {course.section}: capacity {course.capacity} is below the "
+                    f"{enrolled[course.id]} students already enrolled."
+                )
+        Course.objects.bulk_update(changed, ['capacity'])
+
+    if changed:
+        # bulk_update sends no signals
+        catalog.bump()
+        stats.refresh_departments(course.department for course in changed)
+        messages.success(request, f"Updated capacity for {len(changed)} section(s).")
+    else:
+        messages.info(request, "No capacities changed.")
+    return redirect('faculty_dashboard')
+
 # --- Admin Views ---
 
 def is_admin(user):
     return user.is_staff
 
 @user_passes_test(is_admin)
+@replica_reads
 def admin_dashboard(request):
-    total_courses = Course.objects.count()
-    pending_requests = AdvisingRequest.objects.filter(status='Pending').count()
+    total_courses = Course.objects.current().count()
+    pending_requests = AdvisingRequest.objects.current().filter(status='Pending').count()
+    active_jobs = Job.objects.filter(status__in=['Pending', 'Running']).count()
+    # Materialized by stats.py, so these stay cheap regardless of data size
+    department_stats = DepartmentStats.objects.all()
+    credit_loads = CreditLoadStats.objects.filter(students__gt=0)
     return render(request, 'advising_app/admin/dashboard.html', {
         'total_courses': total_courses,
-        'pending_requests': pending_requests
+        'pending_requests': pending_requests,
+        'active_jobs': active_jobs,
+        'department_stats': department_stats,
+        'credit_loads': credit_loads
     })
 
 @user_passes_test(is_admin)
 def manage_courses(request):
-    courses = Course.objects.all()
+    courses = Course.objects.current()
     if request.method == 'POST':
         # Simple add course logic for demo
         code = request.POST.get('code')
@@ -421,37 +510,148 @@ def manage_courses(request):
         credit = request.POST.get('credit')
         department = request.POST.get('department')
         if code and title and credit:
-            Course.objects.create(code=code, title=title, credit=credit, department=department)
-            messages.success(request, "Course added.")
+            course = Course(code=code, title=title, credit=credit, department=department)
+            # Schedule fields are optional and fall back to the model defaults
+            try:
+                course.section = request.POST.get('section') or course.section
+                course.day = request.POST.get('day') or course.day
+                if course.day not in bulk_courses.DAYS:
+                    raise ValueError(course.day)
+                course.start_time = datetime.time.fromisoformat(request.POST.get('start_time') or '09:00')
+                course.end_time = datetime.time.fromisoformat(request.POST.get('end_time') or '10:30')
+                course.assigned_faculty_id = int(request.POST.get('assigned_faculty') or 0) or None
+            except ValueError:
+                messages.error(request, "Invalid schedule.")
+                return redirect('manage_courses')
+            course.room = request.POST.get('room') or None
+
+            version = catalog.version(fresh=True)
+            conflicts = scheduling.timetable().conflicts(scheduling.section_of(course))
+            if course.end_time <= course.start_time:
+                messages.error(request, "End time must be after start time.")
+            elif conflicts:
+                for conflict in conflicts:
+                    messages.error(request, f"Not added: {scheduling.describe(conflict)}.")
+            else:
+                course.save()
+                scheduling.saved(course, version)
+                stats.refresh_departments([department])
+                messages.success(request, "Course added.")
             return redirect('manage_courses')
             
-    return render(request, 'advising_app/admin/manage_courses.html', {'courses': courses})
+    return render(request, 'advising_app/admin/manage_courses.html', {
+        'courses': courses,
+        'catalog_version': catalog.version(),
+        'days': Course.DAYS_CHOICES,
+        'faculty_list': Faculty.objects.select_related('user').order_by('faculty_id'),
+    })
 
 @user_passes_test(is_admin)
 def delete_course(request, course_id):
     course = get_object_or_404(Course, id=course_id)
-    course.delete()
+    with transaction.atomic():
+        events.record_drops(Enrollment.objects.filter(course=course), actor=request.user)
+        course.delete()
+    stats.refresh_departments([course.department])
     messages.success(request, "Course deleted.")
     return redirect('manage_courses')
 
+@user_passes_test(is_admin)
+def upload_courses(request):
+    upload = request.FILES.get('file')
+    if request.method != 'POST' or upload is None:
+        messages.error(request, "Please choose a CSV file.")
+        return redirect('manage_courses')
+    plan = bulk_courses.plan_upload(upload)
+    return redirect('bulk_course_preview', token=bulk_courses.save_plan(plan, request.user))
+
+@user_passes_test(is_admin)
+def bulk_courses_action(request):
+    """Edit or delete the sections ticked in the Manage Courses table."""
+    course_ids = [int(i) for i in request.POST.getlist('course_ids') if i.isdigit()]
+    if request.method != 'POST' or not course_ids:
+        messages.error(request, "Please select at least one course.")
+        return redirect('manage_courses')
+    if request.POST.get('action') == 'delete':
+        plan = bulk_courses.plan_delete(course_ids)
+        return redirect('bulk_course_preview', token=bulk_courses.save_plan(plan, request.user))
+    courses = Course.objects.current().filter(id__in=course_ids).order_by('code', 'section')
+    return render(request, 'advising_app/admin/bulk_edit_courses.html', {
+        'courses': courses,
+        'days': Course.DAYS_CHOICES,
+    })
+
+@user_passes_test(is_admin)
+def bulk_edit_courses(request):
+    if request.method != 'POST':
+        return redirect('manage_courses')
+    edits = {}
+    for course_id in request.POST.getlist('course_ids'):
+        if course_id.isdigit():
+            edits[int(course_id)] = {
+                field: request.POST.get(f'{field}_{course_id}', '') for field in bulk_courses.EDIT_FIELDS
+            }
+    plan = bulk_courses.plan_edits(edits)
+    return redirect('bulk_course_preview', token=bulk_courses.save_plan(plan, request.user))
+
+@user_passes_test(is_admin)
+def bulk_course_preview(request, token):
+    plan = bulk_courses.load_plan(token, request.user)
+    if plan is None:
+        messages.error(request, "This preview has expired. Please start again.")
+        return redirect('manage_courses')
+    if request.method == 'POST':
+        try:
+            counts = bulk_courses.apply(plan, actor=request.user)
+        except ValueError as exc:
+            messages.error(request, str(exc))
+            return redirect('bulk_course_preview', token=token)
+        bulk_courses.discard_plan(token)
+        messages.success(
+            request,
+            f"{counts['created']} sections created, {counts['updated']} updated, {counts['deleted']} deleted.",
+        )
+        return redirect('manage_courses')
+    return render(request, 'advising_app/admin/bulk_course_preview.html', {'plan': plan, 'token': token})
+
 @user_passes_test(is_admin)
 def manage_requests(request):
-    requests = AdvisingRequest.objects.filter(status='Pending')
+    requests = AdvisingRequest.objects.current().filter(status='Pending')
     return render(request, 'advising_app/admin/manage_requests.html', {'requests': requests})
 
+@user_passes_test(is_admin)
+def bulk_update_requests(request):
+    if request.method == 'POST':
+        request_ids = [int(i) for i in request.POST.getlist('request_ids') if i.isdigit()]
+        status = 'Approved' if request.POST.get('action') == 'approve' else 'Rejected'
+        if request_ids:
+            job = tasks.enqueue('update_requests', user=request.user, request_ids=request_ids, status=status)
+            messages.success(request, f"{len(request_ids)} requests queued to be {status.lower()} (job #{job.id}).")
+        else:
+            messages.error(request, "Please select at least one request.")
+    return redirect('manage_requests')
+
 @user_passes_test(is_admin)
 def approve_request(request, request_id):
     advising_request = get_object_or_404(AdvisingRequest, id=request_id)
-    advising_request.status = 'Approved'
-    advising_request.save()
+    was_pending = advising_request.status == 'Pending'
+    with transaction.atomic():
+        advising_request.status = 'Approved'
+        advising_request.save()
+        if was_pending:
+            events.record_approvals([advising_request], actor=request.user)
+            stats.request_changed(advising_request.student.department, -1)
     messages.success(request, f"Request for {advising_request.student} approved.")
     return redirect('manage_requests')
 
 @user_passes_test(is_admin)
 def reject_request(request, request_id):
     advising_request = get_object_or_404(AdvisingRequest, id=request_id)
+    was_pending = advising_request.status == 'Pending'
     advising_request.status = 'Rejected'
     advising_request.save()
+    if was_pending:
+        stats.request_changed(advising_request.student.department, -1)
     messages.success(request, f"Request for {advising_request.student} rejected.")
     return redirect('manage_requests')
 
@@ -475,20 +675,21 @@ def admin_assign_advisor(request):
         
     if request.method == 'POST':
         advisor_id = request.POST.get('advisor_id')
-        student_ids = request.POST.getlist('student_ids')
+        student_ids = [int(i) for i in request.POST.getlist('student_ids') if i.isdigit()]
         
-        if advisor_id and student_ids:
+        if advisor_id and advisor_id.isdigit() and student_ids:
             advisor = get_object_or_404(Faculty, id=advisor_id)
             
-            # Check capacity (Limit 50)
-            current_count = advisor.advisees.count()
+            # Check capacity; the job checks again when it runs
+            current_count = advisor.advisees.exclude(id__in=student_ids).count()
             to_add_count = len(student_ids)
             
-            if current_count + to_add_count > 50:
-                messages.error(request, f"Cannot assign. Advisor limit (50) would be exceeded. Current: {current_count}, Adding: {to_add_count}")
+            if current_count + to_add_count > tasks.ADVISEE_LIMIT:
+                messages.error(request, f"Cannot assign. Advisor limit ({tasks.ADVISEE_LIMIT}) would be exceeded. Current: {current_count}, Adding: {to_add_count}")
             else:
-                Student.objects.filter(id__in=student_ids).update(advisor=advisor)
-                messages.success(request, f"Successfully assigned {to_add_count} students to {advisor.user.get_full_name()}")
+                job = tasks.enqueue('assign_advisor', user=request.user, advisor_id=advisor.id,
+                                    student_ids=student_ids)
+                messages.success(request, f"Assignment of {to_add_count} students to {advisor.user.get_full_name()} queued (job #{job.id}).")
                 
         return redirect(f"{request.path}?department={selected_dept}")
 
@@ -498,3 +699,70 @@ def admin_assign_advisor(request):
         'students': students,
         'faculty_members': faculty_members
     })
+
+@user_passes_test(is_admin)
+def recompute_balances(request):
+    if request.method == 'POST':
+        job = tasks.enqueue('recompute_balances', user=request.user)
+        messages.success(request, f"Balance recomputation queued (job #{job.id}).")
+    return redirect('job_list')
+
+@user_passes_test(is_admin)
+def refresh_stats(request):
+    if request.method == 'POST':
+        job = tasks.enqueue('refresh_stats', user=request.user)
+        messages.success(request, f"Statistics rebuild queued (job #{job.id}).")
+    return redirect('job_list')
+
+@user_passes_test(is_admin)
+def job_list(request):
+    jobs = Job.objects.select_related('created_by')[:50]
+    return render(request, 'advising_app/admin/jobs.html', {'jobs': jobs})
+
+@user_passes_test(is_admin)
+def admission_stats(request):
+    return JsonResponse({
+        'counters': get_counters(),
+        'config': get_config(),
+    })
+
+@user_passes_test(is_admin)
+def profiling_stats(request):
+    if request.method == 'POST':
+        profiling.clear()
+        messages.success(request, "Profiles cleared.")
+        return redirect('profiling_stats')
+    return render(request, 'advising_app/admin/profiling.html', {
+        'config': profiling.get_config(),
+        'hot': profiling.hot_functions(request.GET.get('url') or None),
+        'recent': profiling.samples()[-20:][::-1],
+    })
+
+# --- Exports ---
+
+@login_required
+def export_course_roster(request, course_id):
+    course = get_object_or_404(Course, id=course_id)
+    # Admins can export any roster, faculty only their own sections
+    if not request.user.is_staff:
+        faculty = request.faculty
+        if faculty is None or course.assigned_faculty_id != faculty.id:
+            messages.error(request, "You can only export rosters of your own courses.")
+            return redirect('landing_page')
+    filename = f"roster_{course.code}_sec{course.section}.csv"
+    return exports.csv_response(filename, exports.ROSTER_HEADER, exports.roster_rows(course))
+
+@user_passes_test(is_admin)
+def export_department_enrollments(request):
+    department = request.GET.get('department')
+    if not department:
+        messages.error(request, "Please select a department.")
+        return redirect('admin_assign_advisor')
+    filename = f"enrollments_{department}.csv"
+    return exports.csv_response(filename, exports.DEPARTMENT_HEADER, exports.department_rows(department))
+
+@user_passes_test(is_admin)
+def export_advisor_assignments(request):
+    department = request.GET.get('department')
+    filename = f"advisors_{department}.csv" if department else "advisors.csv"
+    return exports.csv_response(filename, exports.ADVISOR_HEADER, exports.advisor_rows(department))
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,10 +47,13 @@ LOGIN_URL = 'landing_page'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'advising_app.profiling.ProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'advising_app.roles.RoleMiddleware',
+    'advising_app.db_router.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -60,8 +64,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Templates are compiled once per process. Django already does this
+            # by default; it is spelled out so production never runs without it.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -82,8 +93,140 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Background workers write concurrently with the web process
+            'timeout': 20,
+            # Take the write lock when a transaction starts. Enrollment
+            # transactions read before they write, and a deferred transaction
+            # that has to upgrade its lock fails at once instead of waiting
+            'transaction_mode': 'IMMEDIATE',
+        },
+        # A file, not shared-cache memory, so concurrency tests see real locking
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+    }
+}
+
+# Optional read replica for catalog and reporting pages. To try it locally
+# with two SQLite files: copy db.sqlite3 to replica.sqlite3 and start the
+# server with ADVISING_REPLICA_DB=replica.sqlite3.
+if os.environ.get('ADVISING_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / os.environ['ADVISING_REPLICA_DB'],
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['advising_app.db_router.PrimaryReplicaRouter']
+# Seconds a session keeps reading from the primary after a write
+REPLICA_STICKY_SECONDS = 5
+
+
+# Cache. Local memory by default; set ADVISING_CACHE_DIR to share one file
+# cache between all worker processes on a machine (needed for consistent
+# rate limits and cached sessions with several workers).
+if os.environ.get('ADVISING_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['ADVISING_CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Sessions. 'cached_db' serves reads from the cache and only hits the
+# database on writes; 'signed_cookies' keeps sessions out of the database
+# entirely; 'db' is Django's default. Compare with `manage.py bench_sessions`.
+# 'cached_db' is only the default with a shared cache: with per-process
+# caches a worker would keep serving a session another worker changed.
+SESSION_PROFILES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
 }
+SESSION_ENGINE = SESSION_PROFILES[
+    os.environ.get('ADVISING_SESSION_ENGINE', 'cached_db' if os.environ.get('ADVISING_CACHE_DIR') else 'db')
+]
+
+# Worker processes map the catalog snapshot (see advising_app/snapshot.py)
+# from files in this directory, so they share one copy; unset, each process
+# keeps its own copy in memory.
+CATALOG_SNAPSHOT_DIR = os.environ.get('ADVISING_SNAPSHOT_DIR')
+
+# Flash messages travel in a cookie instead of the session, so showing a
+# message never forces a session write
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+
+# Enrollment event consumers (see advising_app/events.py). Idle workers and
+# `manage.py consume_events --loop` run them; INLINE also runs them right
+# after each enrollment commit, at the cost of longer write transactions.
+ENROLLMENT_EVENTS = {
+    'INLINE': os.environ.get('ADVISING_EVENTS_INLINE', '0') == '1',
+}
+
+
+# Registration admission control (see advising_app/admission.py).
+# Set OPENS_AT (e.g. '2026-01-10T09:00') to stagger registration by CGPA.
+ADMISSION_CONTROL = {
+    'RATE': 1.0,
+    'BURST': 5,
+    'MAX_CONCURRENT_WRITES': 4,
+    'ACQUIRE_TIMEOUT': 2.0,
+    'OPENS_AT': None,
+    'SLOT_MINUTES': 15,
+    'STUDENTS_PER_SLOT': 500,
+    'SLOT_ORDER': 'cgpa',
+}
+
+
+# Request profiling (see advising_app/profiling.py), off unless
+# ADVISING_PROFILING=1. Profiles a SAMPLE_RATE fraction of requests, plus the
+# next request to any path that took longer than SLOW_MS. Results are on the
+# admin profiling page; with DIR set, `dump_profiles` merges the raw files.
+PROFILING = {
+    'ENABLED': os.environ.get('ADVISING_PROFILING', '0') == '1',
+    'SAMPLE_RATE': float(os.environ.get('ADVISING_PROFILING_RATE', '0.01')),
+    'SLOW_MS': 1000,
+    'TOP': 25,
+    'BUFFER': 200,
+    'DIR': os.environ.get('ADVISING_PROFILING_DIR'),
+}
+
+
+# Password hashing. ADVISING_PASSWORD_PROFILE picks the hasher used for new
+# hashes ('scrypt', the default and the cheapest to verify without extra
+# packages, 'pbkdf2' or 'argon2', the latter needs argon2-cffi);
+# existing hashes of the other algorithms still verify and are upgraded on
+# the user's next login. Benchmark with `python manage.py bench_logins`.
+PASSWORD_PROFILES = {
+    'pbkdf2': 'advising_app.hashers.ConfigurablePBKDF2PasswordHasher',
+    'scrypt': 'advising_app.hashers.ConfigurableScryptPasswordHasher',
+    'argon2': 'advising_app.hashers.ConfigurableArgon2PasswordHasher',
+}
+PASSWORD_PROFILE = os.environ.get('ADVISING_PASSWORD_PROFILE', 'scrypt')
+PASSWORD_HASHERS = [PASSWORD_PROFILES[PASSWORD_PROFILE]] + [
+    hasher for name, hasher in PASSWORD_PROFILES.items() if name != PASSWORD_PROFILE
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+# Hasher costs. These are Django 5.1's defaults, not tuned values; change
+# them together with bench_logins numbers for the target hardware.
+PASSWORD_PBKDF2_ITERATIONS = 870000
+PASSWORD_SCRYPT_WORK_FACTOR = 2 ** 14
+PASSWORD_ARGON2_TIME_COST = 2
+PASSWORD_ARGON2_MEMORY_COST = 102400
+PASSWORD_ARGON2_PARALLELISM = 1
+
+AUTHENTICATION_BACKENDS = ['advising_app.backends.PooledModelBackend']
+# Threads verifying passwords at once (defaults to the CPU count)
+PASSWORD_VERIFY_WORKERS = None
 
 
 # Password validation
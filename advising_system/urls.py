@@ -17,6 +17,10 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+# The app serves its own pages under admin/ (courses, requests, jobs...), so
+# unmatched admin/ URLs must fall through instead of hitting the admin's 404.
+admin.site.final_catch_all_view = False
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('advising_app.urls')),